@@ -0,0 +1,146 @@
+"""
+현재 데이터셋(BENCHMARK_DB)에서 주요 뷰의 응답 시간, 쿼리 수, 최대 메모리를 측정해
+JSON으로 표준 출력에 씁니다. 직접 실행하지 않고 benchmarks/run.py가 호출합니다.
+"""
+
+import json
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'benchmarks.settings')
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.core.cache import cache  # noqa: E402
+from django.db import connection  # noqa: E402
+from django.test import Client  # noqa: E402
+from django.urls import reverse  # noqa: E402
+from django.utils.http import urlencode  # noqa: E402
+
+from links.models import Link  # noqa: E402
+from posts.models import Comment, Follow, Like, Post, Tag, TimelineEntry  # noqa: E402
+from posts.pagination import encode_cursor  # noqa: E402
+from posts.view_counter import view_counts  # noqa: E402
+from posts.views import POSTS_PER_PAGE  # noqa: E402
+from users.models import Profile  # noqa: E402
+
+AJAX = {'HTTP_X_REQUESTED_WITH': 'XMLHttpRequest'}
+
+
+def dataset():
+    return {
+        'users': Profile.objects.count(),
+        'posts': Post.objects.count(),
+        'comments': Comment.objects.count(),
+        'likes': Like.objects.count(),
+        'follows': Follow.objects.count(),
+        'links': Link.objects.count(),
+        'timeline_entries': TimelineEntry.objects.count(),
+    }
+
+
+def scenarios():
+    """로그인할 사용자와 측정할 (이름, HTTP 메서드, URL, 추가 헤더) 목록"""
+    viewer = Profile.objects.select_related('user').order_by('-following_count').first().user
+    author = Profile.objects.order_by('-followers_count').values_list('user__username', flat=True).first()
+    post = Post.objects.order_by('-comment_count').first()
+    total = Post.objects.count()
+    # 전체의 90% 지점에 해당하는 깊은 페이지
+    deep = Post.objects.order_by('-created_at', '-id').values_list('created_at', 'pk')[int(total * 0.9)]
+    deep_page = int(total * 0.9) // POSTS_PER_PAGE + 1
+    load_more = reverse('posts:load_more_posts')
+    views = [
+        ('home', 'get', reverse('posts:home'), {}),
+        ('load_more_posts', 'get', load_more, AJAX),
+        ('load_more_posts_deep_cursor', 'get', f'{load_more}?cursor={encode_cursor(list(deep))}', AJAX),
+        ('load_more_posts_deep_page', 'get', f'{load_more}?page={deep_page}', AJAX),
+        ('following_feed', 'get', reverse('posts:following_feed'), {}),
+        ('popular_feed', 'get', reverse('posts:popular_feed'), {}),
+        ('post_detail', 'get', reverse('posts:post_detail', kwargs={'pk': post.pk}), {}),
+        ('like_toggle', 'post', reverse('posts:like_toggle', kwargs={'pk': post.pk}), AJAX),
+        ('profile', 'get', reverse('users:profile', kwargs={'username': author}), {}),
+        ('link_list', 'get', reverse('links:link_list'), {}),
+        ('search', 'get', f"{reverse('search:search')}?{urlencode({'q': '사진'})}", {}),
+    ]
+    tag = Tag.objects.order_by('-post_count').values_list('name', flat=True).first()
+    if tag:
+        # 태그가 없는 예전 데이터셋에서는 건너뜀 (--reseed로 다시 생성)
+        views.append(('tag_feed', 'get', reverse('posts:tag_feed', kwargs={'name': tag}), {}))
+    return viewer, views
+
+
+class QueryCounter:
+    """execute_wrapper로 쿼리 수와 DB 시간을 셉니다 (DEBUG 쿼리 로그의 9000개 제한 없음)."""
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.count += 1
+            self.seconds += time.perf_counter() - started
+
+
+def request(client, method, url, headers):
+    # 캐시를 비운 상태(콜드)에서 뷰 자체의 비용을 측정
+    cache.clear()
+    response = getattr(client, method)(url, **headers)
+    content = b''.join(response) if response.streaming else response.content
+    view_counts.clear()
+    return response.status_code, len(content)
+
+
+def measure(client, method, url, headers, repeat):
+    request(client, method, url, headers)  # 워밍업
+
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        status, size = request(client, method, url, headers)
+        samples.append((time.perf_counter() - started) * 1000)
+
+    counter = QueryCounter()
+    with connection.execute_wrapper(counter):
+        request(client, method, url, headers)
+
+    tracemalloc.start()
+    request(client, method, url, headers)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        'status': status,
+        'bytes': size,
+        'wall_ms': {
+            'median': round(statistics.median(samples), 2),
+            'min': round(min(samples), 2),
+            'max': round(max(samples), 2),
+        },
+        'queries': counter.count,
+        'sql_ms': round(counter.seconds * 1000, 2),
+        'peak_kb': round(peak / 1024, 1),
+    }
+
+
+def main():
+    repeat = int(os.environ.get('BENCHMARK_REPEAT', 5))
+    viewer, views = scenarios()
+    client = Client()
+    client.force_login(viewer)
+    results = {name: measure(client, method, url, headers, repeat) for name, method, url, headers in views}
+    json.dump({'dataset': dataset(), 'views': results}, sys.stdout)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,143 @@
+"""
+규모별 벤치마크 실행기.
+
+데이터셋 크기마다 별도 SQLite 파일에 seed_sharegram으로 데이터를 만들고(한 번 만든 파일은
+재사용), measure.py를 별도 프로세스로 실행해 주요 뷰의 응답 시간/쿼리 수/최대 메모리를
+측정한 뒤 커밋 간에 diff할 수 있는 JSON 보고서를 씁니다.
+
+    python benchmarks/run.py --sizes 1k,100k
+    python benchmarks/run.py --sizes 1m --repeat 3 --output before.json
+    python benchmarks/run.py --compare before.json after.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import sqlite3
+import subprocess
+import sys
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+MANAGE = BASE_DIR / 'manage.py'
+
+# 게시물 수 기준으로 나머지 데이터의 비율을 맞춤
+SIZES = {
+    '1k': 1_000,
+    '100k': 100_000,
+    '1m': 1_000_000,
+}
+
+
+def seed_options(posts):
+    return {
+        'users': max(posts // 10, 10),
+        'posts': posts,
+        'follows': posts * 2,
+        'likes': posts * 3,
+        'comments': posts,
+        'links': posts // 10,
+    }
+
+
+def git_revision():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=BASE_DIR,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+def environ_for(data_dir, size, repeat):
+    return {
+        **os.environ,
+        'DJANGO_SETTINGS_MODULE': 'benchmarks.settings',
+        'BENCHMARK_DB': str(data_dir / f'{size}.sqlite3'),
+        'BENCHMARK_MEDIA': str(data_dir / f'{size}_media'),
+        'BENCHMARK_REPEAT': str(repeat),
+        'PYTHONPATH': str(BASE_DIR),
+    }
+
+
+def prepare(size, env, reseed):
+    db = Path(env['BENCHMARK_DB'])
+    if reseed and db.exists():
+        db.unlink()
+    seeded = db.exists()
+    # 기존 파일도 새 마이그레이션은 적용
+    subprocess.run([sys.executable, MANAGE, 'migrate', '-v', '0'], env=env, check=True)
+    if not seeded:
+        options = [f'--{name}={value}' for name, value in seed_options(SIZES[size]).items()]
+        print(f'[{size}] 데이터 생성 중...', file=sys.stderr)
+        subprocess.run([sys.executable, MANAGE, 'seed_sharegram', '--seed=42', *options],
+                       env=env, check=True, stdout=sys.stderr)
+
+
+def run(args):
+    data_dir = Path(args.data_dir).resolve()
+    data_dir.mkdir(parents=True, exist_ok=True)
+    report = {
+        'meta': {
+            'revision': git_revision(),
+            'python': platform.python_version(),
+            'sqlite': sqlite3.sqlite_version,
+            'repeat': args.repeat,
+        },
+        'sizes': {},
+    }
+    for size in args.sizes.split(','):
+        if size not in SIZES:
+            sys.exit(f'알 수 없는 크기: {size} (가능: {", ".join(SIZES)})')
+        env = environ_for(data_dir, size, args.repeat)
+        prepare(size, env, args.reseed)
+        print(f'[{size}] 측정 중...', file=sys.stderr)
+        result = subprocess.run([sys.executable, BASE_DIR / 'benchmarks' / 'measure.py'],
+                                env=env, check=True, stdout=subprocess.PIPE, text=True)
+        report['sizes'][size] = json.loads(result.stdout)
+
+    output = json.dumps(report, indent=2, sort_keys=True, ensure_ascii=False)
+    if args.output:
+        Path(args.output).write_text(output + '\n', encoding='utf-8')
+        print(f'보고서: {args.output}', file=sys.stderr)
+    else:
+        print(output)
+
+
+def compare(old_path, new_path, threshold):
+    """두 보고서를 비교해 응답 시간이 threshold배 넘게 늘거나 쿼리 수가 늘어난 항목을 표시합니다."""
+    old = json.loads(Path(old_path).read_text(encoding='utf-8'))['sizes']
+    new = json.loads(Path(new_path).read_text(encoding='utf-8'))['sizes']
+    regressions = 0
+    print(f'{"size":>5} {"view":<30} {"ms (old → new)":>22} {"queries":>10} {"peak KB":>20}')
+    for size in sorted(old.keys() & new.keys()):
+        for view in sorted(old[size]['views'].keys() & new[size]['views'].keys()):
+            a, b = old[size]['views'][view], new[size]['views'][view]
+            ratio = b['wall_ms']['median'] / max(a['wall_ms']['median'], 0.01)
+            regressed = ratio > threshold or b['queries'] > a['queries']
+            regressions += regressed
+            print(f'{size:>5} {view:<30} '
+                  f'{a["wall_ms"]["median"]:>9.1f} → {b["wall_ms"]["median"]:>9.1f} '
+                  f'{a["queries"]:>4} → {b["queries"]:<4} '
+                  f'{a["peak_kb"]:>9.0f} → {b["peak_kb"]:<9.0f}'
+                  f'{"  ← 회귀" if regressed else ""}')
+    return 1 if regressions else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description='ShareGram 규모별 벤치마크')
+    parser.add_argument('--sizes', default='1k,100k', help=f'쉼표로 구분한 데이터셋 크기 ({", ".join(SIZES)})')
+    parser.add_argument('--repeat', type=int, default=5, help='뷰마다 시간을 잴 반복 횟수 (중앙값 보고)')
+    parser.add_argument('--data-dir', default=BASE_DIR / 'benchmarks' / 'data', help='데이터셋 파일 위치')
+    parser.add_argument('--reseed', action='store_true', help='기존 데이터셋을 지우고 다시 생성')
+    parser.add_argument('--output', help='보고서 JSON 파일 경로 (없으면 표준 출력)')
+    parser.add_argument('--compare', nargs=2, metavar=('OLD', 'NEW'), help='두 보고서 비교')
+    parser.add_argument('--threshold', type=float, default=1.25, help='회귀로 볼 응답 시간 비율')
+    args = parser.parse_args()
+    if args.compare:
+        sys.exit(compare(*args.compare, args.threshold))
+    run(args)
+
+
+if __name__ == '__main__':
+    main()
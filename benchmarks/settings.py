@@ -0,0 +1,23 @@
+# benchmarks/settings.py
+# 벤치마크 전용 설정: 데이터셋 크기마다 별도 SQLite 파일과 미디어 디렉터리를 사용
+
+import os
+
+from config.settings import *  # noqa: F401,F403
+
+DEBUG = False
+ALLOWED_HOSTS = ['testserver']
+
+DATABASES = {
+    'default': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': os.environ['BENCHMARK_DB'],
+    }
+}
+MEDIA_ROOT = os.environ['BENCHMARK_MEDIA']
+IMAGE_RESIZE_CACHE_DIR = os.path.join(MEDIA_ROOT, 'resize_cache')
+
+# 측정 중 스레드 풀/즉시 반영이 끼어들지 않도록 함
+THUMBNAIL_WORKER_MODE = 'off'
+LINK_METADATA_WORKER_MODE = 'off'
+VIEW_COUNT_FLUSH_INTERVAL = 60 * 60
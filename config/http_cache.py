@@ -0,0 +1,159 @@
+# config/http_cache.py
+
+import hashlib
+from functools import wraps
+
+from django.conf import settings
+from django.core import checks
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date, parse_http_date_safe, quote_etag
+
+GENERATION_KEY = 'anon_page_generation:{}'
+
+# 프로세스마다 따로 있는 캐시 백엔드. 다른 프로세스(워커, 관리 명령, 다른 웹 프로세스)의
+# 무효화(세대 번호 증가)가 페이지를 제공하는 프로세스에 전달되지 않음
+PROCESS_LOCAL_CACHES = (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+)
+
+
+def make_etag(*parts):
+    return quote_etag(hashlib.md5(repr(parts).encode()).hexdigest())
+
+
+def set_validators(response, etag=None, last_modified=None):
+    if etag and not response.has_header('ETag'):
+        response['ETag'] = etag
+    if last_modified and not response.has_header('Last-Modified'):
+        response['Last-Modified'] = http_date(last_modified.timestamp())
+    return response
+
+
+def conditional_response(request, response, etag=None, last_modified=None):
+    """검증자를 설정하고, 요청의 If-None-Match/If-Modified-Since와 일치하면 304를 반환합니다."""
+    set_validators(response, etag, last_modified)
+    return get_conditional_response(
+        request,
+        etag=response.get('ETag'),
+        last_modified=int(last_modified.timestamp()) if last_modified else None,
+        response=response,
+    )
+
+
+def conditional_page(validators):
+    """
+    비로그인 GET 요청에 ETag/Last-Modified를 붙이고, 변경이 없으면 뷰를 실행하지 않고 304를 반환합니다.
+
+    validators(request, *args, **kwargs)는 (etag, last_modified)를 반환하며 쿼리 한 번으로
+    끝나야 합니다. None을 반환하면(예: 객체가 없음) 뷰를 그대로 실행합니다.
+    로그인 사용자의 화면은 사용자별 내용(CSRF 토큰 등)이 있으므로 대상에서 제외합니다.
+    """
+    def decorator(view_func):
+        @wraps(view_func)
+        def wrapper(request, *args, **kwargs):
+            if request.method not in ('GET', 'HEAD') or request.user.is_authenticated:
+                return view_func(request, *args, **kwargs)
+            result = validators(request, *args, **kwargs)
+            if result is None:
+                return view_func(request, *args, **kwargs)
+            etag, last_modified = result
+            not_modified = get_conditional_response(
+                request,
+                etag=etag,
+                last_modified=int(last_modified.timestamp()) if last_modified else None,
+            )
+            if not_modified is not None:
+                return set_validators(not_modified, etag, last_modified)
+            response = view_func(request, *args, **kwargs)
+            if response.status_code == 200:
+                set_validators(response, etag, last_modified)
+            return response
+        return wrapper
+    return decorator
+
+
+@checks.register(checks.Tags.caches, deploy=True)
+def check_shared_cache(app_configs=None, **kwargs):
+    """운영(DEBUG=False)에서는 비로그인 페이지 캐시의 세대 번호를 모든 프로세스가 공유하는 캐시에 둬야 합니다."""
+    backend = settings.CACHES.get('default', {}).get('BACKEND')
+    if settings.DEBUG or backend not in PROCESS_LOCAL_CACHES:
+        return []
+    return [checks.Error(
+        f'기본 캐시 백엔드({backend})가 프로세스마다 따로 있어 다른 프로세스의 페이지 캐시 무효화가 전달되지 않습니다.',
+        hint='Redis, Memcached, DatabaseCache, FileBasedCache처럼 여러 프로세스가 공유하는 캐시를 CACHES에 설정하세요.',
+        id='config.E001',
+    )]
+
+
+def invalidate_anonymous_pages(*groups):
+    """groups에 의존하는 비로그인 페이지 캐시를 무효화합니다 (세대 번호 증가)."""
+    for group in groups:
+        key = GENERATION_KEY.format(group)
+        if not cache.add(key, 1, None):
+            try:
+                cache.incr(key)
+            except ValueError:
+                cache.set(key, 1, None)
+
+
+def _page_key(request, groups):
+    keys = [GENERATION_KEY.format(group) for group in groups]
+    generations = cache.get_many(keys)
+    version = ':'.join(str(generations.get(key, 0)) for key in keys)
+    url = hashlib.md5(request.build_absolute_uri().encode()).hexdigest()
+    return f'anon_page:{version}:{url}'
+
+
+def _cacheable_request(request):
+    # 표시할 메시지가 있는 요청은 캐시된 화면을 보여주면 메시지가 사라지므로 제외
+    return (
+        request.method in ('GET', 'HEAD')
+        and not request.user.is_authenticated
+        and 'messages' not in request.COOKIES
+    )
+
+
+def cache_anonymous_page(*groups):
+    """
+    비로그인 사용자에게 보여주는 전체 응답을 URL 기준으로 캐시합니다.
+
+    groups는 페이지가 의존하는 데이터 묶음 이름이며('posts', 'links', 'users', 'trending'),
+    해당 모델이 저장/삭제되면 invalidate_anonymous_pages()로 세대 번호가 올라가
+    이전 캐시는 더 이상 조회되지 않습니다. 캐시된 응답도 ETag로 304를 반환할 수 있습니다.
+    """
+    def decorator(view_func):
+        @wraps(view_func)
+        def wrapper(request, *args, **kwargs):
+            if not _cacheable_request(request):
+                return view_func(request, *args, **kwargs)
+            key = _page_key(request, groups)
+            cached = cache.get(key)
+            if cached is not None:
+                response = HttpResponse(cached['content'], content_type=cached['content_type'])
+                for header, value in cached['headers'].items():
+                    response[header] = value
+                patch_vary_headers(response, ['Cookie'])
+                return get_conditional_response(
+                    request,
+                    etag=response.get('ETag'),
+                    last_modified=parse_http_date_safe(response.get('Last-Modified')),
+                    response=response,
+                )
+
+            response = view_func(request, *args, **kwargs)
+            # 쿠키(CSRF 토큰, 메시지 등)를 설정하는 응답은 사용자별이므로 캐시하지 않음
+            if response.status_code == 200 and not response.streaming and not response.cookies:
+                if hasattr(response, 'render') and not response.is_rendered:
+                    response.render()
+                set_validators(response, etag=make_etag(response.content))
+                cache.set(key, {
+                    'content': response.content,
+                    'content_type': response['Content-Type'],
+                    'headers': {h: response[h] for h in ('ETag', 'Last-Modified') if response.has_header(h)},
+                }, settings.ANONYMOUS_PAGE_CACHE_TIMEOUT)
+            return response
+        return wrapper
+    return decorator
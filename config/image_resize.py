@@ -0,0 +1,238 @@
+# config/image_resize.py
+
+import hashlib
+import mimetypes
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from io import BytesIO
+from pathlib import Path
+
+from django.conf import settings
+from django.core.exceptions import SuspiciousFileOperation
+from django.http import FileResponse, Http404, HttpResponse
+from django.utils._os import safe_join
+from django.utils.cache import get_conditional_response
+from django.views.decorators.http import require_GET
+from PIL import Image, ImageOps
+
+ALLOWED_EXTENSIONS = {'.jpg', '.jpeg', '.png', '.gif', '.webp'}
+# 캐시 적중 시 파일 수정 시각(LRU 기준)을 갱신하는 최소 간격(초)
+TOUCH_INTERVAL = 60 * 60
+# 용량을 넘으면 이 비율까지 오래된 파일부터 지움
+EVICT_TO_RATIO = 0.9
+# 원본 버전 메모에 둘 최대 항목 수, 넘으면 비우고 다시 채움
+VERSION_MEMO_MAX_ENTRIES = 10000
+
+
+class KeyedLocks:
+    """키별 잠금. 같은 렌디션을 동시에 요청하면 한 요청만 원본을 디코딩하고 나머지는 기다립니다."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._locks = {}
+
+    @contextmanager
+    def hold(self, key):
+        with self._lock:
+            entry = self._locks.setdefault(key, [threading.Lock(), 0])
+            entry[1] += 1
+        try:
+            with entry[0]:
+                yield
+        finally:
+            with self._lock:
+                entry[1] -= 1
+                if not entry[1]:
+                    del self._locks[key]
+
+
+class ResizeCache:
+    """
+    리사이즈 결과를 저장하는 용량 제한 디스크 캐시.
+
+    파일의 수정 시각을 마지막 사용 시각으로 쓰며, 전체 크기가 IMAGE_RESIZE_CACHE_MAX_BYTES를 넘으면
+    가장 오래 사용하지 않은 파일부터 지웁니다(LRU). 파일은 임시 파일에 쓴 뒤
+    os.replace로 옮기므로 다른 프로세스가 반쯤 쓴 파일을 읽지 않습니다.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._size = None
+        self.locks = KeyedLocks()
+
+    @property
+    def root(self):
+        return Path(settings.IMAGE_RESIZE_CACHE_DIR)
+
+    def path_for(self, key, ext):
+        return self.root / key[:2] / f'{key}{ext}'
+
+    def touch(self, path):
+        try:
+            if time.time() - path.stat().st_mtime > TOUCH_INTERVAL:
+                os.utime(path)
+            return True
+        except FileNotFoundError:
+            return False
+
+    def _files(self):
+        for dirpath, _, filenames in os.walk(self.root):
+            for filename in filenames:
+                try:
+                    st = os.stat(os.path.join(dirpath, filename))
+                except FileNotFoundError:
+                    continue
+                yield st.st_mtime, st.st_size, os.path.join(dirpath, filename)
+
+    def store(self, path, content):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+        with os.fdopen(fd, 'wb') as f:
+            f.write(content)
+        os.replace(tmp, path)
+        with self._lock:
+            if self._size is None:
+                self._size = sum(size for _, size, _ in self._files())
+            else:
+                self._size += len(content)
+            if self._size > settings.IMAGE_RESIZE_CACHE_MAX_BYTES:
+                self._evict()
+
+    def _evict(self):
+        # 디렉터리를 한 번 훑어 실제 크기를 다시 계산하고 오래된 순으로 지움
+        files = sorted(self._files())
+        self._size = sum(size for _, size, _ in files)
+        target = settings.IMAGE_RESIZE_CACHE_MAX_BYTES * EVICT_TO_RATIO
+        for _, size, filename in files:
+            if self._size <= target:
+                break
+            try:
+                os.remove(filename)
+            except FileNotFoundError:
+                pass
+            self._size -= size
+
+    def reset(self):
+        with self._lock:
+            self._size = None
+
+
+resize_cache = ResizeCache()
+
+
+def render(source, width, height):
+    """원본을 width x height 안에 들어가도록 줄여 원본과 같은 형식의 바이트로 반환합니다."""
+    with Image.open(source) as img:
+        img_format = img.format or 'JPEG'
+        img.draft(None, (width, height))
+        img = ImageOps.exif_transpose(img)
+    img.thumbnail((width, height))
+    buffer = BytesIO()
+    options = {'quality': 85, 'optimize': True} if img_format in ('JPEG', 'WEBP') else {}
+    img.save(buffer, format=img_format, **options)
+    return buffer.getvalue()
+
+
+def _version(st):
+    # 원본의 수정 시각/크기로 만든 짧은 버전 문자열 (원본이 바뀌면 URL도 바뀜)
+    return hashlib.md5(f'{st.st_mtime_ns}:{st.st_size}'.encode()).hexdigest()[:12]
+
+
+def source_version(path):
+    """MEDIA_ROOT 기준 path 원본의 버전 문자열. 원본이 없으면 빈 문자열을 반환합니다."""
+    try:
+        return _version(_source_path(path).stat())
+    except (Http404, OSError):
+        return ''
+
+
+class SourceVersions:
+    """
+    원본 버전(source_version) 메모.
+
+    resized 필터가 이미지마다 파일을 stat하지 않도록 IMAGE_RESIZE_VERSION_TTL초 동안 같은 값을
+    재사용합니다. 그동안 같은 이름으로 바뀐 원본은 뷰가 지난 버전으로 보고 짧게만 캐시하므로
+    (IMAGE_RESIZE_UNVERSIONED_MAX_AGE) 잘못된 이미지가 오래 남지 않습니다.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._versions = {}
+
+    def get(self, path):
+        now = time.monotonic()
+        entry = self._versions.get(path)
+        if entry is not None and entry[0] > now:
+            return entry[1]
+        version = source_version(path)
+        with self._lock:
+            if len(self._versions) >= VERSION_MEMO_MAX_ENTRIES:
+                self._versions.clear()
+            self._versions[path] = (now + settings.IMAGE_RESIZE_VERSION_TTL, version)
+        return version
+
+    def clear(self):
+        with self._lock:
+            self._versions.clear()
+
+
+source_versions = SourceVersions()
+
+
+def _source_path(path):
+    try:
+        source = Path(safe_join(settings.MEDIA_ROOT, path))
+    except SuspiciousFileOperation:
+        raise Http404
+    if source.suffix.lower() not in ALLOWED_EXTENSIONS or not source.is_file():
+        raise Http404
+    return source
+
+
+@require_GET
+def resized_image(request, width, height, path):
+    """
+    MEDIA_ROOT의 원본을 허용된 크기(IMAGE_RESIZE_SIZES)로 줄여 반환합니다.
+
+    결과는 디스크 캐시에 남겨 두고 다음 요청부터는 파일을 그대로 보내며, 원본의
+    경로/수정 시각이 캐시 키에 포함되므로 원본이 바뀌면 새로 만듭니다.
+    ?v=가 현재 원본 버전(source_version)과 같을 때만 IMAGE_RESIZE_MAX_AGE로 오래 캐시하고,
+    버전이 없거나 지난 URL은 같은 이름으로 원본이 바뀔 수 있으므로 짧게 캐시합니다(ETag로 재검증).
+    운영 환경에서 웹 서버가 MEDIA_URL을 직접 서빙하더라도 MEDIA_URL + 'r/'는
+    Django로 넘겨야 합니다.
+    """
+    if (width, height) not in settings.IMAGE_RESIZE_SIZES:
+        raise Http404
+    source = _source_path(path)
+    st = source.stat()
+    key = hashlib.md5(f'{path}:{st.st_mtime_ns}:{st.st_size}:{width}x{height}'.encode()).hexdigest()
+    etag = f'"{key}"'
+    not_modified = get_conditional_response(request, etag=etag)
+    if not_modified is not None:
+        return not_modified
+
+    cached = resize_cache.path_for(key, source.suffix.lower())
+    content_type = mimetypes.guess_type(cached.name)[0]
+    if not resize_cache.touch(cached):
+        with resize_cache.locks.hold(key):
+            # 기다리는 동안 다른 요청이 만들었으면 그 결과를 사용
+            if not cached.exists():
+                try:
+                    content = render(source, width, height)
+                except (OSError, ValueError, Image.DecompressionBombError):
+                    raise Http404
+                resize_cache.store(cached, content)
+    try:
+        response = FileResponse(open(cached, 'rb'), content_type=content_type)
+    except FileNotFoundError:
+        # 방금 용량 초과로 지워진 경우 캐시 없이 다시 만들어 보냄
+        response = HttpResponse(render(source, width, height), content_type=content_type)
+    if request.GET.get('v') == _version(st):
+        response['Cache-Control'] = f'public, max-age={settings.IMAGE_RESIZE_MAX_AGE}, immutable'
+    else:
+        response['Cache-Control'] = f'public, max-age={settings.IMAGE_RESIZE_UNVERSIONED_MAX_AGE}'
+    response['ETag'] = etag
+    return response
@@ -0,0 +1,136 @@
+# config/middleware.py
+
+import heapq
+import json
+import logging
+import random
+import time
+from contextlib import ExitStack
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import connections
+from django.template.backends.django import Template
+
+logger = logging.getLogger('sharegram.slow_requests')
+
+_current = ContextVar('request_metrics', default=None)
+
+
+class RequestMetrics:
+    """요청 하나의 쿼리 수, DB 시간, 템플릿 렌더링 시간, 가장 느린 SQL 목록"""
+
+    def __init__(self, top_queries):
+        self.queries = 0
+        self.db_seconds = 0.0
+        self.template_seconds = 0.0
+        self.render_depth = 0  # 진행 중인 Template.render 중첩 깊이 (가장 바깥 렌더링만 잼)
+        self.top_queries = top_queries
+        self._slowest = []  # (소요 시간, 순번, SQL) 최소 힙
+
+    def __call__(self, execute, sql, params, many, context):
+        # connection.execute_wrapper로 등록되어 모든 SQL 실행을 감쌈
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration = time.perf_counter() - started
+            self.queries += 1
+            self.db_seconds += duration
+            entry = (duration, self.queries, sql)
+            if len(self._slowest) < self.top_queries:
+                heapq.heappush(self._slowest, entry)
+            elif self._slowest and duration > self._slowest[0][0]:
+                heapq.heapreplace(self._slowest, entry)
+
+    def slowest(self):
+        return [
+            {'ms': round(duration * 1000, 2), 'sql': sql[:300]}
+            for duration, _, sql in sorted(self._slowest, reverse=True)
+        ]
+
+
+def _timed_render(render):
+    def wrapper(self, context=None, request=None):
+        metrics = _current.get()
+        if metrics is None or metrics.render_depth:
+            return render(self, context, request)
+        metrics.render_depth += 1
+        started = time.perf_counter()
+        try:
+            return render(self, context, request)
+        finally:
+            metrics.template_seconds += time.perf_counter() - started
+            metrics.render_depth -= 1
+    wrapper.request_metrics = True
+    return wrapper
+
+
+def _instrument_templates():
+    # render()/render_to_string()이 거치는 백엔드 Template.render를 한 번만 감쌈. 폼 위젯, crispy,
+    # 템플릿 안의 render_to_string 등은 렌더링 도중 이 메서드를 다시 부르므로 가장 바깥 호출만 잼
+    if not getattr(Template.render, 'request_metrics', False):
+        Template.render = _timed_render(Template.render)
+
+
+class RequestMetricsMiddleware:
+    """
+    요청마다 쿼리 수, DB 시간, 템플릿 렌더링 시간을 재서 Server-Timing 헤더로 내보냅니다.
+
+    계측은 REQUEST_METRICS_SAMPLE_RATE 비율의 요청에만 적용하고(운영에서는 낮게 설정),
+    전체 처리 시간은 모든 요청에 대해 잽니다. 처리 시간이 REQUEST_METRICS_SLOW_MS를 넘거나
+    쿼리 수가 REQUEST_METRICS_SLOW_QUERIES를 넘으면 'sharegram.slow_requests' 로거에
+    가장 느린 SQL과 함께 JSON 한 줄로 기록합니다. HTML/JSON 응답 모두 같은 방식으로 처리합니다.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        _instrument_templates()
+
+    def __call__(self, request):
+        started = time.perf_counter()
+        if random.random() >= settings.REQUEST_METRICS_SAMPLE_RATE:
+            response = self.get_response(request)
+            self.log_if_slow(request, response, time.perf_counter() - started, None)
+            return response
+
+        metrics = RequestMetrics(settings.REQUEST_METRICS_TOP_QUERIES)
+        token = _current.set(metrics)
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(metrics))
+                response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        total = time.perf_counter() - started
+
+        response['Server-Timing'] = ', '.join([
+            f'db;dur={metrics.db_seconds * 1000:.1f};desc="{metrics.queries} queries"',
+            f'tpl;dur={metrics.template_seconds * 1000:.1f}',
+            f'total;dur={total * 1000:.1f}',
+        ])
+        self.log_if_slow(request, response, total, metrics)
+        return response
+
+    def log_if_slow(self, request, response, total, metrics):
+        slow = total * 1000 > settings.REQUEST_METRICS_SLOW_MS
+        if metrics is not None:
+            slow = slow or metrics.queries > settings.REQUEST_METRICS_SLOW_QUERIES
+        if not slow:
+            return
+        record = {
+            'method': request.method,
+            'path': request.path,
+            'view': getattr(request.resolver_match, 'view_name', None),
+            'status': response.status_code,
+            'total_ms': round(total * 1000, 1),
+        }
+        if metrics is not None:
+            record.update({
+                'queries': metrics.queries,
+                'db_ms': round(metrics.db_seconds * 1000, 1),
+                'template_ms': round(metrics.template_seconds * 1000, 1),
+                'slowest': metrics.slowest(),
+            })
+        logger.warning(json.dumps(record, ensure_ascii=False))
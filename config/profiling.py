@@ -0,0 +1,193 @@
+# config/profiling.py
+
+import cProfile
+import os
+import random
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.admin.views.decorators import staff_member_required
+from django.core import signing
+from django.http import FileResponse, Http404
+from django.shortcuts import render
+from django.utils import timezone
+
+TOKEN_SALT = 'sharegram.profiling'
+HEADER = 'HTTP_X_PROFILE'
+QUERY_PARAM = '_profile'
+MODES = ('cprofile', 'sample')
+EXTENSIONS = {'cprofile': '.pstats', 'sample': '.collapsed'}
+FILENAME_RE = re.compile(r'^[\w.-]+\.(pstats|collapsed)$')
+
+# cProfile(sys.monitoring)은 프로세스에서 동시에 하나만 켤 수 있음
+_cprofile_lock = threading.Lock()
+
+
+def make_token(mode=None):
+    """
+    X-Profile 헤더나 ?_profile= 값에 넣을 서명 토큰 (PROFILING_TOKEN_MAX_AGE초 동안 유효).
+
+    mode('cprofile' 또는 'sample')를 주면 그 방식으로, 아니면 PROFILING_MODE로 프로파일링합니다.
+    """
+    return signing.TimestampSigner(salt=TOKEN_SALT).sign(mode or 'profile')
+
+
+def _token_mode(value):
+    # 유효한 토큰이면 프로파일링 방식, 아니면 None
+    try:
+        mode = signing.TimestampSigner(salt=TOKEN_SALT).unsign(value, max_age=settings.PROFILING_TOKEN_MAX_AGE)
+    except signing.BadSignature:
+        return None
+    return mode if mode in MODES else settings.PROFILING_MODE
+
+
+class StackSampler:
+    """
+    대상 스레드의 호출 스택을 일정 간격으로 수집하는 통계적 프로파일러.
+
+    결과는 flamegraph.pl / speedscope가 읽는 collapsed 형식(바깥→안쪽 프레임을 ';'로 잇고
+    뒤에 표본 수)입니다. 대상 스레드를 멈추지 않으므로 cProfile보다 오버헤드가 작습니다.
+    """
+
+    def __init__(self, interval):
+        self.interval = interval
+        self.stacks = Counter()
+        self._thread_id = threading.get_ident()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='stack-sampler', daemon=True)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self._thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f'{_short_path(code.co_filename)}:{code.co_qualname}')
+                frame = frame.f_back
+            if stack:
+                self.stacks[';'.join(reversed(stack))] += 1
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def dump(self, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f'{stack} {count}\n')
+
+
+def _short_path(filename):
+    for prefix in (str(settings.BASE_DIR), *sys.path):
+        if prefix and filename.startswith(prefix):
+            return filename[len(prefix):].lstrip(os.sep)
+    return filename
+
+
+class ProfilingMiddleware:
+    """
+    선택한 요청 전체를 프로파일링해 PROFILING_DIR에 저장합니다.
+
+    대상 요청: 서명 토큰(make_token())을 X-Profile 헤더나 ?_profile= 값으로 보낸 요청과
+    PROFILING_SAMPLE_RATE 비율의 무작위 요청. 토큰은 스태프용 profile_list 뷰에서 받으므로
+    사용자를 확인할 필요가 없어, 세션/인증 미들웨어 시간까지 재도록 RequestMetricsMiddleware
+    바로 뒤에 둡니다. 저장한 파일 이름은 X-Profile-Id 응답 헤더로 알려 주며 profile_list
+    뷰에서 내려받을 수 있습니다.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def _mode(self, request):
+        token = request.META.get(HEADER) or request.GET.get(QUERY_PARAM)
+        mode = _token_mode(token) if token else None
+        if mode:
+            return mode
+        if random.random() < settings.PROFILING_SAMPLE_RATE:
+            return settings.PROFILING_MODE
+        return None
+
+    def __call__(self, request):
+        mode = self._mode(request)
+        if mode == 'cprofile' and _cprofile_lock.acquire(blocking=False):
+            try:
+                profiler = cProfile.Profile()
+                started = time.perf_counter()
+                profiler.enable()
+                try:
+                    response = self.get_response(request)
+                finally:
+                    profiler.disable()
+                return self._save(request, response, started, profiler.dump_stats, mode)
+            finally:
+                _cprofile_lock.release()
+        if mode == 'sample':
+            sampler = StackSampler(settings.PROFILING_SAMPLE_INTERVAL)
+            started = time.perf_counter()
+            sampler.start()
+            try:
+                response = self.get_response(request)
+            finally:
+                sampler.stop()
+            return self._save(request, response, started, sampler.dump, mode)
+        return self.get_response(request)
+
+    def _save(self, request, response, started, dump, mode):
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        view = getattr(request.resolver_match, 'view_name', None) or request.path
+        name = '{}_{}_{:.0f}ms{}'.format(
+            timezone.now().strftime('%Y%m%d-%H%M%S-%f'),
+            re.sub(r'[^\w-]+', '-', view).strip('-')[:60] or 'root',
+            elapsed_ms,
+            EXTENSIONS[mode],
+        )
+        directory = Path(settings.PROFILING_DIR)
+        directory.mkdir(parents=True, exist_ok=True)
+        dump(directory / name)
+        _prune(directory)
+        response['X-Profile-Id'] = name
+        return response
+
+
+def _profiles(directory):
+    return sorted(
+        (p for p in directory.iterdir() if FILENAME_RE.match(p.name)),
+        key=lambda p: p.stat().st_mtime, reverse=True,
+    ) if directory.is_dir() else []
+
+
+def _prune(directory):
+    # 오래된 파일부터 지워 PROFILING_MAX_FILES개만 유지
+    for path in _profiles(directory)[settings.PROFILING_MAX_FILES:]:
+        path.unlink(missing_ok=True)
+
+
+@staff_member_required
+def profile_list(request):
+    profiles = [
+        {'name': p.name, 'size': p.stat().st_size,
+         'created_at': datetime.fromtimestamp(p.stat().st_mtime, tz=timezone.get_current_timezone())}
+        for p in _profiles(Path(settings.PROFILING_DIR))
+    ]
+    return render(request, 'profiling/profile_list.html', {
+        'profiles': profiles, 'token': make_token(), 'sample_token': make_token('sample'),
+    })
+
+
+@staff_member_required
+def profile_download(request, name):
+    if not FILENAME_RE.match(name):
+        raise Http404
+    path = Path(settings.PROFILING_DIR) / name
+    if not path.is_file():
+        raise Http404
+    return FileResponse(open(path, 'rb'), as_attachment=True, filename=name)
@@ -41,12 +41,15 @@ INSTALLED_APPS = [
     'users',
     'posts',
     'links',
+    'search',
     # [추가] 서드파티 앱
     'crispy_forms',
     'crispy_bootstrap5',    
 ]
 
 MIDDLEWARE = [
+    'config.middleware.RequestMetricsMiddleware',   # [추가] 요청별 SQL/템플릿 계측 (Server-Timing)
+    'config.profiling.ProfilingMiddleware',         # [추가] 선택한 요청 프로파일링 (세션/인증 미들웨어 시간 포함)
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -135,4 +138,103 @@ CRISPY_TEMPLATE_PACK = 'bootstrap5'
 
 # [추가] 인증 관련 설정
 LOGIN_REDIRECT_URL = 'posts:home'       # 로그인 성공 후 이동할 URL
-LOGIN_URL = 'users:login'               # 로그인이 필요할 때 이동할 URL
\ No newline at end of file
+LOGIN_URL = 'users:login'               # 로그인이 필요할 때 이동할 URL
+
+# [추가] 팔로잉 피드 타임라인 설정
+TIMELINE_FANOUT_MAX_FOLLOWERS = 1000    # 팔로워가 이보다 많으면 팬아웃하지 않고 읽기 시점에 병합
+TIMELINE_BACKFILL_LIMIT = 200           # 새로 팔로우할 때 타임라인에 채워 넣을 최근 게시물 수
+
+# [추가] 조회수 버퍼 설정
+VIEW_COUNT_FLUSH_INTERVAL = 10          # 조회수 증가분을 DB에 반영하는 주기(초), 0이면 즉시 반영
+
+# [추가] 캐시 설정
+# 운영(DEBUG=False)에서는 워커/관리 명령의 페이지 캐시 무효화가 웹 프로세스에 전달되도록
+# 여러 프로세스가 공유하는 캐시(Redis, Memcached, DB, 파일)를 써야 함 (check --deploy의 config.E001)
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    }
+}
+POST_CARD_CACHE_TIMEOUT = 60 * 60       # 게시물 카드 조각 캐시 유지 시간(초)
+ANONYMOUS_PAGE_CACHE_TIMEOUT = 60       # 비로그인 사용자용 전체 페이지 캐시 유지 시간(초)
+# [추가] 썸네일 생성 워커 설정
+THUMBNAIL_WORKER_MODE = 'thread'        # 'thread': 커밋 후 스레드 풀, 'sync': 커밋 직후 바로, 'off': process_thumbnails 명령만
+THUMBNAIL_WORKER_THREADS = 2            # 'thread' 모드의 작업 스레드 수
+THUMBNAIL_MAX_ATTEMPTS = 3              # 실패한 작업을 다시 시도하는 최대 횟수
+THUMBNAIL_RETRY_DELAY = 30              # 'thread' 모드에서 실패한 작업을 다시 시도하기까지의 시간(초)
+# [추가] 링크 OG 메타데이터 수집 워커 설정
+LINK_METADATA_WORKER_MODE = 'thread'    # 'thread': 커밋 후 스레드 풀, 'sync': 커밋 직후 바로, 'off': fetch_link_metadata 명령만
+LINK_METADATA_WORKER_THREADS = 4        # 'thread' 모드의 작업 스레드 수 (원격 응답 대기가 대부분이라 CPU 수보다 많아도 됨)
+LINK_METADATA_TTL = 7 * 24 * 60 * 60    # 정규화한 URL별 메타데이터 캐시 유지 시간(초)
+LINK_METADATA_NEGATIVE_TTL = 60 * 60    # 가져오기 실패 결과를 캐시하는 시간(초), 지나면 다시 시도
+LINK_METADATA_MAX_BYTES = 512 * 1024    # <head>를 찾으며 읽을 최대 응답 크기(바이트)
+LINK_IMAGE_WIDTH = 800                  # og:image 로컬 사본의 최대 너비(px), 카드 너비에 맞춤
+LINK_IMAGE_MAX_HEIGHT = 800             # og:image 로컬 사본의 최대 높이(px)
+LINK_IMAGE_MAX_BYTES = 10 * 1024 * 1024 # 내려받을 og:image 원본의 최대 크기(바이트)
+LINK_IMAGE_MAX_AGE = 60 * 60 * 24 * 365 # 로컬 사본 응답의 브라우저 캐시 유지 시간(초)
+# [추가] 링크 수집용 HTTP 클라이언트 설정 (links.http)
+LINK_FETCH_TIMEOUT = (3.05, 10)         # (연결, 읽기) 시간 제한(초)
+LINK_FETCH_POOL_CONNECTIONS = 20        # 연결 풀을 유지할 호스트 수
+LINK_FETCH_POOL_MAXSIZE = 10            # 호스트당 유지할 keep-alive 연결 수
+LINK_FETCH_PER_HOST = 2                 # 한 호스트에 동시에 보내는 최대 요청 수
+LINK_FETCH_HOST_WAIT = 2.0              # 호스트 자리가 나길 기다리는 최대 시간(초), 넘으면 나중에 재시도
+LINK_FETCH_BREAKER_THRESHOLD = 3        # 이만큼 연속으로 시간 초과/연결 실패하면 호스트를 차단
+LINK_FETCH_BREAKER_COOLDOWN = 5 * 60    # 차단한 호스트에 다시 시험 요청을 보내기까지의 시간(초)
+LINK_FETCH_RETRY_DELAY = 30             # 바쁘거나 차단된 호스트의 링크를 다시 시도하기까지의 시간(초)
+# [추가] 링크 일괄 가져오기 설정 (links.importer)
+LINK_IMPORT_MAX_LINKS = 1000            # 한 번에 가져올 수 있는 최대 링크 수 (웹 업로드)
+LINK_IMPORT_MAX_BYTES = 5 * 1024 * 1024 # 업로드 파일 최대 크기(바이트)
+LINK_IMPORT_WORKERS = 16                # import_links 명령에서 메타데이터를 동시에 가져올 스레드 수
+LINK_IMPORT_BATCH_SIZE = 500            # bulk_create 한 번에 넣을 행 수
+
+# [추가] 이미지 리사이즈 설정 (MEDIA_URL + 'r/<너비>x<높이>/<경로>')
+IMAGE_RESIZE_SIZES = [(64, 64), (80, 80), (150, 150), (300, 300), (600, 600)]  # 허용하는 크기 (너비, 높이)
+IMAGE_RESIZE_CACHE_DIR = BASE_DIR / 'cache' / 'resized'     # 리사이즈 결과 디스크 캐시 위치
+IMAGE_RESIZE_CACHE_MAX_BYTES = 256 * 1024 * 1024            # 디스크 캐시 최대 크기, 넘으면 오래 안 쓴 파일부터 삭제
+IMAGE_RESIZE_MAX_AGE = 60 * 60 * 24 * 365                   # 버전(?v=)이 맞는 리사이즈 응답의 브라우저 캐시 유지 시간(초)
+IMAGE_RESIZE_UNVERSIONED_MAX_AGE = 60 * 5                    # 버전이 없거나 지난 URL의 캐시 유지 시간(초)
+IMAGE_RESIZE_VERSION_TTL = 60                                # resized 필터가 원본 버전을 다시 확인하기까지의 시간(초)
+
+# [추가] 요청별 계측 설정 (config.middleware.RequestMetricsMiddleware)
+REQUEST_METRICS_SAMPLE_RATE = 0.01      # 쿼리/템플릿 시간을 계측할 요청 비율(0~1), 계측 중인 요청은 Template.render를 감쌈
+REQUEST_METRICS_SLOW_MS = 500           # 처리 시간이 이보다 길면 느린 요청 로그에 기록(밀리초)
+REQUEST_METRICS_SLOW_QUERIES = 30       # 쿼리 수가 이보다 많아도 느린 요청 로그에 기록
+REQUEST_METRICS_TOP_QUERIES = 3         # 느린 요청 로그에 남길 가장 느린 SQL 수
+
+# [추가] 로깅 설정
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'formatters': {
+        'slow_requests': {'format': '{asctime} {message}', 'style': '{'},
+    },
+    'handlers': {
+        # 느린 요청 JSON 한 줄씩. 운영에서는 파일/로그 수집기 핸들러로 바꿈
+        'slow_requests': {'class': 'logging.StreamHandler', 'formatter': 'slow_requests'},
+    },
+    'loggers': {
+        'sharegram.slow_requests': {
+            'handlers': ['slow_requests'],
+            'level': 'WARNING',
+            'propagate': False,
+        },
+    },
+}
+
+# [추가] 요청 프로파일링 설정 (config.profiling.ProfilingMiddleware)
+PROFILING_SAMPLE_RATE = 0               # 무작위로 프로파일링할 요청 비율(0~1)
+PROFILING_MODE = 'cprofile'             # 'cprofile'(.pstats) 또는 'sample'(flamegraph용 collapsed stacks)
+PROFILING_SAMPLE_INTERVAL = 0.005       # 'sample' 방식의 스택 수집 간격(초)
+PROFILING_DIR = BASE_DIR / 'cache' / 'profiles'   # 프로파일 파일 저장 위치
+PROFILING_MAX_FILES = 200               # 보관할 최대 파일 수, 넘으면 오래된 것부터 삭제
+PROFILING_TOKEN_MAX_AGE = 60 * 60       # X-Profile 헤더 서명 토큰의 유효 시간(초)
+
+# [추가] 전문 검색 설정 (search, SQLite FTS5)
+SEARCH_MAX_CANDIDATES = 2000            # 관련도(bm25)를 계산할 최근 일치 문서 수, 0이면 모든 일치 문서
+
+# [추가] 인기 게시물 랭킹 설정
+TRENDING_WINDOW_HOURS = 72              # 이 시간 안에 작성된 게시물만 인기 피드에 올림
+TRENDING_DECAY_SECONDS = 45000          # 게시물이 이만큼 오래될 때마다 같은 순위를 지키려면 점수가 10배 필요
+TRENDING_LIKE_WEIGHT = 1.0              # 좋아요 하나의 점수
+TRENDING_COMMENT_WEIGHT = 2.0           # 댓글 하나의 점수
+TRENDING_VIEW_WEIGHT = 0.1              # 조회 한 번의 점수
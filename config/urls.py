@@ -5,11 +5,21 @@ from django.conf.urls.static import static
 from django.contrib import admin
 from django.urls import include, path
 
+from .image_resize import resized_image
+from .profiling import profile_download, profile_list
+
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('', include('posts.urls')),        # 게시물 관련 URL, '/'(root)에 매핑
     path('users/', include('users.urls')),  # 사용자 관련 URL, '/users/'에 매핑
     path('links/', include('links.urls')),  # 링크 관련 URL, '/links/'에 매핑
+    path('search/', include('search.urls')),  # 검색 URL, '/search/'에 매핑
+    # 이미지 리사이즈 (정적 미디어 서빙보다 먼저 매칭되어야 함)
+    path(f"{settings.MEDIA_URL.lstrip('/')}r/<int:width>x<int:height>/<path:path>",
+         resized_image, name='resized_image'),
+    # 요청 프로파일 목록/다운로드 (스태프 전용)
+    path('_profiles/', profile_list, name='profile_list'),
+    path('_profiles/<str:name>', profile_download, name='profile_download'),
 ]
 
 # 개발 환경에서 미디어 파일 서빙
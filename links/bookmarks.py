@@ -0,0 +1,47 @@
+# links/bookmarks.py
+
+from html.parser import HTMLParser
+
+NETSCAPE_MARKERS = ('<!doctype netscape-bookmark-file', '<dl', '<dt')
+
+
+class BookmarkParser(HTMLParser):
+    """Netscape 북마크 HTML(브라우저/북마크 서비스 내보내기 형식)에서 (URL, 제목)을 모읍니다."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.entries = []
+        self._current = None
+
+    def handle_starttag(self, tag, attrs):
+        if tag == 'a':
+            href = dict(attrs).get('href')
+            if href:
+                self._current = [href, '']
+
+    def handle_data(self, data):
+        if self._current is not None:
+            self._current[1] += data
+
+    def handle_endtag(self, tag):
+        if tag == 'a' and self._current is not None:
+            self.entries.append((self._current[0].strip(), ' '.join(self._current[1].split())))
+            self._current = None
+
+
+def parse_bookmarks(text):
+    """
+    북마크 HTML이나 한 줄에 URL 하나인 목록에서 [(URL, 제목), ...]을 읽습니다.
+
+    목록 형식에서는 빈 줄과 '#'으로 시작하는 줄을 건너뛰고 제목은 빈 문자열입니다.
+    """
+    head = text.lstrip()[:1024].lower()
+    if any(marker in head for marker in NETSCAPE_MARKERS):
+        parser = BookmarkParser()
+        parser.feed(text)
+        parser.close()
+        return parser.entries
+    return [
+        (line.strip(), '') for line in text.splitlines()
+        if line.strip() and not line.strip().startswith('#')
+    ]
@@ -1,8 +1,37 @@
 from django import forms
+from django.conf import settings
+
+from .bookmarks import parse_bookmarks
 from .models import Link
 
 class LinkForm(forms.ModelForm):
     class Meta:
         model = Link
         fields = ['url']
-        widgets = {'url': forms.URLInput(attrs={'placeholder': 'https://example.com', 'class': 'form-control'})}
\ No newline at end of file
+        widgets = {'url': forms.URLInput(attrs={'placeholder': 'https://example.com', 'class': 'form-control'})}
+
+class LinkImportForm(forms.Form):
+    file = forms.FileField(
+        required=False, label='북마크 파일',
+        help_text='브라우저나 북마크 서비스에서 내보낸 HTML 파일, 또는 한 줄에 URL 하나인 텍스트 파일',
+        widget=forms.ClearableFileInput(attrs={'accept': '.html,.htm,.txt'}),
+    )
+    urls = forms.CharField(
+        required=False, label='URL 목록',
+        widget=forms.Textarea(attrs={'rows': 8, 'placeholder': 'https://example.com\nhttps://example.org'}),
+    )
+
+    def clean(self):
+        cleaned_data = super().clean()
+        upload = cleaned_data.get('file')
+        entries = parse_bookmarks(cleaned_data.get('urls', ''))
+        if upload:
+            if upload.size > settings.LINK_IMPORT_MAX_BYTES:
+                raise forms.ValidationError('파일이 너무 큽니다.')
+            entries += parse_bookmarks(upload.read().decode('utf-8', errors='replace'))
+        if not entries:
+            raise forms.ValidationError('가져올 URL이 없습니다.')
+        if len(entries) > settings.LINK_IMPORT_MAX_LINKS:
+            raise forms.ValidationError(f'한 번에 최대 {settings.LINK_IMPORT_MAX_LINKS}개까지 가져올 수 있습니다.')
+        cleaned_data['entries'] = entries
+        return cleaned_data
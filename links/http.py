@@ -0,0 +1,140 @@
+# links/http.py
+
+import threading
+import time
+from contextlib import contextmanager
+from urllib.parse import urlsplit
+
+import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+
+
+class HostUnavailable(requests.RequestException):
+    """우리 쪽 제한 때문에 요청을 보내지 않은 경우. 원격 실패가 아니므로 나중에 다시 시도합니다."""
+
+
+class HostBusy(HostUnavailable):
+    """호스트별 동시 요청 한도가 찬 상태에서 LINK_FETCH_HOST_WAIT초 안에 자리가 나지 않음"""
+
+
+class CircuitOpen(HostUnavailable):
+    """시간 초과/연결 실패가 이어진 호스트라 차단 해제 시각까지 바로 실패 처리함"""
+
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_session():
+    """
+    프로세스에서 함께 쓰는 requests.Session.
+
+    연결 풀(HTTPAdapter)을 재사용해 같은 호스트로 가는 요청은 TCP/TLS 연결을 다시 맺지 않습니다.
+    풀 크기는 LINK_FETCH_POOL_CONNECTIONS(호스트 수)와 LINK_FETCH_POOL_MAXSIZE(호스트당 연결 수)로 정합니다.
+    """
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=settings.LINK_FETCH_POOL_CONNECTIONS,
+                                  pool_maxsize=settings.LINK_FETCH_POOL_MAXSIZE, max_retries=0)
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+            session.headers['User-Agent'] = USER_AGENT
+            _session = session
+        return _session
+
+
+class HostSlots:
+    """호스트별 세마포어. 한 도메인에 동시에 보내는 요청 수를 LINK_FETCH_PER_HOST로 제한합니다."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._slots = {}
+
+    @contextmanager
+    def hold(self, host):
+        with self._lock:
+            entry = self._slots.setdefault(host, [threading.Semaphore(settings.LINK_FETCH_PER_HOST), 0])
+            entry[1] += 1
+        try:
+            if not entry[0].acquire(timeout=settings.LINK_FETCH_HOST_WAIT):
+                raise HostBusy(f'{host}: 동시 요청 한도 초과')
+            try:
+                yield
+            finally:
+                entry[0].release()
+        finally:
+            with self._lock:
+                entry[1] -= 1
+                if not entry[1]:
+                    del self._slots[host]
+
+
+class CircuitBreaker:
+    """
+    호스트별 회로 차단기.
+
+    시간 초과나 연결 실패가 LINK_FETCH_BREAKER_THRESHOLD번 이어지면 LINK_FETCH_BREAKER_COOLDOWN초 동안
+    그 호스트로 요청을 보내지 않고 CircuitOpen을 올립니다. 쿨다운이 지나면 요청 하나만 시험 삼아
+    보내고(half-open), 성공하면 닫고 실패하면 다시 쿨다운합니다.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._failures = {}
+        self._open_until = {}
+
+    def check(self, host):
+        with self._lock:
+            until = self._open_until.get(host)
+            if until is None:
+                return
+            if time.monotonic() < until:
+                raise CircuitOpen(f'{host}: 회로 차단 중')
+            # 시험 요청 하나가 끝날 때까지 다른 요청은 계속 차단
+            self._open_until[host] = time.monotonic() + settings.LINK_FETCH_BREAKER_COOLDOWN
+
+    def record_success(self, host):
+        with self._lock:
+            self._failures.pop(host, None)
+            self._open_until.pop(host, None)
+
+    def record_failure(self, host):
+        with self._lock:
+            failures = self._failures.get(host, 0) + 1
+            self._failures[host] = failures
+            if failures >= settings.LINK_FETCH_BREAKER_THRESHOLD:
+                self._open_until[host] = time.monotonic() + settings.LINK_FETCH_BREAKER_COOLDOWN
+
+    def reset(self):
+        with self._lock:
+            self._failures.clear()
+            self._open_until.clear()
+
+
+host_slots = HostSlots()
+breaker = CircuitBreaker()
+
+
+@contextmanager
+def open_url(url, **kwargs):
+    """
+    공유 세션으로 url을 요청해 응답을 돌려주는 컨텍스트 매니저.
+
+    호스트별 동시 요청 한도와 회로 차단기를 거치며, 본문을 다 읽을 때까지 자리를 잡고 있습니다.
+    시간 초과/연결 실패(본문을 읽다가 난 것 포함)는 회로 차단기에 실패로 기록합니다.
+    """
+    host = (urlsplit(url).hostname or '').lower()
+    breaker.check(host)
+    with host_slots.hold(host):
+        try:
+            with get_session().get(url, timeout=settings.LINK_FETCH_TIMEOUT, **kwargs) as response:
+                yield response
+        except (requests.Timeout, requests.ConnectionError):
+            breaker.record_failure(host)
+            raise
+        breaker.record_success(host)
@@ -0,0 +1,80 @@
+# links/images.py
+
+import hashlib
+import logging
+from io import BytesIO
+
+import requests
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from PIL import Image, ImageOps
+
+from .http import open_url
+from .models import Link
+
+logger = logging.getLogger(__name__)
+
+IMAGE_DIR = 'link_images'
+
+
+def _download(url):
+    """이미지 응답 본문을 LINK_IMAGE_MAX_BYTES까지 읽습니다. 이미지가 아니거나 너무 크면 None."""
+    with open_url(url, stream=True) as response:
+        response.raise_for_status()
+        if not response.headers.get('Content-Type', '').lower().startswith('image/'):
+            return None
+        data = bytearray()
+        for chunk in response.iter_content(chunk_size=64 * 1024):
+            data += chunk
+            if len(data) > settings.LINK_IMAGE_MAX_BYTES:
+                return None
+    return bytes(data)
+
+
+def _shrink(data):
+    """카드 크기(LINK_IMAGE_WIDTH x LINK_IMAGE_MAX_HEIGHT 안)로 줄인 JPEG와 크기를 반환합니다."""
+    box = (settings.LINK_IMAGE_WIDTH, settings.LINK_IMAGE_MAX_HEIGHT)
+    with Image.open(BytesIO(data)) as src:
+        # JPEG는 필요한 크기에 가까운 축소 배율로 디코딩해 전체 해상도 디코딩을 피함
+        src.draft('RGB', box)
+        img = ImageOps.exif_transpose(src)
+    if img.mode in ('RGBA', 'LA', 'P'):
+        # 투명 배경은 흰색으로 채움
+        img = img.convert('RGBA')
+        background = Image.new('RGB', img.size, 'white')
+        background.paste(img, mask=img.getchannel('A'))
+        img = background
+    elif img.mode != 'RGB':
+        img = img.convert('RGB')
+    img.thumbnail(box, Image.Resampling.LANCZOS, reducing_gap=2.0)
+    buffer = BytesIO()
+    img.save(buffer, format='JPEG', quality=85, optimize=True, progressive=True)
+    return buffer.getvalue(), img.width, img.height
+
+
+def store_image(url):
+    """
+    외부 og:image를 한 번 받아 카드 크기로 줄여 MEDIA_ROOT/link_images에 저장합니다.
+
+    (저장한 이름, 너비, 높이)를 반환하고 받을 수 없거나 이미지가 아니면 None을 반환합니다.
+    같은 URL을 이미 저장한 링크가 있으면 다시 받지 않고, 파일 이름은 내용의 해시라
+    같은 이미지는 한 번만 저장되며 내용이 바뀌지 않으므로 오래 캐시할 수 있습니다.
+    """
+    existing = (Link.objects.filter(og_image=url).exclude(og_image_file='')
+                .values_list('og_image_file', 'og_image_width', 'og_image_height').first())
+    if existing:
+        return existing
+    try:
+        data = _download(url)
+        if data is None:
+            return None
+        content, width, height = _shrink(data)
+    except (requests.RequestException, OSError, ValueError, Image.DecompressionBombError) as e:
+        logger.info('링크 이미지 저장 실패 (%s): %s', url, e)
+        return None
+    name = f'{IMAGE_DIR}/{hashlib.sha256(content).hexdigest()[:32]}.jpg'
+    if not default_storage.exists(name):
+        name = default_storage.save(name, ContentFile(content))
+    return name, width, height
+
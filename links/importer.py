@@ -0,0 +1,112 @@
+# links/importer.py
+
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.validators import URLValidator
+from django.db import close_old_connections, transaction
+
+from config.http_cache import invalidate_anonymous_pages
+from search.index import index_objects
+from .http import HostUnavailable
+from .images import store_image
+from .models import Link
+from .tasks import enqueue_many
+from .utils import fetch_og_metadata, normalize_url
+
+_validate_url = URLValidator(schemes=['http', 'https'])
+
+
+def clean_entries(user, entries):
+    """
+    URL을 검증하고 입력 안에서, 그리고 user가 이미 저장한 링크와 중복된 항목을 뺍니다.
+
+    중복 판단은 normalize_url 기준이며 (남은 항목, 잘못된 수, 중복 수)를 반환합니다.
+    """
+    max_length = Link._meta.get_field('url').max_length
+    seen = {normalize_url(url) for url in Link.objects.filter(user=user).values_list('url', flat=True)}
+    cleaned, invalid, duplicates = [], 0, 0
+    for url, title in entries:
+        try:
+            if len(url) > max_length:
+                raise ValidationError('too long')
+            _validate_url(url)
+        except ValidationError:
+            invalid += 1
+            continue
+        canonical = normalize_url(url)
+        if canonical in seen:
+            duplicates += 1
+            continue
+        seen.add(canonical)
+        cleaned.append((url, title))
+    return cleaned, invalid, duplicates
+
+
+def _fetch(url):
+    try:
+        metadata = fetch_og_metadata(url)
+        # 카드 이미지 사본도 같은 스레드에서 만들어 저장할 때 함께 넣음
+        metadata['stored_image'] = store_image(metadata['image']) if metadata['image'] else None
+        return metadata
+    except HostUnavailable:
+        return None
+    finally:
+        # 스레드마다 열린 DB 연결을 정리
+        close_old_connections()
+
+
+def fetch_all(urls, workers=None, progress=None):
+    """
+    urls의 메타데이터와 og:image 사본을 스레드 풀에서 동시에 가져와 {url: 메타데이터}를 반환합니다.
+
+    동시성은 workers(기본 LINK_IMPORT_WORKERS)로, 호스트별 부하는 links.http의 한도로 제한됩니다.
+    호스트가 바쁘거나 차단 중이라 가져오지 못한 URL의 값은 None입니다.
+    progress(완료 수, 전체 수)를 주면 하나 끝날 때마다 호출합니다.
+    """
+    results = {}
+    with ThreadPoolExecutor(max_workers=workers or settings.LINK_IMPORT_WORKERS,
+                            thread_name_prefix='link-import') as executor:
+        futures = {executor.submit(_fetch, url): url for url in set(urls)}
+        for done, future in enumerate(as_completed(futures), 1):
+            results[futures[future]] = future.result()
+            if progress:
+                progress(done, len(futures))
+    return results
+
+
+def import_links(user, entries, fetch=False, workers=None, progress=None):
+    """
+    entries를 검증·중복 제거한 뒤 bulk_create로 한 번에 저장하고 결과 수를 담은 dict를 반환합니다.
+
+    fetch가 False이면 링크를 대기 상태로 저장하고 백그라운드 워커(links.tasks)에 맡깁니다(웹 요청용).
+    True이면 먼저 fetch_all로 동시에 가져와 채운 뒤 저장합니다(관리 명령용).
+    가져오지 못한 링크는 대기 상태로 남아 fetch_link_metadata 명령이 다시 처리합니다.
+    """
+    entries, invalid, duplicates = clean_entries(user, entries)
+    metadata = fetch_all([url for url, _ in entries], workers, progress) if fetch else {}
+
+    links = []
+    for url, title in entries:
+        data = metadata.get(url)
+        if data is None:
+            links.append(Link(user=user, url=url, title=title[:200], status=Link.PENDING))
+            continue
+        name, width, height = data['stored_image'] or ('', None, None)
+        links.append(Link(
+            user=user, url=url, title=data['title'] or title[:200], description=data['description'],
+            og_image=data['image'], og_image_file=name, og_image_width=width, og_image_height=height,
+            status=Link.READY if data['title'] or data['description'] or data['image'] else Link.FAILED,
+        ))
+
+    with transaction.atomic():
+        created = Link.objects.bulk_create(links, batch_size=settings.LINK_IMPORT_BATCH_SIZE)
+        pending = [link.pk for link in created if link.status == Link.PENDING]
+        # 검색 색인도 시그널 없이 직접 갱신
+        index_objects('link', created, replace=False)
+        if not fetch:
+            enqueue_many(pending)
+    # bulk_create는 post_save 시그널을 보내지 않으므로 캐시를 직접 무효화
+    invalidate_anonymous_pages('links')
+    return {'created': len(created), 'pending': len(pending), 'invalid': invalid, 'duplicates': duplicates}
@@ -0,0 +1,43 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from links import tasks
+from links.models import Link
+from links.utils import purge_expired_metadata
+
+
+class Command(BaseCommand):
+    help = '대기 중인 링크의 OG 메타데이터를 가져옵니다. --loop를 주면 워커로 계속 실행합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=100)
+        parser.add_argument('--loop', action='store_true', help='작업을 기다리며 계속 실행')
+        parser.add_argument('--interval', type=float, default=2.0, help='대기 링크가 없을 때 쉬는 시간(초)')
+        parser.add_argument('--retry-failed', action='store_true', help='메타데이터를 찾지 못한 링크를 다시 대기시킴')
+        parser.add_argument('--purge-cache', action='store_true', help='만료된 메타데이터 캐시를 먼저 정리')
+        parser.add_argument('--images', action='store_true', help='로컬 사본이 없는 og:image를 받아 저장')
+
+    def handle(self, *args, **options):
+        if options['purge_cache']:
+            self.stdout.write(f'만료된 메타데이터 캐시 {purge_expired_metadata()}건 삭제')
+        if options['retry_failed']:
+            retried = Link.objects.filter(status=Link.FAILED).update(status=Link.PENDING)
+            self.stdout.write(f'실패한 링크 {retried}건 재등록')
+        while True:
+            requeued = tasks.requeue_stale_links()
+            if requeued:
+                self.stdout.write(f'중단된 작업 {requeued}건 재등록')
+            done = tasks.process_pending(options['batch_size'])
+            if done or not options['loop']:
+                self.stdout.write(f'링크 메타데이터 {done}건 수집')
+            if options['images']:
+                stored = tasks.cache_missing_images(options['batch_size'])
+                if stored or not options['loop']:
+                    self.stdout.write(f'링크 이미지 {stored}건 저장')
+                done += stored
+            if not options['loop']:
+                break
+            if not done:
+                time.sleep(options['interval'])
+        self.stdout.write(self.style.SUCCESS('링크 메타데이터 처리 완료'))
@@ -0,0 +1,46 @@
+import time
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+
+from links.bookmarks import parse_bookmarks
+from links.importer import import_links
+
+
+class Command(BaseCommand):
+    help = (
+        '북마크 HTML이나 URL 목록 파일의 링크를 한 사용자에게 일괄 추가합니다. '
+        '메타데이터는 스레드 풀에서 동시에 가져온 뒤 bulk_create로 저장합니다.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('username', help='링크를 추가할 사용자 이름')
+        parser.add_argument('path', help='북마크 HTML 또는 한 줄에 URL 하나인 텍스트 파일')
+        parser.add_argument('--workers', type=int, default=None, help='메타데이터를 동시에 가져올 스레드 수')
+        parser.add_argument('--no-fetch', action='store_true',
+                            help='메타데이터를 가져오지 않고 대기 상태로 저장 (fetch_link_metadata가 나중에 처리)')
+
+    def handle(self, *args, **options):
+        try:
+            user = User.objects.get(username=options['username'])
+        except User.DoesNotExist:
+            raise CommandError(f"사용자를 찾을 수 없습니다: {options['username']}")
+        try:
+            with open(options['path'], encoding='utf-8', errors='replace') as f:
+                entries = parse_bookmarks(f.read())
+        except OSError as e:
+            raise CommandError(str(e))
+
+        started = time.monotonic()
+        result = import_links(user, entries, fetch=not options['no_fetch'],
+                              workers=options['workers'], progress=self.progress)
+        self.stdout.write(self.style.SUCCESS(
+            f"링크 {result['created']}개 추가 ({time.monotonic() - started:.1f}초), "
+            f"중복 {result['duplicates']}개, 잘못된 URL {result['invalid']}개 제외"))
+        if result['pending']:
+            self.stdout.write(f"메타데이터를 가져오지 못한 {result['pending']}개는 fetch_link_metadata로 처리하세요.")
+
+    def progress(self, done, total):
+        # 10%마다, 그리고 마지막에 진행 상황 출력
+        if done == total or done % max(total // 10, 1) == 0:
+            self.stdout.write(f'메타데이터 {done}/{total}')
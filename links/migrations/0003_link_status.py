@@ -0,0 +1,22 @@
+# Generated by Django 6.1.2 on 2026-10-17 09:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('links', '0002_link_updated_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='link',
+            name='status',
+            field=models.CharField(choices=[('pending', '대기'), ('fetching', '가져오는 중'), ('ready', '완료'), ('failed', '실패')], default='ready', max_length=10, verbose_name='메타데이터 상태'),
+        ),
+        migrations.AddIndex(
+            model_name='link',
+            index=models.Index(fields=['status', 'updated_at'], name='link_status_idx'),
+        ),
+    ]
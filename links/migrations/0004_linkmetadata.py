@@ -0,0 +1,31 @@
+# Generated by Django 6.1.2 on 2026-10-17 00:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('links', '0003_link_status'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LinkMetadata',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.CharField(max_length=64, unique=True)),
+                ('url', models.URLField(max_length=2000)),
+                ('title', models.CharField(blank=True, max_length=200)),
+                ('description', models.TextField(blank=True)),
+                ('image', models.URLField(blank=True)),
+                ('ok', models.BooleanField(default=True)),
+                ('fetched_at', models.DateTimeField()),
+                ('expires_at', models.DateTimeField(db_index=True)),
+            ],
+            options={
+                'verbose_name': '링크 메타데이터 캐시',
+                'verbose_name_plural': '링크 메타데이터 캐시',
+            },
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 6.1.2 on 2026-10-17 00:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('links', '0004_linkmetadata'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='link',
+            name='og_image_file',
+            field=models.ImageField(blank=True, upload_to='link_images/', verbose_name='OG 이미지 사본'),
+        ),
+        migrations.AddField(
+            model_name='link',
+            name='og_image_height',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='link',
+            name='og_image_width',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name='link',
+            name='og_image',
+            field=models.URLField(blank=True, db_index=True, verbose_name='OG 이미지 URL'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 6.1.2 on 2026-10-17 00:12
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('links', '0005_link_og_image_file'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='link',
+            index=models.Index(fields=['-created_at', '-id'], name='link_created_at_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='link',
+            index=models.Index(fields=['user', '-created_at', '-id'], name='link_user_created_at_id_idx'),
+        ),
+    ]
@@ -1,18 +1,92 @@
+import os
+
 from django.contrib.auth.models import User
 from django.db import models
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.urls import reverse
+
+from config.http_cache import invalidate_anonymous_pages
 
 class Link(models.Model):
+    # OG 메타데이터 수집 상태 (links.tasks가 백그라운드에서 채움)
+    PENDING = 'pending'
+    FETCHING = 'fetching'
+    READY = 'ready'
+    FAILED = 'failed'
+    STATUS_CHOICES = [
+        (PENDING, '대기'),
+        (FETCHING, '가져오는 중'),
+        (READY, '완료'),
+        (FAILED, '실패'),
+    ]
+
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='links')
     url = models.URLField(verbose_name='URL')
     title = models.CharField(max_length=200, blank=True, verbose_name='제목')
     description = models.TextField(blank=True, verbose_name='설명')
-    og_image = models.URLField(blank=True, verbose_name='OG 이미지 URL')
+    og_image = models.URLField(blank=True, db_index=True, verbose_name='OG 이미지 URL')
+    # og_image를 카드 크기로 줄여 저장한 로컬 사본 (links.images.store_image)
+    og_image_file = models.ImageField(upload_to='link_images/', blank=True, verbose_name='OG 이미지 사본')
+    og_image_width = models.PositiveIntegerField(null=True, blank=True)
+    og_image_height = models.PositiveIntegerField(null=True, blank=True)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=READY, verbose_name='메타데이터 상태')
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ['-created_at']
         verbose_name = '링크'
         verbose_name_plural = '링크'
+        indexes = [
+            models.Index(fields=['status', 'updated_at'], name='link_status_idx'),
+            models.Index(fields=['-created_at', '-id'], name='link_created_at_id_idx'),
+            models.Index(fields=['user', '-created_at', '-id'], name='link_user_created_at_id_idx'),
+        ]
 
     def __str__(self):
         return self.title or self.url
+
+    @property
+    def image_url(self):
+        """로컬 사본이 있으면 그 주소를, 없으면 원래 og:image 주소를 반환합니다."""
+        if self.og_image_file:
+            return reverse('links:link_image', kwargs={'name': os.path.basename(self.og_image_file.name)})
+        return self.og_image
+
+    @property
+    def is_pending(self):
+        return self.status in (self.PENDING, self.FETCHING)
+
+
+class LinkMetadata(models.Model):
+    """
+    정규화한 URL(links.utils.normalize_url)별 OG 메타데이터 캐시.
+
+    같은 글을 여러 사용자가 공유해도 원격 페이지는 만료(expires_at) 전까지 한 번만 가져옵니다.
+    가져오기에 실패한 결과(ok=False)도 짧은 TTL로 저장해 죽은 사이트를 반복해서 두드리지 않습니다.
+    """
+    # URL 길이와 무관하게 고정 길이 고유 인덱스를 쓰기 위해 정규화한 URL의 SHA-256을 키로 사용
+    key = models.CharField(max_length=64, unique=True)
+    url = models.URLField(max_length=2000)
+    title = models.CharField(max_length=200, blank=True)
+    description = models.TextField(blank=True)
+    image = models.URLField(blank=True)
+    ok = models.BooleanField(default=True)
+    fetched_at = models.DateTimeField()
+    expires_at = models.DateTimeField(db_index=True)
+
+    class Meta:
+        verbose_name = '링크 메타데이터 캐시'
+        verbose_name_plural = '링크 메타데이터 캐시'
+
+    def __str__(self):
+        return self.url
+
+    def as_dict(self):
+        return {'title': self.title, 'description': self.description, 'image': self.image}
+
+
+@receiver([post_save, post_delete], sender=Link)
+def invalidate_link_pages(sender, **kwargs):
+    invalidate_anonymous_pages('links')
@@ -0,0 +1,152 @@
+# links/tasks.py
+
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.utils import timezone
+
+from config.http_cache import invalidate_anonymous_pages
+from search.index import index_links
+from .http import HostUnavailable
+from .images import store_image
+from .models import Link
+from .utils import fetch_og_metadata
+
+logger = logging.getLogger(__name__)
+
+# 가져오는 중(fetching) 상태로 이 시간 넘게 남은 링크는 워커가 중단된 것으로 보고 다시 대기시킴
+STALE_AFTER = timedelta(minutes=5)
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.LINK_METADATA_WORKER_THREADS, thread_name_prefix='link-metadata')
+        return _executor
+
+
+def enqueue_metadata(link):
+    """
+    저장된 링크의 OG 메타데이터 수집을 예약합니다.
+
+    링크는 대기(pending) 상태로 먼저 저장되어 요청은 원격 사이트를 기다리지 않습니다.
+    LINK_METADATA_WORKER_MODE가 'thread'이면 커밋 후 스레드 풀에, 'sync'이면 커밋 직후
+    같은 스레드에서 처리하고, 'off'이면 fetch_link_metadata 명령이 처리할 때까지 대기합니다.
+    """
+    mode = settings.LINK_METADATA_WORKER_MODE
+    if mode == 'thread':
+        transaction.on_commit(lambda: _get_executor().submit(_run_in_thread, link.pk))
+    elif mode == 'sync':
+        transaction.on_commit(lambda: process_link(link.pk))
+
+
+def enqueue_many(link_ids):
+    """대기 상태로 한꺼번에 저장한 링크들(bulk_create)의 메타데이터 수집을 예약합니다."""
+    mode = settings.LINK_METADATA_WORKER_MODE
+    if mode == 'thread':
+        transaction.on_commit(lambda: [_get_executor().submit(_run_in_thread, pk) for pk in link_ids])
+    elif mode == 'sync':
+        transaction.on_commit(lambda: [process_link(pk) for pk in link_ids])
+
+
+def _run_in_thread(link_id):
+    try:
+        process_link(link_id)
+    finally:
+        # 스레드마다 열린 DB 연결을 정리
+        close_old_connections()
+
+
+def _retry_later(link_id):
+    # 'thread' 모드에서는 LINK_FETCH_RETRY_DELAY초 뒤 스레드 풀에 다시 넣고,
+    # 그 밖의 모드에서는 fetch_link_metadata 명령이 대기 중인 링크를 다시 처리함
+    if settings.LINK_METADATA_WORKER_MODE == 'thread':
+        timer = threading.Timer(settings.LINK_FETCH_RETRY_DELAY,
+                                lambda: _get_executor().submit(_run_in_thread, link_id))
+        timer.daemon = True
+        timer.start()
+
+
+def _claim(link_id):
+    # 대기 중인 링크만 가져오는 중으로 바꿔, 여러 워커가 같은 링크를 중복 처리하지 않도록 함
+    return Link.objects.filter(pk=link_id, status=Link.PENDING).update(
+        status=Link.FETCHING, updated_at=timezone.now()) == 1
+
+
+def process_link(link_id):
+    """링크 하나의 메타데이터를 가져와 채우고, 가져왔으면 True를 반환합니다."""
+    if not _claim(link_id):
+        return False
+    url = Link.objects.filter(pk=link_id).values_list('url', flat=True).first()
+    if url is None:
+        return False
+    try:
+        metadata = fetch_og_metadata(url)
+    except HostUnavailable as e:
+        # 호스트가 바쁘거나 차단 중이면 실패로 남기지 않고 대기 상태로 돌려 나중에 다시 시도
+        logger.info('링크 메타데이터 재시도 예약 (link=%s): %s', link_id, e)
+        Link.objects.filter(pk=link_id, status=Link.FETCHING).update(status=Link.PENDING)
+        _retry_later(link_id)
+        return False
+    found = any(metadata.values())
+    if not found:
+        logger.info('링크 메타데이터 없음 (link=%s): %s', link_id, url)
+    # save() 대신 update()로 바꾼 필드만 기록하고, updated_at을 갱신해 상세 페이지 검증자가 바뀌도록 함
+    Link.objects.filter(pk=link_id, status=Link.FETCHING).update(
+        title=metadata['title'],
+        description=metadata['description'],
+        og_image=metadata['image'],
+        status=Link.READY if found else Link.FAILED,
+        updated_at=timezone.now(),
+    )
+    # update()는 post_save 시그널을 보내지 않으므로 검색 색인을 직접 갱신
+    index_links([link_id])
+    invalidate_anonymous_pages('links')
+    # 상태는 먼저 완료로 알리고, 카드 이미지 사본은 같은 워커에서 이어서 만듦
+    if metadata['image']:
+        cache_image(link_id)
+    return found
+
+
+def cache_image(link_id):
+    """링크의 og:image를 로컬 사본으로 저장하고, 저장했으면 True를 반환합니다."""
+    og_image = Link.objects.filter(pk=link_id).values_list('og_image', flat=True).first()
+    stored = store_image(og_image) if og_image else None
+    if stored is None:
+        return False
+    name, width, height = stored
+    # 처리하는 동안 og:image가 바뀌었으면 반영하지 않음
+    Link.objects.filter(pk=link_id, og_image=og_image).update(
+        og_image_file=name, og_image_width=width, og_image_height=height, updated_at=timezone.now())
+    invalidate_anonymous_pages('links')
+    return True
+
+
+def cache_missing_images(limit=100):
+    """og:image는 있지만 로컬 사본이 없는 링크를 최대 limit개 처리하고 저장한 수를 반환합니다."""
+    link_ids = list(Link.objects.exclude(og_image='').filter(og_image_file='')
+                    .order_by('-pk').values_list('pk', flat=True)[:limit])
+    return sum(cache_image(link_id) for link_id in link_ids)
+
+
+def requeue_stale_links():
+    """중단된 워커가 남긴 가져오는 중 링크를 다시 대기 상태로 되돌립니다."""
+    return Link.objects.filter(
+        status=Link.FETCHING, updated_at__lt=timezone.now() - STALE_AFTER,
+    ).update(status=Link.PENDING)
+
+
+def process_pending(limit=100):
+    """오래된 순으로 대기 중인 링크를 최대 limit개 처리하고 메타데이터를 채운 수를 반환합니다."""
+    link_ids = list(Link.objects.filter(status=Link.PENDING)
+                    .order_by('updated_at').values_list('pk', flat=True)[:limit])
+    return sum(process_link(link_id) for link_id in link_ids)
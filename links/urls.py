@@ -5,7 +5,12 @@ app_name = 'links'
 
 urlpatterns = [
     path('', views.link_list, name='link_list'),
+    path('more/', views.load_more_links, name='load_more_links'),
+    path('user/<str:username>/', views.user_links, name='user_links'),
     path('<int:pk>/', views.link_detail, name='link_detail'),
+    path('<int:pk>/status/', views.link_status, name='link_status'),
     path('new/', views.link_create, name='link_create'),
+    path('import/', views.link_import, name='link_import'),
+    path('images/<str:name>', views.link_image, name='link_image'),
     path('<int:pk>/delete/', views.link_delete, name='link_delete'),
 ]
\ No newline at end of file
@@ -1,30 +1,193 @@
-import requests
-from bs4 import BeautifulSoup
+import codecs
+import hashlib
+import re
+from datetime import timedelta
+from html.parser import HTMLParser
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
 
-def fetch_og_metadata(url):
-    result = {'title': '', 'description': '', 'image': ''}
+from django.conf import settings
+from django.utils import timezone
+
+from config.image_resize import KeyedLocks
+from .http import HostUnavailable, open_url
+from .models import LinkMetadata
+
+# 페이지 내용과 무관한 추적용 쿼리 파라미터 (정규화할 때 제거)
+TRACKING_PARAMS = {
+    'fbclid', 'gclid', 'dclid', 'msclkid', 'yclid', 'igshid', 'mc_cid', 'mc_eid',
+    '_ga', '_gl', 'ref_src', 'spm',
+}
+TRACKING_PREFIXES = ('utm_',)
+DEFAULT_PORTS = {'http': 80, 'https': 443}
+
+HTML_TYPES = {'text/html', 'application/xhtml+xml'}
+CHUNK_SIZE = 16 * 1024
+# HTML 명세의 인코딩 사전 검사 범위
+CHARSET_PRESCAN_BYTES = 1024
+HEADER_CHARSET_RE = re.compile(r'charset\s*=\s*["\']?([a-zA-Z0-9_.:-]+)', re.IGNORECASE)
+META_CHARSET_RE = re.compile(rb'<meta[^>]+charset\s*=\s*["\']?\s*([a-zA-Z0-9_.:-]+)', re.IGNORECASE)
+BOMS = ((codecs.BOM_UTF8, 'utf-8-sig'), (codecs.BOM_UTF16_LE, 'utf-16-le'), (codecs.BOM_UTF16_BE, 'utf-16-be'))
+
+# 같은 URL을 동시에 가져오려는 워커는 하나만 원격 요청을 보내고 나머지는 캐시 결과를 씀
+_fetch_locks = KeyedLocks()
+
+
+def normalize_url(url):
+    """
+    같은 페이지를 가리키는 URL이 같은 문자열이 되도록 정규화합니다.
+
+    스킴/호스트 소문자화, 기본 포트와 프래그먼트 제거, 추적 파라미터(utm_* 등) 제거와
+    나머지 쿼리 파라미터 정렬, 경로 끝의 '/' 제거를 적용합니다.
+    """
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    # hostname은 소문자이고 IPv6 괄호가 벗겨져 있으므로 다시 씌우고, 사용자 정보(대소문자 구분)는 그대로 둠
+    host = (parts.hostname or '').rstrip('.')
+    if ':' in host:
+        host = f'[{host}]'
+    userinfo, at, _ = parts.netloc.rpartition('@')
+    try:
+        port = parts.port
+    except ValueError:
+        port = None
+    netloc = userinfo + at + (host if port in (None, DEFAULT_PORTS.get(scheme)) else f'{host}:{port}')
+    query = urlencode(sorted(
+        (name, value) for name, value in parse_qsl(parts.query, keep_blank_values=True)
+        if name.lower() not in TRACKING_PARAMS and not name.lower().startswith(TRACKING_PREFIXES)
+    ))
+    path = parts.path.rstrip('/') or '/'
+    return urlunsplit((scheme, netloc, path, query, ''))
+
+
+def _cache_key(url):
+    return hashlib.sha256(url.encode()).hexdigest()
+
+
+class HeadMetaParser(HTMLParser):
+    """
+    <head>의 <title>과 <meta> 태그만 모으는 증분 HTML 파서.
+
+    feed()로 조금씩 넣다가 </head>나 첫 <body>를 만나면 done이 되어 나머지 본문은 읽지 않아도 됩니다.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.meta = {}
+        self.title = ''
+        self.done = False
+        self._in_title = False
+
+    def handle_starttag(self, tag, attrs):
+        if tag == 'body':
+            self.done = True
+        elif tag == 'title':
+            self._in_title = True
+        elif tag == 'meta':
+            attrs = dict(attrs)
+            name = (attrs.get('property') or attrs.get('name') or '').strip().lower()
+            # 같은 태그가 여러 번 나오면 첫 번째 값을 사용
+            if name and attrs.get('content') and name not in self.meta:
+                self.meta[name] = attrs['content'].strip()
+
+    def handle_endtag(self, tag):
+        if tag == 'head':
+            self.done = True
+        elif tag == 'title':
+            self._in_title = False
+
+    def handle_data(self, data):
+        if self._in_title:
+            self.title += data
+
+
+def _sniff_charset(head):
+    """BOM이나 앞부분의 <meta charset>에서 문자 인코딩을 찾습니다."""
+    for bom, encoding in BOMS:
+        if head.startswith(bom):
+            return encoding
+    match = META_CHARSET_RE.search(head[:CHARSET_PRESCAN_BYTES])
+    return match.group(1).decode('ascii') if match else None
+
+
+def _decoder(encoding):
     try:
-        headers = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'}
-        response = requests.get(url, headers=headers, timeout=10)
+        return codecs.getincrementaldecoder(encoding or 'utf-8')(errors='replace')
+    except LookupError:
+        return codecs.getincrementaldecoder('utf-8')(errors='replace')
+
+
+def _fetch_remote(url):
+    """
+    원격 페이지의 <head>만 스트리밍으로 읽어 OG 메타데이터를 반환합니다. 요청이 실패하면 예외를 올립니다.
+
+    본문은 LINK_METADATA_MAX_BYTES까지만 받고 </head>를 만나면 바로 연결을 닫습니다.
+    HTML이 아닌 응답(이미지, PDF 등)은 내려받지 않고 빈 결과를 반환합니다.
+    """
+    result = {'title': '', 'description': '', 'image': ''}
+    with open_url(url, stream=True) as response:
         response.raise_for_status()
-        soup = BeautifulSoup(response.text, 'html.parser')
-        og_title = soup.find('meta', property='og:title')
-        og_desc = soup.find('meta', property='og:description')
-        og_image = soup.find('meta', property='og:image')
-        if og_title and og_title.get('content'):
-            result['title'] = og_title['content']
-        if og_desc and og_desc.get('content'):
-            result['description'] = og_desc['content']
-        if og_image and og_image.get('content'):
-            result['image'] = og_image['content']
-        if not result['title']:
-            title_tag = soup.find('title')
-            if title_tag and title_tag.string:
-                result['title'] = title_tag.string.strip()
-        if not result['description']:
-            meta_desc = soup.find('meta', attrs={'name': 'description'})
-            if meta_desc and meta_desc.get('content'):
-                result['description'] = meta_desc['content']
-    except (requests.RequestException, Exception):
-        pass
-    return result
\ No newline at end of file
+        content_type = response.headers.get('Content-Type', '')
+        mimetype = content_type.split(';')[0].strip().lower()
+        if mimetype and mimetype not in HTML_TYPES:
+            return result
+
+        # 헤더에 charset이 없으면 requests의 기본값(ISO-8859-1) 대신 문서 앞부분에서 찾음
+        match = HEADER_CHARSET_RE.search(content_type)
+        header_charset = match.group(1) if match else None
+        parser = HeadMetaParser()
+        decoder = None
+        received = 0
+        for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+            if decoder is None:
+                decoder = _decoder(header_charset or _sniff_charset(chunk))
+            chunk = chunk[:settings.LINK_METADATA_MAX_BYTES - received]
+            received += len(chunk)
+            parser.feed(decoder.decode(chunk))
+            if parser.done or received >= settings.LINK_METADATA_MAX_BYTES:
+                break
+
+    meta = parser.meta
+    result['title'] = meta.get('og:title') or ' '.join(parser.title.split())
+    result['description'] = meta.get('og:description') or meta.get('description', '')
+    result['image'] = meta.get('og:image', '')
+    return result
+
+
+def fetch_og_metadata(url):
+    """
+    url의 OG 메타데이터(title/description/image)를 반환합니다. 실패하면 빈 값을 반환합니다.
+
+    정규화한 URL로 LinkMetadata 캐시를 먼저 찾고, 없거나 만료되었을 때만 원격 페이지를 가져옵니다.
+    성공한 결과는 LINK_METADATA_TTL, 실패한 결과는 LINK_METADATA_NEGATIVE_TTL 동안 캐시합니다.
+    호스트 한도나 회로 차단으로 요청을 보내지 못하면 캐시하지 않고 HostUnavailable을 올립니다.
+    """
+    canonical = normalize_url(url)
+    key = _cache_key(canonical)
+    with _fetch_locks.hold(key):
+        cached = LinkMetadata.objects.filter(key=key, expires_at__gt=timezone.now()).first()
+        if cached is not None:
+            return cached.as_dict()
+
+        try:
+            result, ok = _fetch_remote(url), True
+        except HostUnavailable:
+            raise
+        except Exception:
+            result, ok = {'title': '', 'description': '', 'image': ''}, False
+        # 필드 길이를 넘는 값은 잘라 저장 (잘린 이미지 URL은 쓸모가 없으므로 버림)
+        result['title'] = result['title'][:200]
+        if len(result['image']) > 200:
+            result['image'] = ''
+        now = timezone.now()
+        ttl = settings.LINK_METADATA_TTL if ok else settings.LINK_METADATA_NEGATIVE_TTL
+        LinkMetadata.objects.update_or_create(key=key, defaults={
+            **result, 'url': canonical[:2000], 'ok': ok,
+            'fetched_at': now, 'expires_at': now + timedelta(seconds=ttl),
+        })
+    return result
+
+
+def purge_expired_metadata():
+    """만료된 메타데이터 캐시 행을 지우고 지운 수를 반환합니다."""
+    deleted, _ = LinkMetadata.objects.filter(expires_at__lte=timezone.now()).delete()
+    return deleted
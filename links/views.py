@@ -1,18 +1,143 @@
+import re
+
+from django.conf import settings
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
+from django.contrib.auth.models import User
+from django.core.files.storage import default_storage
+from django.http import FileResponse, Http404, JsonResponse
 from django.shortcuts import get_object_or_404, redirect, render
-from .forms import LinkForm
+from django.template.loader import render_to_string
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.views.decorators.cache import never_cache
+from config.http_cache import cache_anonymous_page, conditional_page, make_etag, set_validators
+from posts.pagination import CursorPaginator, InvalidCursor
+from .forms import LinkForm, LinkImportForm
+from .images import IMAGE_DIR
+from .importer import import_links
 from .models import Link
-from .utils import fetch_og_metadata
+from .tasks import enqueue_metadata
+
+LINKS_PER_PAGE = 20
+
+# store_image가 만드는 내용 해시 파일 이름
+IMAGE_NAME_RE = re.compile(r'^[0-9a-f]{32}(_\w+)?\.jpg$')
+
+
+def _link_page(request, queryset):
+    """
+    (created_at, id) 키셋 페이지 하나. 작성자 이름은 JOIN으로 함께 가져와 행마다 쿼리하지 않으며,
+    테이블 크기와 무관하게 인덱스 범위 조회 한 번으로 끝납니다. 잘못된 커서는 InvalidCursor.
+    """
+    return CursorPaginator(queryset.select_related('user'), LINKS_PER_PAGE).page(request.GET.get('cursor'))
+
+
+def _page_etag(page_obj, *parts):
+    # 페이지에 보이는 행과 다음 커서만으로 만들어 전체 테이블 집계(COUNT/MAX)가 필요 없음
+    rows = [(link.pk, link.updated_at, link.user.username) for link in page_obj]
+    return make_etag(*parts, rows, page_obj.next_cursor)
+
+
+def _links_page(request, queryset, context):
+    """
+    링크 목록 첫 페이지(또는 ?cursor= 다음 페이지) HTML.
+    비로그인 요청은 보이는 행으로 만든 ETag가 같으면 렌더링 없이 304를 반환합니다.
+    """
+    try:
+        page_obj = _link_page(request, queryset)
+    except InvalidCursor:
+        raise Http404
+    profile_user = context.get('profile_user')
+    etag = _page_etag(page_obj, 'link_list', profile_user and profile_user.pk)
+    anonymous = not request.user.is_authenticated
+    if anonymous:
+        not_modified = get_conditional_response(request, etag=etag)
+        if not_modified is not None:
+            return set_validators(not_modified, etag)
+    response = render(request, 'links/link_list.html', {**context, 'links': page_obj})
+    # 로그인 사용자의 화면에는 사용자별 내용(CSRF 토큰 등)이 있으므로 검증자를 붙이지 않음
+    return set_validators(response, etag) if anonymous else response
+
+
+def _link_detail_validators(request, pk):
+    updated_at = Link.objects.filter(pk=pk).values_list('updated_at', flat=True).first()
+    if updated_at is None:
+        return None
+    return make_etag('link_detail', pk, updated_at), updated_at
+
 
+@cache_anonymous_page('links', 'users')
 def link_list(request):
+    return _links_page(request, Link.objects.all(), {})
+
+@cache_anonymous_page('links', 'users')
+def user_links(request, username):
+    profile_user = get_object_or_404(User, username=username)
+    return _links_page(request, Link.objects.filter(user=profile_user), {'profile_user': profile_user})
+
+def load_more_links(request):
+    """무한 스크롤용 다음 페이지 JSON (?cursor=...&user=사용자 이름)"""
     links = Link.objects.all()
-    return render(request, 'links/link_list.html', {'links': links})
+    username = request.GET.get('user')
+    if username:
+        links = links.filter(user__username=username)
+    try:
+        page_obj = _link_page(request, links)
+    except InvalidCursor:
+        return JsonResponse({'html': '', 'has_next': False, 'next_cursor': None})
+    # 카드 HTML은 사용자와 무관하므로 로그인 여부와 상관없이 ETag로 304를 반환
+    etag = _page_etag(page_obj, 'load_more_links', username)
+    not_modified = get_conditional_response(request, etag=etag)
+    if not_modified is not None:
+        return set_validators(not_modified, etag)
+    response = JsonResponse({
+        'html': render_to_string('links/includes/link_cards.html', {'links': page_obj}),
+        'has_next': page_obj.has_next(),
+        'next_cursor': page_obj.next_cursor,
+    })
+    return set_validators(response, etag)
 
+@cache_anonymous_page('links', 'users')
+@conditional_page(_link_detail_validators)
 def link_detail(request, pk):
-    link = get_object_or_404(Link, pk=pk)
+    link = get_object_or_404(Link.objects.select_related('user'), pk=pk)
     return render(request, 'links/link_detail.html', {'link': link})
 
+@never_cache
+def link_status(request, pk):
+    """link_detail이 메타데이터가 채워질 때까지 폴링하는 가벼운 상태 엔드포인트"""
+    link = Link.objects.filter(pk=pk).only(
+        'status', 'title', 'description', 'og_image', 'og_image_file', 'url').first()
+    if link is None:
+        return JsonResponse({'error': 'not found'}, status=404)
+    return JsonResponse({
+        'status': link.status,
+        'pending': link.is_pending,
+        'title': link.title or link.url,
+        'description': link.description,
+        'image': link.image_url,
+    })
+
+def link_image(request, name):
+    """
+    저장한 og:image 사본을 돌려줍니다.
+
+    파일 이름이 내용의 해시라 같은 주소의 내용은 바뀌지 않으므로 immutable로 오래 캐시합니다.
+    """
+    if not IMAGE_NAME_RE.match(name):
+        raise Http404
+    path = f'{IMAGE_DIR}/{name}'
+    # 지워진 사본에 304를 돌려주지 않도록 파일이 있는지 먼저 확인
+    if not default_storage.exists(path):
+        raise Http404
+    etag = f'"{name}"'
+    response = get_conditional_response(request, etag=etag)
+    if response is None:
+        response = FileResponse(default_storage.open(path), content_type='image/jpeg')
+    response['ETag'] = etag
+    patch_cache_control(response, public=True, max_age=settings.LINK_IMAGE_MAX_AGE, immutable=True)
+    return response
+
 @login_required
 def link_create(request):
     if request.method == 'POST':
@@ -20,17 +145,33 @@ def link_create(request):
         if form.is_valid():
             link = form.save(commit=False)
             link.user = request.user
-            metadata = fetch_og_metadata(link.url)
-            link.title = metadata['title']
-            link.description = metadata['description']
-            link.og_image = metadata['image']
+            # 원격 사이트를 기다리지 않고 바로 저장하고, 메타데이터는 백그라운드에서 채움
+            link.status = Link.PENDING
             link.save()
+            enqueue_metadata(link)
             messages.success(request, '링크가 추가되었습니다.')
             return redirect('links:link_detail', pk=link.pk)
     else:
         form = LinkForm()
     return render(request, 'links/link_create.html', {'form': form})
 
+@login_required
+def link_import(request):
+    if request.method == 'POST':
+        form = LinkImportForm(request.POST, request.FILES)
+        if form.is_valid():
+            # 저장만 하고 메타데이터는 백그라운드 워커가 채움 (요청이 원격 사이트를 기다리지 않음)
+            result = import_links(request.user, form.cleaned_data['entries'])
+            messages.success(
+                request,
+                f"링크 {result['created']}개를 가져왔습니다. 미리보기 정보는 잠시 후 채워집니다. "
+                f"(중복 {result['duplicates']}개, 잘못된 URL {result['invalid']}개 제외)",
+            )
+            return redirect('links:link_list')
+    else:
+        form = LinkImportForm()
+    return render(request, 'links/link_import.html', {'form': form})
+
 @login_required
 def link_delete(request, pk):
     link = get_object_or_404(Link, pk=pk)
@@ -3,3 +3,7 @@ from django.apps import AppConfig
 
 class PostsConfig(AppConfig):
     name = 'posts'
+
+    def ready(self):
+        from config import http_cache  # noqa: F401  (페이지 캐시 검사 등록)
+        from . import signals  # noqa: F401
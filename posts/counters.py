@@ -0,0 +1,73 @@
+# posts/counters.py
+
+from django.db import transaction
+from django.db.models import Count, F, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from users.models import Profile
+from .models import Comment, Follow, Like, Post, PostTag, Tag
+
+
+def _bump(queryset, field, delta, **extra):
+    # 카운터가 음수가 되지 않도록 감소는 0보다 큰 행에만 적용
+    if delta < 0:
+        queryset = queryset.filter(**{f'{field}__gt': 0})
+    queryset.update(**{field: F(field) + delta}, **extra)
+
+
+def bump_post(post_id, field, delta):
+    # 같은 UPDATE에서 활동 시각도 기록해 다음 인기 점수 계산 대상에 넣음
+    _bump(Post.objects.filter(pk=post_id), field, delta, activity_at=timezone.now())
+
+
+def bump_profile(user_id, field, delta):
+    _bump(Profile.objects.filter(user_id=user_id), field, delta)
+
+
+def bump_tags(tag_ids, delta):
+    # tag_ids는 id 목록이나 태그 id 쿼리셋 (쿼리셋이면 서브쿼리로 UPDATE 한 번에 갱신)
+    _bump(Tag.objects.filter(pk__in=tag_ids), 'post_count', delta)
+
+
+def _count(model, fk, outer='pk'):
+    """바깥 행의 outer 값을 fk로 참조하는 model 행 수 서브쿼리 (없으면 0)"""
+    subquery = (model.objects.filter(**{fk: OuterRef(outer)})
+                .order_by().values(fk).annotate(n=Count('pk')).values('n'))
+    return Coalesce(Subquery(subquery), Value(0))
+
+
+def _reconcile(queryset, batch_size, **counts):
+    """pk 순서대로 batch_size씩 나누어 카운터를 다시 계산합니다. 처리한 행 수를 반환합니다."""
+    last_pk = 0
+    total = 0
+    while True:
+        pks = list(queryset.filter(pk__gt=last_pk).order_by('pk')
+                   .values_list('pk', flat=True)[:batch_size])
+        if not pks:
+            return total
+        with transaction.atomic():
+            queryset.filter(pk__in=pks).update(**counts)
+        total += len(pks)
+        last_pk = pks[-1]
+
+
+def reconcile_posts(batch_size=1000):
+    return _reconcile(
+        Post.objects.all(), batch_size,
+        like_count=_count(Like, 'post'),
+        comment_count=_count(Comment, 'post'),
+    )
+
+
+def reconcile_profiles(batch_size=1000):
+    return _reconcile(
+        Profile.objects.all(), batch_size,
+        followers_count=_count(Follow, 'following', 'user_id'),
+        following_count=_count(Follow, 'follower', 'user_id'),
+        posts_count=_count(Post, 'user', 'user_id'),
+    )
+
+
+def reconcile_tags(batch_size=1000):
+    return _reconcile(Tag.objects.all(), batch_size, post_count=_count(PostTag, 'tag'))
@@ -0,0 +1,48 @@
+# posts/fragments.py
+
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from django.template.loader import render_to_string
+from django.utils.safestring import mark_safe
+
+CARD_TEMPLATE = 'posts/includes/post_card.html'
+# 캐시된 카드 HTML에서 조회수 자리. 조회수는 가장 자주 바뀌므로 버전에 넣지 않고 꺼낼 때 채움
+VIEWS_SLOT = '<!--post-card-views-->'
+
+
+def card_version(post):
+    """
+    카드 내용을 결정하는 값들로 만든 버전 문자열.
+
+    Post.save()가 갱신하는 updated_at, 카운터(좋아요/댓글), 썸네일,
+    작성자 이름과 프로필 이미지가 하나라도 바뀌면 버전이 달라지므로
+    별도의 무효화 없이 새 키로 다시 렌더링됩니다. for_feed()로 조회한
+    행만으로 계산되어 추가 쿼리가 없습니다. 조회수는 VIEWS_SLOT에 따로 채웁니다.
+    """
+    parts = (
+        post.updated_at.isoformat(), post.like_count, post.comment_count,
+        post.thumbnail.name, post.user.username, post.user.profile.profile_image.name,
+    )
+    return hashlib.md5(repr(parts).encode()).hexdigest()
+
+
+def card_key(post):
+    return f'post_card:{post.pk}:{card_version(post)}'
+
+
+def render_post_cards(posts):
+    """게시물 카드 HTML을 이어 붙여 반환합니다. 캐시된 카드는 get_many 한 번으로 가져옵니다."""
+    keys = {post.pk: card_key(post) for post in posts}
+    cached = cache.get_many(keys.values())
+    missing = {}
+    fragments = []
+    for post in posts:
+        key = keys[post.pk]
+        if key not in cached:
+            cached[key] = missing[key] = render_to_string(CARD_TEMPLATE, {'post': post, 'views': VIEWS_SLOT})
+        fragments.append(cached[key].replace(VIEWS_SLOT, str(post.views), 1))
+    if missing:
+        cache.set_many(missing, settings.POST_CARD_CACHE_TIMEOUT)
+    return mark_safe(''.join(fragments))
@@ -0,0 +1,30 @@
+# posts/images.py
+
+import random
+from io import BytesIO
+
+from django.core.files.base import ContentFile
+from PIL import Image, ImageDraw
+
+STRIPE_PERIOD = 40
+STRIPE_WIDTH = 20
+
+
+def generate_random_image(size=400, rng=random):
+    """
+    랜덤 컬러 바탕에 밝은 세로 줄무늬가 있는 size x size 이미지를 생성합니다.
+
+    줄무늬는 픽셀 단위가 아니라 사각형 영역 단위로 그리므로 이미지 크기와
+    관계없이 줄무늬 수만큼의 그리기 호출로 끝납니다. rng를 넘기면 같은 시드로
+    같은 이미지를 만들 수 있습니다.
+    """
+    color = (rng.randint(50, 220), rng.randint(50, 220), rng.randint(50, 220))
+    lighter = tuple(min(c + 30, 255) for c in color)
+    img = Image.new('RGB', (size, size), color)
+    draw = ImageDraw.Draw(img)
+    for x in range(0, size, STRIPE_PERIOD):
+        draw.rectangle((x, 0, min(x + STRIPE_WIDTH, size) - 1, size - 1), fill=lighter)
+    buf = BytesIO()
+    img.save(buf, format='JPEG', quality=85)
+    filename = f'random_{rng.randint(10000, 99999)}.jpg'
+    return filename, ContentFile(buf.getvalue())
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from posts import tags
+
+
+class Command(BaseCommand):
+    help = '기존 게시물 본문에서 해시태그를 추출해 태그 색인(Tag/PostTag)과 태그별 게시물 수를 채웁니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        total = tags.backfill(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'태그 백필 완료: 게시물 {total}건'))
@@ -0,0 +1,60 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from posts import timeline
+from posts.models import Follow, Post, TimelineEntry
+from users.models import Profile
+
+
+class Command(BaseCommand):
+    help = '기존 게시물과 팔로우 관계로 팔로잉 피드 타임라인을 채웁니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument('--limit', type=int, default=settings.TIMELINE_BACKFILL_LIMIT,
+                            help='팔로우 관계마다 채워 넣을 최근 게시물 수')
+        parser.add_argument('--clear', action='store_true', help='기존 타임라인을 비우고 다시 만듭니다.')
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        if options['clear']:
+            TimelineEntry.objects.all().delete()
+
+        # 작성자 본인의 타임라인
+        last_pk = 0
+        own = 0
+        while True:
+            batch = list(Post.objects.filter(pk__gt=last_pk).order_by('pk')
+                         .values_list('pk', 'user_id', 'created_at')[:batch_size])
+            if not batch:
+                break
+            TimelineEntry.objects.bulk_create([
+                TimelineEntry(user_id=user_id, post_id=pk, author_id=user_id, created_at=created_at)
+                for pk, user_id, created_at in batch
+            ], ignore_conflicts=True)
+            own += len(batch)
+            last_pk = batch[-1][0]
+
+        # 팔로우 관계: 작성자별로 최근 게시물을 한 번 조회해 모든 팔로워에게 채움
+        # (팬아웃 대상이 아닌 대형 작성자는 제외)
+        celebrities = set(
+            Profile.objects.filter(followers_count__gt=settings.TIMELINE_FANOUT_MAX_FOLLOWERS)
+            .values_list('user_id', flat=True)
+        )
+        last_author = 0
+        follows = 0
+        while True:
+            authors = list(Follow.objects.filter(following_id__gt=last_author).order_by('following_id')
+                           .values_list('following_id', flat=True).distinct()[:batch_size])
+            if not authors:
+                break
+            with transaction.atomic():
+                for author_id in authors:
+                    if author_id not in celebrities:
+                        follows += timeline.backfill_author(author_id, limit=options['limit'])
+            last_author = authors[-1]
+            self.stdout.write(f'팔로우 {follows}건 처리')
+
+        self.stdout.write(self.style.SUCCESS(
+            f'타임라인 백필 완료: 게시물 {own}건, 팔로우 {follows}건'))
@@ -0,0 +1,31 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from posts import thumbnails
+
+
+class Command(BaseCommand):
+    help = '대기 중인 썸네일 생성 작업을 처리합니다. --loop를 주면 워커로 계속 실행합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=100)
+        parser.add_argument('--loop', action='store_true', help='작업을 기다리며 계속 실행')
+        parser.add_argument('--interval', type=float, default=2.0, help='대기 작업이 없을 때 쉬는 시간(초)')
+        parser.add_argument('--backfill', action='store_true', help='렌디션이 없는 기존 게시물의 작업을 먼저 등록')
+
+    def handle(self, *args, **options):
+        if options['backfill']:
+            self.stdout.write(f'기존 게시물 {thumbnails.enqueue_missing()}건 작업 등록')
+        while True:
+            requeued = thumbnails.requeue_stale_jobs()
+            if requeued:
+                self.stdout.write(f'중단된 작업 {requeued}건 재등록')
+            done = thumbnails.process_pending(options['batch_size'])
+            if done or not options['loop']:
+                self.stdout.write(f'썸네일 {done}건 생성')
+            if not options['loop']:
+                break
+            if not done:
+                time.sleep(options['interval'])
+        self.stdout.write(self.style.SUCCESS('썸네일 작업 처리 완료'))
@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from posts import counters
+
+
+class Command(BaseCommand):
+    help = '좋아요/댓글/팔로워/게시물/태그 카운터를 원본 테이블 기준으로 다시 계산합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        posts = counters.reconcile_posts(batch_size)
+        self.stdout.write(f'게시물 {posts}건 카운터 재계산')
+        profiles = counters.reconcile_profiles(batch_size)
+        self.stdout.write(f'프로필 {profiles}건 카운터 재계산')
+        tag_count = counters.reconcile_tags(batch_size)
+        self.stdout.write(f'태그 {tag_count}건 카운터 재계산')
+        self.stdout.write(self.style.SUCCESS('카운터 재계산 완료'))
@@ -0,0 +1,243 @@
+import random
+import time
+from contextlib import contextmanager
+from datetime import timedelta
+from itertools import accumulate
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.files.storage import default_storage
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from config.http_cache import invalidate_anonymous_pages
+from links.models import Link
+from posts import counters, tags
+from posts.images import generate_random_image
+from posts.models import Comment, Follow, Like, Post
+from users.models import Profile
+
+WORDS = [
+    '오늘', '사진', '여행', '카페', '풍경', '하늘', '바다', '산책', '주말', '친구',
+    '맛집', '저녁', '아침', '고양이', '강아지', '노을', '공원', '도시', '기록', '일상',
+]
+
+
+@contextmanager
+def explicit_timestamps(*models):
+    """auto_now/auto_now_add를 잠시 꺼서 bulk_create에 지정한 시각을 그대로 저장합니다."""
+    fields = [
+        field for model in models for field in model._meta.concrete_fields
+        if getattr(field, 'auto_now', False) or getattr(field, 'auto_now_add', False)
+    ]
+    saved = [(field, field.auto_now, field.auto_now_add) for field in fields]
+    for field in fields:
+        field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, auto_now, auto_now_add in saved:
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add
+
+
+def zipf_cum_weights(n, alpha):
+    """순위 r(1부터)의 가중치가 1 / r^alpha인 누적 가중치 (random.choices용)"""
+    return list(accumulate(1 / (rank ** alpha) for rank in range(1, n + 1)))
+
+
+class Command(BaseCommand):
+    help = (
+        '부하 테스트용 사용자/프로필/게시물/댓글/좋아요/팔로우 데이터를 bulk_create로 생성합니다. '
+        '작성/팔로우/좋아요 수는 멱법칙(Zipf) 분포를 따릅니다.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=1000)
+        parser.add_argument('--posts', type=int, default=10000)
+        parser.add_argument('--follows', type=int, default=20000)
+        parser.add_argument('--likes', type=int, default=50000)
+        parser.add_argument('--comments', type=int, default=20000)
+        parser.add_argument('--links', type=int, default=0)
+        parser.add_argument('--alpha', type=float, default=1.0, help='멱법칙 지수 (클수록 소수에 집중)')
+        parser.add_argument('--days', type=int, default=365, help='게시물 작성 시각을 분포시킬 기간(일)')
+        parser.add_argument('--image-ratio', type=float, default=0.3, help='이미지가 있는 게시물 비율')
+        parser.add_argument('--image-pool', type=int, default=50, help='생성해 돌려 쓸 이미지 수')
+        parser.add_argument('--prefix', default='seed', help='생성할 사용자 이름 접두사')
+        parser.add_argument('--password', default='password123')
+        parser.add_argument('--batch-size', type=int, default=5000)
+        parser.add_argument('--seed', type=int, default=None, help='난수 시드 (같은 값이면 같은 데이터)')
+        parser.add_argument('--timeline-limit', type=int, default=20,
+                            help='팔로우 관계마다 타임라인에 채울 최근 게시물 수 (행 수가 팔로우 수 x 이 값까지 늘어남)')
+        parser.add_argument('--skip-timeline', action='store_true', help='팔로잉 피드 타임라인 백필을 건너뜀')
+
+    def handle(self, *args, **options):
+        self.rng = random.Random(options['seed'])
+        self.batch_size = options['batch_size']
+        self.alpha = options['alpha']
+        self.now = timezone.now()
+        started = time.monotonic()
+
+        with explicit_timestamps(User, Post, Comment, Like, Follow, Link):
+            user_ids = self.create_users(options['users'], options['prefix'], options['password'], options['days'])
+            # 인기(팔로우/좋아요를 받는 정도)와 활동량(작성/팔로우/좋아요를 하는 정도)은 서로 다른 순위
+            self.popular = self.ranked(user_ids)
+            self.active = self.ranked(user_ids)
+            images = self.create_image_pool(options['image_pool'] if options['image_ratio'] > 0 else 0)
+            posts = self.create_posts(options['posts'], options['days'], images, options['image_ratio'])
+            self.create_follows(options['follows'])
+            self.create_likes(options['likes'], posts)
+            self.create_comments(options['comments'], posts)
+            self.create_links(options['links'], options['days'])
+
+        # bulk_create는 시그널을 보내지 않으므로 카운터/태그/타임라인/검색 색인/인기 점수/캐시를 직접 맞춤
+        self.stdout.write('카운터 재계산...')
+        counters.reconcile_posts(self.batch_size)
+        counters.reconcile_profiles(self.batch_size)
+        self.stdout.write('해시태그 색인...')
+        tags.backfill(batch_size=self.batch_size)
+        if not options['skip_timeline']:
+            self.stdout.write('타임라인 백필...')
+            call_command('backfill_timeline', batch_size=self.batch_size, limit=options['timeline_limit'],
+                         stdout=self.stdout)
+        self.stdout.write('검색 색인 재구성...')
+        call_command('rebuild_search_index', batch_size=self.batch_size, stdout=self.stdout)
+        self.stdout.write('인기 점수 계산...')
+        call_command('update_trending', full=True, batch_size=self.batch_size, stdout=self.stdout)
+        invalidate_anonymous_pages('posts', 'users', 'links')
+        self.stdout.write(self.style.SUCCESS(
+            f'시드 데이터 생성 완료 ({time.monotonic() - started:.1f}초). '
+            f'썸네일은 process_thumbnails --backfill로 생성하세요.'))
+
+    def ranked(self, ids):
+        ids = list(ids)
+        self.rng.shuffle(ids)
+        return ids, zipf_cum_weights(len(ids), self.alpha)
+
+    def pick(self, ranked, k):
+        ids, cum_weights = ranked
+        return self.rng.choices(ids, cum_weights=cum_weights, k=k)
+
+    def random_time(self, start, end):
+        return start + (end - start) * self.rng.random()
+
+    def bulk_create(self, model, objs):
+        with transaction.atomic():
+            created = model.objects.bulk_create(objs, batch_size=self.batch_size)
+        return created
+
+    def batches(self, total):
+        for start in range(0, total, self.batch_size):
+            yield min(self.batch_size, total - start)
+
+    def create_users(self, total, prefix, password, days):
+        # 비밀번호 해시는 한 번만 계산해 모든 사용자에게 사용
+        password = make_password(password)
+        offset = User.objects.filter(username__startswith=prefix).count()
+        since = self.now - timedelta(days=days)
+        user_ids = []
+        for size in self.batches(total):
+            start = offset + len(user_ids)
+            users = self.bulk_create(User, [
+                User(username=f'{prefix}{start + i}', email=f'{prefix}{start + i}@example.com',
+                     password=password, date_joined=self.random_time(since, self.now))
+                for i in range(size)
+            ])
+            self.bulk_create(Profile, [Profile(user_id=user.pk) for user in users])
+            user_ids += [user.pk for user in users]
+        self.stdout.write(f'사용자 {len(user_ids)}명 생성')
+        return user_ids
+
+    def create_image_pool(self, size):
+        names = []
+        for i in range(size):
+            filename, content = generate_random_image(rng=self.rng)
+            names.append(default_storage.save(f'post_images/seed_{i}_{filename}', content))
+        return names
+
+    def create_posts(self, total, days, images, image_ratio):
+        since = self.now - timedelta(days=days)
+        posts = []
+        for size in self.batches(total):
+            objs = []
+            for author in self.pick(self.popular, size):
+                created_at = self.random_time(since, self.now)
+                image = self.rng.choice(images) if images and self.rng.random() < image_ratio else ''
+                words = self.rng.choices(WORDS, k=self.rng.randint(3, 12))
+                # 첫 낱말을 해시태그로 달아 태그 피드에도 데이터가 분포되도록 함
+                content = ' '.join(words) + f' #{words[0]}'
+                objs.append(Post(user_id=author, content=content, image=image,
+                                 created_at=created_at, updated_at=created_at))
+            posts += [(post.pk, post.created_at) for post in self.bulk_create(Post, objs)]
+        self.stdout.write(f'게시물 {len(posts)}개 생성')
+        return posts
+
+    def unique_pairs(self, total, draw):
+        """draw(k)로 뽑은 쌍에서 중복을 뺀 total개 이하의 쌍 (가능한 쌍이 소진되면 멈춤)"""
+        seen = set()
+        stalled = 0
+        while len(seen) < total and stalled < 3:
+            before = len(seen)
+            seen.update(draw(total - len(seen)))
+            stalled = stalled + 1 if len(seen) == before else 0
+        return list(seen)[:total]
+
+    def create_follows(self, total):
+        pairs = self.unique_pairs(total, lambda k: (
+            (follower, following)
+            for follower, following in zip(self.pick(self.active, k), self.pick(self.popular, k))
+            if follower != following
+        ))
+        for start in range(0, len(pairs), self.batch_size):
+            self.bulk_create(Follow, [
+                Follow(follower_id=follower, following_id=following, created_at=self.random_time(
+                    self.now - timedelta(days=30), self.now))
+                for follower, following in pairs[start:start + self.batch_size]
+            ])
+        self.stdout.write(f'팔로우 {len(pairs)}건 생성')
+
+    def reaction_time(self, post_created_at):
+        return min(self.now, post_created_at + timedelta(hours=72 * self.rng.random()))
+
+    def create_likes(self, total, posts):
+        if not posts:
+            return
+        ranked_posts = self.ranked(range(len(posts)))
+        pairs = self.unique_pairs(total, lambda k: zip(self.pick(self.active, k), self.pick(ranked_posts, k)))
+        for start in range(0, len(pairs), self.batch_size):
+            self.bulk_create(Like, [
+                Like(user_id=user_id, post_id=posts[i][0], created_at=self.reaction_time(posts[i][1]))
+                for user_id, i in pairs[start:start + self.batch_size]
+            ])
+        self.stdout.write(f'좋아요 {len(pairs)}건 생성')
+
+    def create_comments(self, total, posts):
+        if not posts:
+            return
+        ranked_posts = self.ranked(range(len(posts)))
+        created = 0
+        for size in self.batches(total):
+            objs = []
+            for user_id, i in zip(self.pick(self.active, size), self.pick(ranked_posts, size)):
+                created_at = self.reaction_time(posts[i][1])
+                objs.append(Comment(user_id=user_id, post_id=posts[i][0], created_at=created_at,
+                                    updated_at=created_at,
+                                    content=' '.join(self.rng.choices(WORDS, k=self.rng.randint(2, 8)))))
+            created += len(self.bulk_create(Comment, objs))
+        self.stdout.write(f'댓글 {created}개 생성')
+
+    def create_links(self, total, days):
+        since = self.now - timedelta(days=days)
+        created = 0
+        for size in self.batches(total):
+            objs = []
+            for user_id in self.pick(self.active, size):
+                created_at = self.random_time(since, self.now)
+                words = self.rng.choices(WORDS, k=self.rng.randint(2, 6))
+                objs.append(Link(user_id=user_id, url=f'https://example.com/{created + len(objs)}',
+                                 title=' '.join(words), description=' '.join(words * 3),
+                                 created_at=created_at, updated_at=created_at))
+            created += len(self.bulk_create(Link, objs))
+        if created:
+            self.stdout.write(f'링크 {created}개 생성')
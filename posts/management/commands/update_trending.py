@@ -0,0 +1,27 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from posts import trending
+
+
+class Command(BaseCommand):
+    help = '최근 활동이 있는 게시물의 인기 점수를 다시 계산합니다. --loop를 주면 주기적으로 계속 실행합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument('--loop', action='store_true', help='주기적으로 계속 실행')
+        parser.add_argument('--interval', type=float, default=60.0, help='다시 계산하는 주기(초)')
+        parser.add_argument('--full', action='store_true', help='기간 안의 모든 게시물 점수를 다시 계산')
+
+    def handle(self, *args, **options):
+        full = options['full']
+        while True:
+            updated, removed = trending.update_scores(full=full, batch_size=options['batch_size'])
+            if updated or removed or not options['loop']:
+                self.stdout.write(f'인기 점수 {updated}건 계산, {removed}건 제외')
+            if not options['loop']:
+                break
+            full = False
+            time.sleep(options['interval'])
+        self.stdout.write(self.style.SUCCESS('인기 점수 계산 완료'))
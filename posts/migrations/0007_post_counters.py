@@ -0,0 +1,39 @@
+# Generated by Django 6.1.2 on 2026-10-16 23:03
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def populate_counters(apps, schema_editor):
+    Post = apps.get_model('posts', 'Post')
+    Like = apps.get_model('posts', 'Like')
+    Comment = apps.get_model('posts', 'Comment')
+
+    def count(model):
+        subquery = (model.objects.filter(post=OuterRef('pk'))
+                    .order_by().values('post').annotate(n=Count('pk')).values('n'))
+        return Coalesce(Subquery(subquery), Value(0))
+
+    Post.objects.update(like_count=count(Like), comment_count=count(Comment))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0006_timelineentry'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='comment_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='댓글 수'),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='like_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='좋아요 수'),
+        ),
+        migrations.RunPython(populate_counters, migrations.RunPython.noop),
+    ]
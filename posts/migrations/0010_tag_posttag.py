@@ -0,0 +1,87 @@
+# Generated by Django 6.1.2 on 2026-10-17 00:23
+
+import re
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models.functions import Coalesce
+
+# 마이그레이션 당시의 태그 추출 규칙을 그대로 고정 (posts.tags가 바뀌어도 이 마이그레이션은 그대로)
+HASHTAG_RE = re.compile(r'(?<![\w&#])#(\w{1,50})(?!\w)')
+MAX_TAGS_PER_POST = 30
+BATCH_SIZE = 1000
+
+
+def extract_tags(text):
+    names = []
+    for match in HASHTAG_RE.finditer(text or ''):
+        name = match.group(1).lower()
+        if not name.isdigit() and name not in names:
+            names.append(name)
+    return names[:MAX_TAGS_PER_POST]
+
+
+def populate_tags(apps, schema_editor):
+    # 기존 게시물 본문의 해시태그를 색인하고 태그별 게시물 수를 계산
+    Post = apps.get_model('posts', 'Post')
+    Tag = apps.get_model('posts', 'Tag')
+    PostTag = apps.get_model('posts', 'PostTag')
+    last_pk = 0
+    while True:
+        batch = list(Post.objects.filter(pk__gt=last_pk).order_by('pk')
+                     .values_list('pk', 'content', 'created_at')[:BATCH_SIZE])
+        if not batch:
+            break
+        tagged = [(pk, created_at, extract_tags(content)) for pk, content, created_at in batch]
+        names = {name for _, _, post_names in tagged for name in post_names}
+        if names:
+            Tag.objects.bulk_create([Tag(name=name) for name in names], ignore_conflicts=True)
+            ids = dict(Tag.objects.filter(name__in=names).values_list('name', 'pk'))
+            PostTag.objects.bulk_create([
+                PostTag(post_id=pk, tag_id=ids[name], created_at=created_at)
+                for pk, created_at, post_names in tagged for name in post_names
+            ], ignore_conflicts=True)
+        last_pk = batch[-1][0]
+
+    count = (PostTag.objects.filter(tag=models.OuterRef('pk'))
+             .order_by().values('tag').annotate(n=models.Count('pk')).values('n'))
+    Tag.objects.update(post_count=Coalesce(models.Subquery(count), models.Value(0)))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0009_post_renditions'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Tag',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=50, unique=True, verbose_name='이름')),
+                ('post_count', models.PositiveIntegerField(default=0, editable=False, verbose_name='게시물 수')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'verbose_name': '태그',
+                'verbose_name_plural': '태그',
+            },
+        ),
+        migrations.CreateModel(
+            name='PostTag',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField()),
+                ('post', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='post_tags', to='posts.post')),
+                ('tag', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='post_tags', to='posts.tag')),
+            ],
+            options={
+                'verbose_name': '게시물 태그',
+                'verbose_name_plural': '게시물 태그',
+                'indexes': [models.Index(fields=['tag', '-created_at', '-post'], name='posttag_tag_created_idx')],
+                'constraints': [models.UniqueConstraint(fields=('post', 'tag'), name='unique_post_tag')],
+            },
+        ),
+        migrations.RunPython(populate_tags, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,49 @@
+# Generated by Django 6.1.2 on 2026-10-17 00:33
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+def copy_created_at(apps, schema_editor):
+    # 기존 게시물의 마지막 활동 시각은 알 수 없으므로 작성 시각으로 둠
+    Post = apps.get_model('posts', 'Post')
+    Post.objects.update(activity_at=models.F('created_at'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0010_tag_posttag'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PostScore',
+            fields=[
+                ('post', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='trending_score', serialize=False, to='posts.post')),
+                ('score', models.FloatField(verbose_name='점수')),
+                ('computed_at', models.DateTimeField(verbose_name='계산 시각')),
+            ],
+            options={
+                'verbose_name': '인기 점수',
+                'verbose_name_plural': '인기 점수',
+            },
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='activity_at',
+            field=models.DateTimeField(default=django.utils.timezone.now, editable=False, verbose_name='최근 활동'),
+        ),
+        migrations.RunPython(copy_created_at, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(fields=['activity_at'], name='post_activity_at_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='postscore',
+            index=models.Index(fields=['-score', '-post'], name='postscore_rank_idx'),
+        ),
+    ]
@@ -1,13 +1,55 @@
 # posts/models.py
 
-import os
-from io import BytesIO
-
 from django.contrib.auth.models import User
-from django.core.files.base import ContentFile
 from django.db import models
 from django.urls import reverse
-from PIL import Image
+from django.utils import timezone
+
+
+class PostQuerySet(models.QuerySet):
+    def for_feed(self, viewer):
+        """
+        피드 카드 렌더링에 필요한 작성자/프로필을 조인하고 viewer의 좋아요 여부를
+        is_liked로 주석합니다. 좋아요/댓글 수는 비정규화 카운터 컬럼을 그대로 사용하므로
+        페이지의 게시물 수와 관계없이 쿼리 한 번으로 끝납니다.
+        """
+        queryset = self.select_related("user__profile")
+        if viewer is None or not viewer.is_authenticated:
+            return queryset.annotate(is_liked=models.Value(False, output_field=models.BooleanField()))
+        return queryset.annotate(
+            is_liked=models.Exists(Like.objects.filter(post=models.OuterRef("pk"), user=viewer))
+        )
+
+    def with_neighbours(self):
+        """(created_at, id) 순서에서 바로 앞(더 최근)/뒤 게시물 id를 prev_post_id/next_post_id로 주석합니다."""
+        created_at, pk = models.OuterRef("created_at"), models.OuterRef("pk")
+        newer = Post.objects.filter(
+            models.Q(created_at__gt=created_at) | models.Q(created_at=created_at, id__gt=pk)
+        ).order_by("created_at", "id").values("pk")[:1]
+        older = Post.objects.filter(
+            models.Q(created_at__lt=created_at) | models.Q(created_at=created_at, id__lt=pk)
+        ).order_by("-created_at", "-id").values("pk")[:1]
+        return self.annotate(
+            prev_post_id=models.Subquery(newer),
+            next_post_id=models.Subquery(older),
+        )
+
+    def for_detail(self, viewer):
+        """
+        상세 페이지용 쿼리셋. for_feed()에 더해 작성자 팔로우 여부(is_following),
+        이전/다음 게시물 id(prev_post_id, next_post_id)를 서브쿼리로 주석하고
+        댓글을 작성자/프로필과 함께 한 번에 prefetch합니다.
+        """
+        queryset = self.for_feed(viewer).with_neighbours().prefetch_related(
+            models.Prefetch("comments", queryset=Comment.objects.select_related("user__profile"))
+        )
+        if viewer is None or not viewer.is_authenticated:
+            return queryset.annotate(is_following=models.Value(False, output_field=models.BooleanField()))
+        return queryset.annotate(
+            is_following=models.Exists(
+                Follow.objects.filter(follower=viewer, following=models.OuterRef("user"))
+            )
+        )
 
 
 class Post(models.Model):
@@ -19,12 +61,29 @@ class Post(models.Model):
     thumbnail = models.ImageField(
         upload_to="post_thumbnails/", blank=True, verbose_name="썸네일"
     )
+    # 너비별 WebP/JPEG 렌디션: {"width", "height", "webp": [[너비, 파일 이름], ...], "jpeg": [...]}
+    renditions = models.JSONField(default=dict, blank=True, editable=False, verbose_name="렌디션")
     views = models.PositiveIntegerField(default=0, verbose_name="조회수")
+    # 비정규화 카운터: posts.counters가 F() 식으로만 갱신
+    like_count = models.PositiveIntegerField(default=0, editable=False, verbose_name="좋아요 수")
+    comment_count = models.PositiveIntegerField(default=0, editable=False, verbose_name="댓글 수")
+    # 마지막으로 좋아요/댓글/조회수가 바뀐 시각: posts.trending이 점수를 다시 계산할 게시물을 고르는 기준
+    activity_at = models.DateTimeField(default=timezone.now, editable=False, verbose_name="최근 활동")
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = PostQuerySet.as_manager()
+
+    # 일반 save()가 덮어쓰지 않는 필드 (동시에 증가한 값을 잃지 않도록)
+    COUNTER_FIELDS = ("views", "like_count", "comment_count", "activity_at")
+
     class Meta:
         ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["-created_at", "-id"], name="post_created_at_id_idx"),
+            models.Index(fields=["user", "-created_at", "-id"], name="post_user_created_at_id_idx"),
+            models.Index(fields=["activity_at"], name="post_activity_at_idx"),
+        ]
         verbose_name = "게시물"
         verbose_name_plural = "게시물"
 
@@ -36,6 +95,7 @@ class Post(models.Model):
 
     def save(self, *args, **kwargs):
         is_new = self.pk is None
+        old_post = None
         if not is_new:
             try:
                 old_post = Post.objects.get(pk=self.pk)
@@ -45,24 +105,48 @@ class Post(models.Model):
         else:
             image_changed = True
 
+        if image_changed:
+            # 새 썸네일/렌디션이 준비될 때까지는 원본 이미지를 보여줌
+            self.thumbnail = ""
+            self.renditions = {}
+
+        if not self._state.adding and kwargs.get("update_fields") is None:
+            kwargs["update_fields"] = [
+                f.name for f in self._meta.concrete_fields
+                if not f.primary_key and f.name not in self.COUNTER_FIELDS
+            ]
         super().save(*args, **kwargs)
 
+        if image_changed and old_post is not None:
+            # 이전 이미지로 만든 썸네일/렌디션 파일은 커밋 후 삭제
+            from .thumbnails import delete_files, generated_files
+            delete_files(old_post.thumbnail.storage, generated_files(old_post.thumbnail.name, old_post.renditions))
+
         if image_changed and self.image:
-            self._generate_thumbnail()
-
-    def _generate_thumbnail(self):
-        try:
-            img = Image.open(self.image.path)
-            img.thumbnail((300, 300))
-            thumb_io = BytesIO()
-            img_format = img.format or "JPEG"
-            img.save(thumb_io, format=img_format)
-            thumb_io.seek(0)
-            thumb_name = f"thumb_{os.path.basename(self.image.name)}"
-            self.thumbnail.save(thumb_name, ContentFile(thumb_io.read()), save=False)
-            Post.objects.filter(pk=self.pk).update(thumbnail=self.thumbnail.name)
-        except (FileNotFoundError, ValueError):
-            pass
+            # 썸네일은 요청 처리 중이 아니라 커밋 후 워커에서 생성
+            from .thumbnails import enqueue_thumbnail
+            enqueue_thumbnail(self)
+
+    def _srcset(self, key):
+        storage = self.image.storage
+        return ", ".join(f"{storage.url(name)} {width}w" for width, name in self.renditions.get(key, []))
+
+    @property
+    def webp_srcset(self):
+        return self._srcset("webp")
+
+    @property
+    def jpeg_srcset(self):
+        return self._srcset("jpeg")
+
+    @property
+    def rendition_url(self):
+        """srcset을 지원하지 않는 브라우저용 src (카드 너비에 가장 가까운 JPEG 렌디션)"""
+        jpegs = self.renditions.get("jpeg")
+        if not jpegs:
+            return self.image.url
+        width, name = min(jpegs, key=lambda rendition: abs(rendition[0] - 600))
+        return self.image.storage.url(name)
 
 
 class Comment(models.Model):
@@ -110,3 +194,118 @@ class Follow(models.Model):
 
     def __str__(self):
         return f'{self.follower.username} → {self.following.username}'
+
+
+class TimelineEntry(models.Model):
+    """팔로잉 피드용 사용자별 타임라인 (게시물 작성 시 팔로워에게 팬아웃)"""
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='timeline_entries')
+    post = models.ForeignKey(Post, on_delete=models.CASCADE, related_name='timeline_entries')
+    author = models.ForeignKey(User, on_delete=models.CASCADE, related_name='+')
+    # 게시물의 created_at 사본 (타임라인 정렬/커서 기준)
+    created_at = models.DateTimeField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'post'], name='unique_timeline_entry')
+        ]
+        indexes = [
+            models.Index(fields=['user', '-created_at', '-post'], name='timeline_user_created_idx'),
+            models.Index(fields=['user', 'author'], name='timeline_user_author_idx'),
+        ]
+        verbose_name = '타임라인'
+        verbose_name_plural = '타임라인'
+
+    def __str__(self):
+        return f'{self.user.username} ← {self.post_id}'
+
+
+class Tag(models.Model):
+    """게시물 본문의 해시태그 (이름은 소문자로 정규화)"""
+
+    name = models.CharField(max_length=50, unique=True, verbose_name='이름')
+    # 비정규화 카운터: posts.counters가 F() 식으로만 갱신
+    post_count = models.PositiveIntegerField(default=0, editable=False, verbose_name='게시물 수')
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = '태그'
+        verbose_name_plural = '태그'
+
+    def __str__(self):
+        return f'#{self.name}'
+
+    def get_absolute_url(self):
+        return reverse('posts:tag_feed', kwargs={'name': self.name})
+
+
+class PostTag(models.Model):
+    """태그별 게시물 색인 (게시물 저장 시 본문에서 추출)"""
+
+    post = models.ForeignKey(Post, on_delete=models.CASCADE, related_name='post_tags')
+    tag = models.ForeignKey(Tag, on_delete=models.CASCADE, related_name='post_tags')
+    # 게시물의 created_at 사본 (태그 피드 정렬/커서 기준)
+    created_at = models.DateTimeField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['post', 'tag'], name='unique_post_tag')
+        ]
+        indexes = [
+            models.Index(fields=['tag', '-created_at', '-post'], name='posttag_tag_created_idx'),
+        ]
+        verbose_name = '게시물 태그'
+        verbose_name_plural = '게시물 태그'
+
+    def __str__(self):
+        return f'{self.post_id} #{self.tag_id}'
+
+
+class PostScore(models.Model):
+    """인기 피드용 게시물 점수 (posts.trending이 최근 활동이 있는 게시물만 주기적으로 다시 계산)"""
+
+    post = models.OneToOneField(Post, on_delete=models.CASCADE, primary_key=True, related_name='trending_score')
+    score = models.FloatField(verbose_name='점수')
+    computed_at = models.DateTimeField(verbose_name='계산 시각')
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['-score', '-post'], name='postscore_rank_idx'),
+        ]
+        verbose_name = '인기 점수'
+        verbose_name_plural = '인기 점수'
+
+    def __str__(self):
+        return f'{self.post_id}: {self.score:.4f}'
+
+
+class ThumbnailJob(models.Model):
+    """썸네일 생성 작업 큐 (게시물 저장 시 등록되고 posts.thumbnails 워커가 처리)"""
+
+    PENDING = 'pending'
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+    STATUS_CHOICES = [
+        (PENDING, '대기'),
+        (RUNNING, '처리 중'),
+        (DONE, '완료'),
+        (FAILED, '실패'),
+    ]
+
+    post = models.OneToOneField(Post, on_delete=models.CASCADE, related_name='thumbnail_job')
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=PENDING)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    error = models.TextField(blank=True)
+    queued_at = models.DateTimeField(default=timezone.now)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'queued_at'], name='thumbnailjob_status_idx'),
+        ]
+        verbose_name = '썸네일 작업'
+        verbose_name_plural = '썸네일 작업'
+
+    def __str__(self):
+        return f'{self.post_id}: {self.status}'
@@ -0,0 +1,127 @@
+# posts/pagination.py
+
+import base64
+import json
+import math
+from datetime import datetime
+
+from django.db import models
+from django.db.models import Q
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def _encode_value(value):
+    if isinstance(value, datetime):
+        return {'dt': value.isoformat()}
+    return value
+
+
+def _decode_value(value):
+    if isinstance(value, dict) and 'dt' in value:
+        return datetime.fromisoformat(value['dt'])
+    return value
+
+
+def encode_cursor(values):
+    """정렬 키 값 목록을 URL에 안전한 불투명 문자열로 인코딩합니다."""
+    raw = json.dumps([_encode_value(v) for v in values], separators=(',', ':'))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return [_decode_value(v) for v in values]
+    except (ValueError, TypeError) as e:
+        raise InvalidCursor(cursor) from e
+
+
+class CursorPage:
+    def __init__(self, object_list, next_cursor):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __bool__(self):
+        return bool(self.object_list)
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+
+class CursorPaginator:
+    """
+    (created_at, id) 같은 고유한 정렬 키를 기준으로 하는 키셋(커서) 페이지네이션.
+
+    OFFSET 대신 마지막으로 본 행의 키 값보다 작은(또는 큰) 행만 조회하므로
+    몇 번째 페이지든 인덱스 범위 조회 한 번으로 끝나고, 스크롤 도중 새 글이
+    추가되어도 결과가 밀리거나 중복되지 않습니다. COUNT(*)는 실행하지 않으며,
+    per_page + 1개를 가져와 다음 페이지 여부를 판단합니다.
+    """
+
+    def __init__(self, queryset, per_page, ordering=('-created_at', '-id')):
+        self.queryset = queryset
+        self.per_page = per_page
+        self.ordering = tuple(ordering)
+        self.fields = [f.lstrip('-') for f in self.ordering]
+
+    def _valid_value(self, field, value):
+        # 커서는 사용자 입력이므로 필드 종류에 맞는 값인지 ORM에 넘기기 전에 확인
+        model_field = self.queryset.model._meta.get_field(field)
+        if isinstance(model_field, models.DateTimeField):
+            return isinstance(value, datetime)
+        if isinstance(value, bool):
+            return False
+        if isinstance(model_field, models.FloatField):
+            return isinstance(value, (int, float)) and math.isfinite(value)
+        return isinstance(value, int)
+
+    def _after(self, values):
+        if (not isinstance(values, list) or len(values) != len(self.fields)
+                or not all(self._valid_value(f, v) for f, v in zip(self.fields, values))):
+            raise InvalidCursor(values)
+        condition = Q()
+        for i, field in enumerate(self.fields):
+            lookup = 'lt' if self.ordering[i].startswith('-') else 'gt'
+            term = Q(**{f'{field}__{lookup}': values[i]})
+            for prev_field, prev_value in zip(self.fields[:i], values[:i]):
+                term &= Q(**{prev_field: prev_value})
+            condition |= term
+        # (a < x) OR (a = x AND b < y)와 같은 뜻인 a <= x를 따로 붙여야 SQLite가 OR 조건을 인덱스
+        # 범위 검색으로 처리함 (없으면 인덱스를 처음부터 훑어 깊은 페이지일수록 느려짐)
+        first_lookup = 'lte' if self.ordering[0].startswith('-') else 'gte'
+        return Q(**{f'{self.fields[0]}__{first_lookup}': values[0]}) & condition
+
+    def _cursor_for(self, obj):
+        values = []
+        for field in self.fields:
+            value = obj
+            for part in field.split('__'):
+                value = getattr(value, part)
+            values.append(value)
+        return encode_cursor(values)
+
+    def after(self, cursor=None):
+        """cursor 다음 행들을 정렬된 쿼리셋으로 반환합니다."""
+        queryset = self.queryset.order_by(*self.ordering)
+        if cursor:
+            queryset = queryset.filter(self._after(decode_cursor(cursor)))
+        return queryset
+
+    def page(self, cursor=None):
+        """cursor 다음의 한 페이지를 반환합니다. 잘못된 커서는 InvalidCursor를 발생시킵니다."""
+        rows = list(self.after(cursor)[:self.per_page + 1])
+        next_cursor = None
+        if len(rows) > self.per_page:
+            rows = rows[:self.per_page]
+            next_cursor = self._cursor_for(rows[-1])
+        return CursorPage(rows, next_cursor)
@@ -0,0 +1,113 @@
+# posts/signals.py
+
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from config.http_cache import invalidate_anonymous_pages
+
+from . import counters, tags, thumbnails, timeline
+from .models import Comment, Follow, Like, Post
+
+
+@receiver(post_save, sender=Post)
+def fan_out_new_post(sender, instance, created, **kwargs):
+    if created:
+        timeline.fan_out_post(instance)
+
+
+@receiver(post_save, sender=Post)
+def sync_post_tags(sender, instance, created, **kwargs):
+    tags.sync_post_tags(instance, created)
+
+
+@receiver(pre_delete, sender=Post)
+def untag_deleted_post(sender, instance, **kwargs):
+    # PostTag가 CASCADE로 지워지기 전에 태그별 게시물 수를 줄임
+    tags.untag_post(instance)
+
+
+@receiver(post_delete, sender=Post)
+def delete_generated_images(sender, instance, **kwargs):
+    # 게시물과 함께 썸네일/렌디션 파일도 커밋 후 삭제
+    thumbnails.delete_files(instance.thumbnail.storage,
+                            thumbnails.generated_files(instance.thumbnail.name, instance.renditions))
+
+
+@receiver(post_save, sender=Follow)
+def backfill_new_follow(sender, instance, created, **kwargs):
+    if created:
+        timeline.backfill_follow(instance.follower_id, instance.following_id)
+
+
+@receiver(post_delete, sender=Follow)
+def prune_removed_follow(sender, instance, **kwargs):
+    timeline.prune_follow(instance.follower_id, instance.following_id)
+
+
+# 비정규화 카운터: 원본 쓰기와 같은 트랜잭션 안에서 F() 식으로 갱신
+
+def _deleting_parent(origin, model, pk):
+    # 게시물 자체가 삭제되면서 함께 지워지는 좋아요/댓글은 카운터를 갱신할 필요가 없음
+    return isinstance(origin, model) and origin.pk == pk
+
+
+@receiver(post_save, sender=Like)
+def count_new_like(sender, instance, created, **kwargs):
+    if created:
+        counters.bump_post(instance.post_id, 'like_count', 1)
+
+
+@receiver(post_delete, sender=Like)
+def count_removed_like(sender, instance, origin=None, **kwargs):
+    if not _deleting_parent(origin, Post, instance.post_id):
+        counters.bump_post(instance.post_id, 'like_count', -1)
+
+
+@receiver(post_save, sender=Comment)
+def count_new_comment(sender, instance, created, **kwargs):
+    if created:
+        counters.bump_post(instance.post_id, 'comment_count', 1)
+
+
+@receiver(post_delete, sender=Comment)
+def count_removed_comment(sender, instance, origin=None, **kwargs):
+    if not _deleting_parent(origin, Post, instance.post_id):
+        counters.bump_post(instance.post_id, 'comment_count', -1)
+
+
+@receiver(post_save, sender=Post)
+def count_new_post(sender, instance, created, **kwargs):
+    if created:
+        counters.bump_profile(instance.user_id, 'posts_count', 1)
+
+
+@receiver(post_delete, sender=Post)
+def count_removed_post(sender, instance, **kwargs):
+    counters.bump_profile(instance.user_id, 'posts_count', -1)
+
+
+@receiver(post_save, sender=Follow)
+def count_new_follow(sender, instance, created, **kwargs):
+    if created:
+        counters.bump_profile(instance.follower_id, 'following_count', 1)
+        counters.bump_profile(instance.following_id, 'followers_count', 1)
+
+
+@receiver(post_delete, sender=Follow)
+def count_removed_follow(sender, instance, **kwargs):
+    counters.bump_profile(instance.follower_id, 'following_count', -1)
+    counters.bump_profile(instance.following_id, 'followers_count', -1)
+
+
+@receiver(post_delete, sender=Follow)
+def backfill_former_celebrity(sender, instance, **kwargs):
+    # 팔로워 수를 줄인 다음에 확인해야 하므로 count_removed_follow 뒤에 등록
+    timeline.backfill_former_celebrity(instance.following_id)
+
+
+# 좋아요는 가장 잦은 쓰기라 페이지 캐시를 비우지 않음. 좋아요 수는 카드 조각 캐시 버전과 ETag에
+# 들어 있어 다음 렌더링에 반영되고, 비로그인 페이지에는 ANONYMOUS_PAGE_CACHE_TIMEOUT만큼 늦게 보임
+@receiver([post_save, post_delete], sender=Post)
+@receiver([post_save, post_delete], sender=Comment)
+def invalidate_post_pages(sender, **kwargs):
+    invalidate_anonymous_pages('posts')
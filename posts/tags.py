@@ -0,0 +1,109 @@
+# posts/tags.py
+
+import re
+
+from django.db import transaction
+
+from . import counters
+from .models import Post, PostTag, Tag
+from .pagination import CursorPage, CursorPaginator, encode_cursor
+
+MAX_TAGS_PER_POST = 30
+
+# '#' 뒤의 문자/숫자/밑줄 50자 이하. 낱말 중간(a#b)이나 '&#39;' 같은 문자 참조는 태그가 아님
+HASHTAG_RE = re.compile(r'(?<![\w&#])#(\w{1,50})(?!\w)')
+
+
+def extract_tags(text):
+    """본문의 해시태그 이름을 소문자로, 처음 나온 순서대로 중복 없이 반환합니다. 숫자만 있는 태그는 제외."""
+    names = []
+    for match in HASHTAG_RE.finditer(text or ''):
+        name = match.group(1).lower()
+        if not name.isdigit() and name not in names:
+            names.append(name)
+    return names[:MAX_TAGS_PER_POST]
+
+
+def _tag_ids(names):
+    # 없는 태그만 만들고(이름 unique) 이름별 id를 한 번에 조회
+    if not names:
+        return {}
+    Tag.objects.bulk_create([Tag(name=name) for name in names], ignore_conflicts=True)
+    return dict(Tag.objects.filter(name__in=names).values_list('name', 'pk'))
+
+
+def sync_post_tags(post, created=False):
+    """
+    post.content의 해시태그와 PostTag 행을 맞추고, 실제로 더하거나 뺀 태그의 post_count를 갱신합니다.
+
+    수정 시에는 바뀐 태그만 추가/삭제하므로 태그가 그대로이면 잠금과 조회 한 번으로 끝납니다.
+    """
+    names = set(extract_tags(post.content))
+    with transaction.atomic():
+        if not created:
+            # 같은 게시물의 동시 수정을 게시물 행 잠금으로 차례로 처리해, 먼저 끝난 쪽이 넣거나
+            # 지운 태그를 현재 태그로 읽은 뒤 계산함 (같은 태그를 두 번 세지 않음)
+            list(Post.objects.select_for_update().filter(pk=post.pk).values_list('pk', flat=True))
+        current = {} if created else dict(
+            PostTag.objects.filter(post=post).values_list('tag__name', 'tag_id'))
+        removed = [tag_id for name, tag_id in current.items() if name not in names]
+        added = names - current.keys()
+        if removed:
+            PostTag.objects.filter(post=post, tag_id__in=removed).delete()
+            counters.bump_tags(removed, -1)
+        if added:
+            ids = _tag_ids(added)
+            PostTag.objects.bulk_create([
+                PostTag(post=post, tag_id=tag_id, created_at=post.created_at) for tag_id in ids.values()
+            ], ignore_conflicts=True)
+            counters.bump_tags(list(ids.values()), 1)
+
+
+def untag_post(post):
+    """삭제되는 게시물이 달고 있던 태그의 post_count를 줄입니다 (PostTag는 CASCADE로 함께 삭제)."""
+    counters.bump_tags(PostTag.objects.filter(post=post).values('tag_id'), -1)
+
+
+def read_tag_feed(tag, viewer, cursor=None, per_page=5):
+    """
+    tag가 달린 게시물 한 페이지를 (created_at, id) 역순으로 반환합니다.
+
+    (tag, created_at, post) 인덱스 범위 조회 한 번으로 키를 정하고 게시물은 for_feed()로
+    한 번에 가져오므로, 게시물/태그 테이블 크기나 페이지 깊이와 무관하게 쿼리 두 번으로 끝납니다.
+    """
+    keys = list(CursorPaginator(
+        PostTag.objects.filter(tag=tag), per_page, ordering=('-created_at', '-post_id'),
+    ).after(cursor).values_list('created_at', 'post_id')[:per_page + 1])
+    next_cursor = None
+    if len(keys) > per_page:
+        keys = keys[:per_page]
+        next_cursor = encode_cursor(list(keys[-1]))
+    posts = Post.objects.for_feed(viewer).in_bulk([pk for _, pk in keys])
+    return CursorPage([posts[pk] for _, pk in keys if pk in posts], next_cursor)
+
+
+def backfill(batch_size=1000):
+    """
+    모든 게시물 본문에서 태그를 다시 추출해 PostTag를 채우고 post_count를 다시 계산합니다.
+
+    bulk_create로 넣은 게시물(시드 데이터)이나 기존 게시물에 사용하며 처리한 게시물 수를 반환합니다.
+    """
+    last_pk = 0
+    total = 0
+    while True:
+        batch = list(Post.objects.filter(pk__gt=last_pk).order_by('pk')
+                     .values_list('pk', 'content', 'created_at')[:batch_size])
+        if not batch:
+            break
+        with transaction.atomic():
+            tagged = [(pk, created_at, extract_tags(content)) for pk, content, created_at in batch]
+            ids = _tag_ids({name for _, _, names in tagged for name in names})
+            PostTag.objects.bulk_create([
+                PostTag(post_id=pk, tag_id=ids[name], created_at=created_at)
+                for pk, created_at, names in tagged for name in names
+            ], ignore_conflicts=True)
+        total += len(batch)
+        last_pk = batch[-1][0]
+
+    counters.reconcile_tags(batch_size)
+    return total
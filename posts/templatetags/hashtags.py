@@ -0,0 +1,30 @@
+from django import template
+from django.urls import reverse
+from django.utils.html import conditional_escape, format_html
+from django.utils.safestring import mark_safe
+
+from posts.tags import HASHTAG_RE
+
+register = template.Library()
+
+
+@register.filter(needs_autoescape=True)
+def hashtags(text, autoescape=True):
+    """
+    본문의 해시태그를 태그 피드 링크로 바꿉니다. 예: {{ post.content|hashtags }}
+
+    태그가 아닌 부분은 자동 이스케이프 규칙대로 이스케이프합니다.
+    """
+    escape = conditional_escape if autoescape else str
+    text = str(text)
+    parts = []
+    position = 0
+    for match in HASHTAG_RE.finditer(text):
+        name = match.group(1)
+        if name.isdigit():
+            continue
+        url = reverse('posts:tag_feed', kwargs={'name': name.lower()})
+        parts += [escape(text[position:match.start()]), format_html('<a href="{}">#{}</a>', url, name)]
+        position = match.end()
+    parts.append(escape(text[position:]))
+    return mark_safe(''.join(parts))
@@ -0,0 +1,29 @@
+from django import template
+from django.conf import settings
+from django.urls import reverse
+
+from config.image_resize import source_versions
+
+register = template.Library()
+
+
+@register.filter
+def resized(image, size):
+    """
+    이미지 필드를 리사이즈 URL로 바꿉니다. 예: {{ profile.profile_image|resized:"80x80" }}
+
+    URL에는 원본 버전(?v=)이 붙어 있어 오래 캐시해도 원본이 바뀌면 새 URL로 요청합니다.
+    버전은 IMAGE_RESIZE_VERSION_TTL초 동안 메모해 두므로 호출마다 파일을 확인하지 않습니다.
+    허용되지 않은 크기이거나 이미지가 없으면 원본 URL(또는 빈 문자열)을 반환합니다.
+    """
+    if not image:
+        return ''
+    try:
+        width, height = (int(v) for v in size.split('x'))
+    except ValueError:
+        return image.url
+    if (width, height) not in settings.IMAGE_RESIZE_SIZES:
+        return image.url
+    url = reverse('resized_image', kwargs={'width': width, 'height': height, 'path': image.name})
+    version = source_versions.get(image.name)
+    return f'{url}?v={version}' if version else url
@@ -1,15 +1,49 @@
 
+import itertools
+import json
+import logging
+import os
+import pstats
+import random
+import re
 import tempfile
+import threading
+import time
 import shutil
-from io import BytesIO
+from datetime import timedelta
+from io import BytesIO, StringIO
+from unittest.mock import patch
 from PIL import Image
 
-from django.test import TestCase, override_settings
+from django.db import DatabaseError, connection
+from django.db.models import F
+from django.test import RequestFactory, TestCase, override_settings
+from django.template import engines
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
+from django.utils import timezone
 from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import call_command
 from django.core.files.uploadedfile import SimpleUploadedFile
 
-from .models import Post, Comment, Like, Follow
+from config import image_resize, middleware
+from config.http_cache import check_shared_cache
+from config.profiling import make_token
+from config.image_resize import resize_cache, source_versions
+from links.models import Link
+from users.models import Profile
+from . import thumbnails
+from .fragments import card_version
+from .forms import CommentForm
+from .images import generate_random_image
+from .models import Post, Comment, Like, Follow, PostScore, PostTag, Tag, ThumbnailJob, TimelineEntry
+from .pagination import CursorPaginator, encode_cursor
+from .tags import extract_tags
+from .trending import hot_score, update_scores
+from .templatetags.hashtags import hashtags
+from .templatetags.image_tags import resized
+from .view_counter import view_counts
 
 TEMP_MEDIA = tempfile.mkdtemp()
 
@@ -23,6 +57,11 @@ def create_test_image(name='test.jpg', size=(100, 100), color='red'):
     return SimpleUploadedFile(name, buffer.read(), content_type='image/jpeg')
 
 
+def post_ids_in(html):
+    """카드 HTML에 나타나는 게시물 id를 순서대로 반환하는 헬퍼 함수"""
+    return list(dict.fromkeys(int(pk) for pk in re.findall(r'/post/(\d+)/', html)))
+
+
 @override_settings(MEDIA_ROOT=TEMP_MEDIA)
 class PostModelTest(TestCase):
     def setUp(self):
@@ -57,6 +96,7 @@ class PostModelTest(TestCase):
 @override_settings(MEDIA_ROOT=TEMP_MEDIA)
 class HomeViewTest(TestCase):
     def setUp(self):
+        cache.clear()
         self.user = User.objects.create_user(username='testuser', password='testpass123')
 
     def test_welcome_page_for_anonymous(self):
@@ -98,17 +138,95 @@ class PostDetailViewTest(TestCase):
         response = self.client.get(reverse('posts:post_detail', kwargs={'pk': self.post.pk}))
         self.assertEqual(response.status_code, 200)
 
+    def tearDown(self):
+        view_counts.clear()
+
     def test_detail_page_increases_views(self):
         """상세 페이지 조회 시 조회수 증가 테스트"""
         self.client.get(reverse('posts:post_detail', kwargs={'pk': self.post.pk}))
+        view_counts.flush()
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.views, 1)
+
+    @override_settings(VIEW_COUNT_FLUSH_INTERVAL=3600)
+    def test_detail_page_buffers_views(self):
+        """조회수가 요청마다 기록되지 않고 flush 시 한 번에 반영되는지 테스트"""
+        self.client.login(username='testuser', password='testpass123')
+        url = reverse('posts:post_detail', kwargs={'pk': self.post.pk})
+        for _ in range(3):
+            response = self.client.get(url)
+        self.assertEqual(response.context['post'].views, 3)
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.views, 0)
+        view_counts.flush()
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.views, 3)
+
+    @override_settings(VIEW_COUNT_FLUSH_INTERVAL=0)
+    def test_detail_page_flush_interval_zero(self):
+        """flush 주기가 0이면 조회 즉시 반영되는지 테스트"""
+        self.client.get(reverse('posts:post_detail', kwargs={'pk': self.post.pk}))
         self.post.refresh_from_db()
         self.assertEqual(self.post.views, 1)
 
+    def test_view_flush_failure_keeps_counts(self):
+        """flush 실패 시 증가분이 버퍼에 남는지 테스트"""
+        view_counts.record(self.post.pk)
+        with patch('posts.view_counter.Post.objects.filter', side_effect=DatabaseError):
+            with self.assertRaises(DatabaseError):
+                view_counts.flush()
+        self.assertEqual(view_counts.pending(self.post.pk), 1)
+        view_counts.flush()
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.views, 1)
+
+    @override_settings(VIEW_COUNT_FLUSH_INTERVAL=0)
+    def test_view_flush_failure_does_not_fail_request(self):
+        """요청 중(record) flush가 실패해도 예외 없이 로그만 남기고 증가분은 남는지 테스트"""
+        with patch('posts.view_counter.Post.objects.filter', side_effect=DatabaseError):
+            with self.assertLogs('posts.view_counter', 'ERROR'):
+                view_counts.record(self.post.pk)
+        self.assertEqual(view_counts.pending(self.post.pk), 1)
+
+    def test_missing_post_not_counted(self):
+        """없는 게시물의 조회는 버퍼에 기록하지 않는지 테스트"""
+        response = self.client.get(reverse('posts:post_detail', kwargs={'pk': self.post.pk + 100}))
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(view_counts.pending(self.post.pk + 100), 0)
+
     def test_detail_page_displays_content(self):
         """상세 페이지에 내용이 표시되는지 테스트"""
         response = self.client.get(reverse('posts:post_detail', kwargs={'pk': self.post.pk}))
         self.assertContains(response, '상세 테스트 게시물')
 
+    def test_detail_page_prev_next(self):
+        """이전/다음 게시물 링크 테스트"""
+        newer = Post.objects.create(user=self.user, content='더 최근 게시물')
+        response = self.client.get(reverse('posts:post_detail', kwargs={'pk': self.post.pk}))
+        self.assertEqual(response.context['prev_post_id'], newer.pk)
+        self.assertIsNone(response.context['next_post_id'])
+        response = self.client.get(reverse('posts:post_detail', kwargs={'pk': newer.pk}))
+        self.assertIsNone(response.context['prev_post_id'])
+        self.assertEqual(response.context['next_post_id'], self.post.pk)
+
+    def test_detail_page_query_budget(self):
+        """댓글 수와 관계없이 상세 페이지 쿼리 수가 고정인지 테스트"""
+        other = User.objects.create_user(username='otheruser', password='testpass123')
+        Follow.objects.create(follower=other, following=self.user)
+        Like.objects.create(user=other, post=self.post)
+        self.client.login(username='otheruser', password='testpass123')
+        url = reverse('posts:post_detail', kwargs={'pk': self.post.pk})
+        with self.assertNumQueries(4):
+            self.client.get(url)
+        for i in range(5):
+            commenter = User.objects.create_user(username=f'commenter{i}', password='testpass123')
+            Comment.objects.create(post=self.post, user=commenter, content=f'댓글 {i}')
+        with self.assertNumQueries(4):
+            response = self.client.get(url)
+        self.assertTrue(response.context['is_liked'])
+        self.assertTrue(response.context['is_following'])
+        self.assertContains(response, '댓글 4')
+
     @classmethod
     def tearDownClass(cls):
         shutil.rmtree(TEMP_MEDIA, ignore_errors=True)
@@ -239,6 +357,9 @@ class CommentTest(TestCase):
         self.post = Post.objects.create(user=self.user, content='댓글 테스트 게시물')
         self.client.login(username='testuser', password='testpass123')
 
+    def tearDown(self):
+        view_counts.clear()
+
     def test_create_comment(self):
         """댓글 작성 테스트"""
         response = self.client.post(
@@ -376,6 +497,74 @@ class FollowingFeedTest(TestCase):
         response = self.client.get(reverse('posts:following_feed'))
         self.assertEqual(response.status_code, 302)
 
+    def test_following_feed_fan_out_on_post(self):
+        """게시물 작성 시 작성자와 팔로워의 타임라인에 추가되는지 테스트"""
+        post = Post.objects.create(user=self.followed_user, content='팬아웃 게시물')
+        self.assertEqual(
+            set(TimelineEntry.objects.filter(post=post).values_list('user_id', flat=True)),
+            {self.user.pk, self.followed_user.pk},
+        )
+
+    def test_following_feed_shows_own_posts(self):
+        """팔로잉 피드에 본인의 게시물이 표시되는지 테스트"""
+        Post.objects.create(user=self.user, content='내가 쓴 게시물')
+        response = self.client.get(reverse('posts:following_feed'))
+        self.assertContains(response, '내가 쓴 게시물')
+
+    def test_unfollow_prunes_timeline(self):
+        """언팔로우 시 타임라인에서 해당 작성자의 게시물이 제거되는지 테스트"""
+        Post.objects.create(user=self.followed_user, content='언팔로우 후 사라질 게시물')
+        Follow.objects.get(follower=self.user, following=self.followed_user).delete()
+        response = self.client.get(reverse('posts:following_feed'))
+        self.assertNotContains(response, '언팔로우 후 사라질 게시물')
+
+    def test_follow_backfills_timeline(self):
+        """새로 팔로우하면 기존 게시물이 타임라인에 채워지는지 테스트"""
+        Post.objects.create(user=self.unfollowed_user, content='팔로우 전에 쓴 게시물')
+        Follow.objects.create(follower=self.user, following=self.unfollowed_user)
+        response = self.client.get(reverse('posts:following_feed'))
+        self.assertContains(response, '팔로우 전에 쓴 게시물')
+
+    @override_settings(TIMELINE_FANOUT_MAX_FOLLOWERS=0)
+    def test_following_feed_merges_celebrity_posts(self):
+        """팬아웃을 건너뛴 대형 작성자의 게시물이 읽기 시점에 병합되는지 테스트"""
+        post = Post.objects.create(user=self.followed_user, content='대형 작성자의 게시물')
+        self.assertFalse(TimelineEntry.objects.filter(user=self.user, post=post).exists())
+        response = self.client.get(reverse('posts:following_feed'))
+        self.assertContains(response, '대형 작성자의 게시물')
+
+    @override_settings(TIMELINE_FANOUT_MAX_FOLLOWERS=1)
+    def test_former_celebrity_posts_backfilled(self):
+        """대형 작성자 기준 아래로 내려오면 그동안 팬아웃되지 않은 게시물이 피드에 남는지 테스트"""
+        Follow.objects.create(follower=self.unfollowed_user, following=self.followed_user)
+        post = Post.objects.create(user=self.followed_user, content='대형 작성자일 때 쓴 게시물')
+        self.assertFalse(TimelineEntry.objects.filter(user=self.user, post=post).exists())
+        Follow.objects.get(follower=self.unfollowed_user, following=self.followed_user).delete()
+        self.assertTrue(TimelineEntry.objects.filter(user=self.user, post=post).exists())
+        response = self.client.get(reverse('posts:following_feed'))
+        self.assertContains(response, '대형 작성자일 때 쓴 게시물')
+
+    def test_following_feed_cursor_pages(self):
+        """팔로잉 피드 무한 스크롤 커서 응답 테스트"""
+        for i in range(7):
+            Post.objects.create(user=self.followed_user, content=f'팔로잉 게시물 {i}')
+        response = self.client.get(reverse('posts:following_feed'))
+        cursor = response.context['posts'].next_cursor
+        self.assertIsNotNone(cursor)
+        data = self.client.get(reverse('posts:following_feed'), {'cursor': cursor}).json()
+        self.assertIn('팔로잉 게시물 1', data['html'])
+        self.assertIn('팔로잉 게시물 0', data['html'])
+        self.assertNotIn('팔로잉 게시물 2', data['html'])
+        self.assertFalse(data['has_next'])
+
+    def test_backfill_timeline_command(self):
+        """backfill_timeline 명령으로 타임라인을 다시 채우는 테스트"""
+        Post.objects.create(user=self.followed_user, content='백필 게시물')
+        TimelineEntry.objects.all().delete()
+        call_command('backfill_timeline', stdout=StringIO())
+        response = self.client.get(reverse('posts:following_feed'))
+        self.assertContains(response, '백필 게시물')
+
     @classmethod
     def tearDownClass(cls):
         shutil.rmtree(TEMP_MEDIA, ignore_errors=True)
@@ -412,7 +601,927 @@ class LoadMorePostsTest(TestCase):
         self.assertEqual(data['html'], '')
         self.assertFalse(data['has_next'])
 
+    def test_load_more_cursor_pages(self):
+        """커서 방식으로 모든 게시물을 중복 없이 순회하는지 테스트"""
+        seen = []
+        data = self.client.get(reverse('posts:load_more_posts')).json()
+        seen += post_ids_in(data['html'])
+        self.assertTrue(data['has_next'])
+        data = self.client.get(reverse('posts:load_more_posts'), {'cursor': data['next_cursor']}).json()
+        seen += post_ids_in(data['html'])
+        self.assertFalse(data['has_next'])
+        self.assertIsNone(data['next_cursor'])
+        expected = list(Post.objects.order_by('-created_at', '-id').values_list('pk', flat=True))
+        self.assertEqual(seen, expected)
+
+    def test_load_more_cursor_stable_with_new_posts(self):
+        """스크롤 도중 새 게시물이 추가되어도 다음 페이지가 밀리지 않는지 테스트"""
+        first = self.client.get(reverse('posts:load_more_posts')).json()
+        Post.objects.create(user=self.user, content='새로 추가된 게시물')
+        data = self.client.get(reverse('posts:load_more_posts'), {'cursor': first['next_cursor']}).json()
+        expected = Post.objects.filter(content__in=[f'게시물 {i}' for i in range(5)])
+        self.assertEqual(post_ids_in(data['html']), sorted(p.pk for p in expected)[::-1])
+
+    def test_load_more_cursor_skips_count(self):
+        """커서 방식은 COUNT 쿼리를 실행하지 않는지 테스트"""
+        first = self.client.get(reverse('posts:load_more_posts')).json()
+        with CaptureQueriesContext(connection) as ctx:
+            self.client.get(reverse('posts:load_more_posts'), {'cursor': first['next_cursor']})
+        self.assertFalse(any('COUNT(' in q['sql'].upper() for q in ctx.captured_queries))
+
+    def test_load_more_invalid_cursor(self):
+        """잘못된 커서 요청 시 빈 응답 반환 테스트"""
+        response = self.client.get(reverse('posts:load_more_posts'), {'cursor': '!!invalid'})
+        data = response.json()
+        self.assertEqual(data['html'], '')
+        self.assertFalse(data['has_next'])
+
+    def test_load_more_mistyped_cursor(self):
+        """형식은 맞지만 값의 종류가 틀린 커서도 잘못된 커서로 처리하는지 테스트"""
+        for values in (['nope', 'x'], [{'dt': 1}, 1], [{'dt': timezone.now().isoformat()}, True], [1], {'a': 1}):
+            response = self.client.get(reverse('posts:load_more_posts'), {'cursor': encode_cursor(values)})
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.json()['html'], '')
+        response = self.client.get(reverse('posts:popular_feed'), {'cursor': encode_cursor(['nope', 'x'])})
+        self.assertFalse(response.json()['has_next'])
+
+    def test_cursor_uses_index_range(self):
+        """깊은 페이지도 (created_at, id) 인덱스를 처음부터 훑지 않고 범위 검색하는지 테스트"""
+        if connection.vendor != 'sqlite':
+            self.skipTest('SQLite 실행 계획 형식')
+        posts = list(Post.objects.order_by('-created_at', '-id'))
+        paginator = CursorPaginator(Post.objects.all(), 5)
+        cursor = encode_cursor([posts[4].created_at, posts[4].pk])
+        self.assertIn('SEARCH posts_post USING INDEX post_created_at_id_idx (created_at<?)',
+                      paginator.after(cursor)[:6].explain())
+        self.assertEqual(list(paginator.after(cursor)), posts[5:])
+
     @classmethod
     def tearDownClass(cls):
         shutil.rmtree(TEMP_MEDIA, ignore_errors=True)
-        super().tearDownClass()
\ No newline at end of file
+        super().tearDownClass()
+
+@override_settings(MEDIA_ROOT=TEMP_MEDIA)
+class CounterTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='testpass123')
+        self.other_user = User.objects.create_user(username='otheruser', password='testpass123')
+        self.post = Post.objects.create(user=self.user, content='카운터 테스트 게시물')
+
+    def test_like_and_comment_counters(self):
+        """좋아요/댓글 작성 및 삭제 시 게시물 카운터 갱신 테스트"""
+        like = Like.objects.create(user=self.other_user, post=self.post)
+        comment = Comment.objects.create(post=self.post, user=self.other_user, content='댓글')
+        self.post.refresh_from_db()
+        self.assertEqual((self.post.like_count, self.post.comment_count), (1, 1))
+        like.delete()
+        comment.delete()
+        self.post.refresh_from_db()
+        self.assertEqual((self.post.like_count, self.post.comment_count), (0, 0))
+
+    def test_profile_counters(self):
+        """팔로우/게시물 작성 시 프로필 카운터 갱신 테스트"""
+        follow = Follow.objects.create(follower=self.other_user, following=self.user)
+        self.user.profile.refresh_from_db()
+        self.other_user.profile.refresh_from_db()
+        self.assertEqual(self.user.profile.followers_count, 1)
+        self.assertEqual(self.user.profile.posts_count, 1)
+        self.assertEqual(self.other_user.profile.following_count, 1)
+        follow.delete()
+        self.post.delete()
+        self.user.profile.refresh_from_db()
+        self.assertEqual(self.user.profile.followers_count, 0)
+        self.assertEqual(self.user.profile.posts_count, 0)
+
+    def test_save_does_not_overwrite_counters(self):
+        """오래된 인스턴스를 저장해도 카운터가 덮어써지지 않는지 테스트"""
+        stale = Post.objects.get(pk=self.post.pk)
+        Like.objects.create(user=self.other_user, post=self.post)
+        stale.content = '수정된 내용'
+        stale.save()
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.like_count, 1)
+        self.assertEqual(self.post.content, '수정된 내용')
+
+    def test_delete_post_with_likes(self):
+        """좋아요와 댓글이 있는 게시물 삭제 테스트"""
+        Like.objects.create(user=self.other_user, post=self.post)
+        Comment.objects.create(post=self.post, user=self.other_user, content='댓글')
+        self.post.delete()
+        self.assertFalse(Like.objects.exists())
+
+    def test_reconcile_counters_command(self):
+        """reconcile_counters 명령으로 어긋난 카운터를 복구하는 테스트"""
+        Like.objects.create(user=self.other_user, post=self.post)
+        Post.objects.filter(pk=self.post.pk).update(like_count=42, comment_count=7)
+        Profile.objects.filter(user=self.user).update(posts_count=0, followers_count=5)
+        call_command('reconcile_counters', batch_size=1, stdout=StringIO())
+        self.post.refresh_from_db()
+        self.user.profile.refresh_from_db()
+        self.assertEqual((self.post.like_count, self.post.comment_count), (1, 0))
+        self.assertEqual((self.user.profile.posts_count, self.user.profile.followers_count), (1, 0))
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(TEMP_MEDIA, ignore_errors=True)
+        super().tearDownClass()
+
+
+@override_settings(MEDIA_ROOT=TEMP_MEDIA)
+class TagTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='testpass123')
+
+    def tag_counts(self):
+        return dict(Tag.objects.values_list('name', 'post_count'))
+
+    def test_extract_tags(self):
+        """해시태그를 소문자로, 중복 없이 추출하고 태그가 아닌 '#'은 무시하는지 테스트"""
+        text = '#Travel 제주 #여행 #travel a#b #123 &#39; ##x #여행_기록'
+        self.assertEqual(extract_tags(text), ['travel', '여행', '여행_기록'])
+
+    def test_tags_follow_edit_and_delete(self):
+        """게시물 작성/수정/삭제 시 태그 색인과 태그별 게시물 수가 바뀐 태그만 갱신되는지 테스트"""
+        post = Post.objects.create(user=self.user, content='#여행 #바다')
+        Post.objects.create(user=self.user, content='#여행')
+        self.assertEqual(self.tag_counts(), {'여행': 2, '바다': 1})
+
+        post.content = '#여행 #노을'
+        post.save()
+        self.assertEqual(self.tag_counts(), {'여행': 2, '바다': 0, '노을': 1})
+        self.assertEqual(set(post.post_tags.values_list('tag__name', flat=True)), {'여행', '노을'})
+
+        post.delete()
+        self.assertEqual(self.tag_counts(), {'여행': 1, '바다': 0, '노을': 0})
+        self.assertEqual(PostTag.objects.count(), 1)
+
+    def test_tag_feed(self):
+        """태그 피드가 태그가 달린 게시물만 최신순으로 보여주고 커서로 이어지는지 테스트"""
+        tagged = [Post.objects.create(user=self.user, content=f'#고양이 {i}') for i in range(7)]
+        Post.objects.create(user=self.user, content='태그 없는 고양이')
+        response = self.client.get(reverse('posts:tag_feed', kwargs={'name': '고양이'}))
+        self.assertEqual([p.pk for p in response.context['posts']], [p.pk for p in tagged[:-6:-1]])
+        self.assertContains(response, '게시물 7개')
+
+        data = self.client.get(reverse('posts:tag_feed', kwargs={'name': '고양이'}),
+                               {'cursor': response.context['posts'].next_cursor}).json()
+        self.assertFalse(data['has_next'])
+        self.assertIn(f'href="/post/{tagged[1].pk}/"', data['html'])
+        self.assertNotIn('태그 없는 고양이', data['html'])
+
+        response = self.client.get(reverse('posts:tag_feed', kwargs={'name': '없는태그'}))
+        self.assertEqual(response.status_code, 404)
+
+    def test_tag_feed_query_budget(self):
+        """태그 피드의 쿼리 수가 게시물 수와 무관하게 고정인지 테스트"""
+        self.client.login(username='testuser', password='testpass123')
+        url = reverse('posts:tag_feed', kwargs={'name': 'budget'})
+        Post.objects.create(user=self.user, content='#budget')
+        with self.assertNumQueries(5):
+            self.client.get(url)
+        for i in range(10):
+            Post.objects.create(user=self.user, content=f'#Budget {i}')
+        with self.assertNumQueries(5):
+            self.client.get(url)
+
+    def test_hashtags_filter(self):
+        """본문의 해시태그가 태그 피드 링크로 바뀌고 나머지는 이스케이프되는지 테스트"""
+        html = hashtags('<b>맑음</b> #Sky')
+        self.assertEqual(html, '&lt;b&gt;맑음&lt;/b&gt; <a href="{}">#Sky</a>'.format(
+            reverse('posts:tag_feed', kwargs={'name': 'sky'})))
+
+    def test_backfill_tags_command(self):
+        """bulk_create로 넣은 게시물의 태그를 명령으로 색인하고 수를 다시 계산하는지 테스트"""
+        Post.objects.bulk_create([Post(user=self.user, content='#벚꽃 #봄'), Post(user=self.user, content='#봄')])
+        call_command('backfill_tags', batch_size=1, stdout=StringIO())
+        self.assertEqual(self.tag_counts(), {'벚꽃': 1, '봄': 2})
+        Tag.objects.update(post_count=9)
+        call_command('reconcile_counters', stdout=StringIO())
+        self.assertEqual(self.tag_counts(), {'벚꽃': 1, '봄': 2})
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(TEMP_MEDIA, ignore_errors=True)
+        super().tearDownClass()
+
+
+@override_settings(MEDIA_ROOT=TEMP_MEDIA)
+class TrendingTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='testpass123')
+        self.other = User.objects.create_user(username='otheruser', password='testpass123')
+        view_counts.clear()
+
+    def create_post(self, hours_ago, views=0):
+        post = Post.objects.create(user=self.user, content=f'{hours_ago}시간 전 게시물')
+        created_at = timezone.now() - timedelta(hours=hours_ago)
+        Post.objects.filter(pk=post.pk).update(created_at=created_at, activity_at=created_at, views=views)
+        return post
+
+    def ranked(self):
+        return list(PostScore.objects.order_by('-score').values_list('post_id', flat=True))
+
+    @override_settings(TRENDING_DECAY_SECONDS=3600)
+    def test_hot_score_decay(self):
+        """게시물이 TRENDING_DECAY_SECONDS만큼 오래될 때마다 같은 점수에 10배 활동이 필요한지 테스트"""
+        now = timezone.now()
+        self.assertAlmostEqual(hot_score(100, 0, 0, now - timedelta(hours=1)), hot_score(10, 0, 0, now))
+        self.assertGreater(hot_score(0, 1, 0, now), hot_score(1, 0, 0, now))
+        self.assertGreater(hot_score(1, 0, 0, now), hot_score(5, 0, 0, now - timedelta(hours=1)))
+
+    def test_incremental_update(self):
+        """지난 계산 이후 활동이 있었던 게시물만 다시 계산하는지 테스트"""
+        fresh = self.create_post(1, views=10)
+        old = self.create_post(5, views=10)
+        self.assertEqual(update_scores(), (2, 0))
+        self.assertEqual(self.ranked(), [fresh.pk, old.pk])
+        self.assertEqual(update_scores(), (0, 0))
+
+        for user in (self.user, self.other):
+            Like.objects.create(user=user, post=old)
+        Comment.objects.create(user=self.other, post=old, content='좋아요')
+        self.assertEqual(update_scores(), (1, 0))
+        self.assertEqual(self.ranked(), [old.pk, fresh.pk])
+
+    @override_settings(VIEW_COUNT_FLUSH_INTERVAL=60)
+    def test_views_mark_activity(self):
+        """버퍼에서 반영한 조회수도 다음 계산 대상이 되는지 테스트"""
+        post = self.create_post(1)
+        self.assertEqual(update_scores(), (0, 0))
+        view_counts.record(post.pk)
+        view_counts.flush()
+        self.assertEqual(update_scores(), (1, 0))
+        self.assertEqual(self.ranked(), [post.pk])
+
+    @override_settings(TRENDING_WINDOW_HOURS=24)
+    def test_window_and_zero_points(self):
+        """기간이 지났거나 점수가 없어진 게시물은 빠지는지 테스트"""
+        post = self.create_post(1)
+        like = Like.objects.create(user=self.other, post=post)
+        self.create_post(30, views=100)
+        self.assertEqual(update_scores(), (1, 0))
+
+        like.delete()
+        self.assertEqual(update_scores(), (0, 1))
+        self.assertEqual(self.ranked(), [])
+
+        Like.objects.create(user=self.other, post=post)
+        update_scores()
+        self.assertEqual(update_scores(now=timezone.now() + timedelta(hours=24)), (0, 1))
+        self.assertEqual(self.ranked(), [])
+
+    def test_popular_feed(self):
+        """인기 피드가 미리 계산한 점수 순으로 보여주고 커서로 이어지며 쿼리 수가 고정인지 테스트"""
+        posts = [self.create_post(1, views=10 * (i + 1)) for i in range(7)]
+        self.create_post(2)
+        call_command('update_trending', stdout=StringIO())
+        url = reverse('posts:popular_feed')
+        response = self.client.get(url)
+        self.assertEqual([p.pk for p in response.context['posts']], [p.pk for p in posts[:-6:-1]])
+
+        data = self.client.get(url, {'cursor': response.context['posts'].next_cursor}).json()
+        self.assertFalse(data['has_next'])
+        self.assertIn(f'href="/post/{posts[1].pk}/"', data['html'])
+        self.assertIn(f'href="/post/{posts[0].pk}/"', data['html'])
+
+        self.client.login(username='testuser', password='testpass123')
+        with self.assertNumQueries(4):
+            self.client.get(url)
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(TEMP_MEDIA, ignore_errors=True)
+        super().tearDownClass()
+
+
+@override_settings(MEDIA_ROOT=TEMP_MEDIA)
+class FeedQueryBudgetTest(TestCase):
+    """피드 화면의 쿼리 수가 페이지의 게시물 수와 무관하게 고정인지 테스트"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='testpass123')
+        self.client.login(username='testuser', password='testpass123')
+
+    def add_posts(self, count):
+        for i in range(count):
+            author = User.objects.create_user(username=f'author{Post.objects.count()}', password='testpass123')
+            Follow.objects.create(follower=self.user, following=author)
+            post = Post.objects.create(user=author, content=f'예산 테스트 {i}')
+            Like.objects.create(user=self.user, post=post)
+            Comment.objects.create(post=post, user=author, content='댓글')
+
+    def assert_query_budget(self, budget, url, data=None):
+        self.add_posts(1)
+        with self.assertNumQueries(budget):
+            self.client.get(url, data)
+        self.add_posts(4)
+        with self.assertNumQueries(budget):
+            response = self.client.get(url, data)
+        return response
+
+    def test_home_query_budget(self):
+        response = self.assert_query_budget(3, reverse('posts:home'))
+        self.assertEqual(len(response.context['posts']), 5)
+
+    def test_load_more_query_budget(self):
+        self.assert_query_budget(3, reverse('posts:load_more_posts'))
+
+    def test_following_feed_query_budget(self):
+        response = self.assert_query_budget(5, reverse('posts:following_feed'))
+        self.assertTrue(all(post.is_liked for post in response.context['posts']))
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(TEMP_MEDIA, ignore_errors=True)
+        super().tearDownClass()
+
+
+@override_settings(MEDIA_ROOT=TEMP_MEDIA)
+class PostCardCacheTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='testuser', password='testpass123')
+        self.post = Post.objects.create(user=self.user, content='캐시 테스트 게시물')
+
+    def test_cards_served_from_cache(self):
+        """두 번째 요청은 카드 템플릿을 다시 렌더링하지 않는지 테스트"""
+        self.client.get(reverse('posts:load_more_posts'))
+        with self.assertTemplateNotUsed('posts/includes/post_card.html'):
+            data = self.client.get(reverse('posts:load_more_posts')).json()
+        self.assertIn('캐시 테스트 게시물', data['html'])
+
+    def test_card_version_changes(self):
+        """게시물 수정, 카운터 변경, 작성자 이름 변경 시 카드 버전이 바뀌는지 테스트"""
+        versions = set()
+
+        def version():
+            return card_version(Post.objects.for_feed(None).get(pk=self.post.pk))
+
+        versions.add(version())
+        self.post.content = '수정된 내용'
+        self.post.save()
+        versions.add(version())
+        Like.objects.create(user=self.user, post=self.post)
+        versions.add(version())
+        self.user.username = 'renamed'
+        self.user.save()
+        versions.add(version())
+        self.assertEqual(len(versions), 4)
+
+    def test_views_filled_outside_cached_card(self):
+        """조회수가 바뀌어도 카드를 다시 렌더링하지 않고 새 조회수를 보여주는지 테스트"""
+        self.client.get(reverse('posts:load_more_posts'))
+        Post.objects.filter(pk=self.post.pk).update(views=1234)
+        with self.assertTemplateNotUsed('posts/includes/post_card.html'):
+            data = self.client.get(reverse('posts:load_more_posts')).json()
+        self.assertIn('</i>1234</small>', data['html'])
+
+    def test_updated_card_rerendered(self):
+        """버전이 바뀐 카드는 새 내용으로 다시 렌더링되는지 테스트"""
+        self.client.get(reverse('posts:load_more_posts'))
+        self.post.content = '수정 후 카드'
+        self.post.save()
+        data = self.client.get(reverse('posts:load_more_posts')).json()
+        self.assertIn('수정 후 카드', data['html'])
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(TEMP_MEDIA, ignore_errors=True)
+        super().tearDownClass()
+
+
+@override_settings(MEDIA_ROOT=TEMP_MEDIA)
+class ConditionalGetTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='testuser', password='testpass123')
+        self.post = Post.objects.create(user=self.user, content='조건부 요청 게시물')
+        self.url = reverse('posts:post_detail', kwargs={'pk': self.post.pk})
+
+    def tearDown(self):
+        view_counts.clear()
+
+    def test_shared_cache_check(self):
+        """운영에서 프로세스별 캐시를 쓰면 검사가 실패하는지 테스트"""
+        with override_settings(DEBUG=False):
+            self.assertEqual([e.id for e in check_shared_cache()], ['config.E001'])
+        shared = {'default': {'BACKEND': 'django.core.cache.backends.db.DatabaseCache', 'LOCATION': 'cache'}}
+        with override_settings(DEBUG=False, CACHES=shared):
+            self.assertEqual(check_shared_cache(), [])
+        with override_settings(DEBUG=True):
+            self.assertEqual(check_shared_cache(), [])
+
+    def test_detail_not_modified(self):
+        """ETag가 일치하면 304를 반환하는지 테스트"""
+        response = self.client.get(self.url)
+        self.assertTrue(response.has_header('ETag'))
+        self.assertTrue(response.has_header('Last-Modified'))
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, 304)
+
+    def test_detail_cached_for_anonymous(self):
+        """비로그인 상세 페이지가 캐시되고, 캐시된 응답에도 조회수가 집계되는지 테스트"""
+        self.client.get(self.url)
+        with self.assertTemplateNotUsed('posts/post_detail.html'):
+            response = self.client.get(self.url)
+        self.assertContains(response, '조건부 요청 게시물')
+        self.assertEqual(view_counts.pending(self.post.pk), 2)
+
+    def test_detail_cache_invalidated_on_comment(self):
+        """댓글이 저장되면 캐시된 페이지가 무효화되는지 테스트"""
+        first = self.client.get(self.url)
+        Comment.objects.create(post=self.post, user=self.user, content='새 댓글')
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, '새 댓글')
+
+    def test_detail_cache_kept_on_like(self):
+        """좋아요는 캐시된 페이지를 무효화하지 않는지 테스트"""
+        self.client.get(self.url)
+        Like.objects.create(post=self.post, user=self.user)
+        with self.assertTemplateNotUsed('posts/post_detail.html'):
+            self.client.get(self.url)
+
+    def test_detail_not_cached_for_authenticated(self):
+        """로그인 사용자에게는 캐시와 검증자를 적용하지 않는지 테스트"""
+        self.client.login(username='testuser', password='testpass123')
+        self.client.get(self.url)
+        with self.assertTemplateUsed('posts/post_detail.html'):
+            response = self.client.get(self.url)
+        self.assertFalse(response.has_header('Last-Modified'))
+
+    def test_welcome_not_modified(self):
+        """Welcome 페이지가 캐시되고 304를 반환하는지 테스트"""
+        response = self.client.get(reverse('posts:home'))
+        response = self.client.get(reverse('posts:home'), HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, 304)
+
+    def test_load_more_not_modified(self):
+        """load_more_posts JSON 응답이 ETag로 304를 반환하는지 테스트"""
+        response = self.client.get(reverse('posts:load_more_posts'))
+        response = self.client.get(reverse('posts:load_more_posts'), HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, 304)
+        Like.objects.create(user=self.user, post=self.post)
+        response = self.client.get(reverse('posts:load_more_posts'), HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, 200)
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(TEMP_MEDIA, ignore_errors=True)
+        super().tearDownClass()
+
+
+@override_settings(MEDIA_ROOT=TEMP_MEDIA, THUMBNAIL_WORKER_MODE='sync')
+class ThumbnailJobTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='testpass123')
+
+    def test_thumbnail_generated_after_commit(self):
+        """썸네일이 저장 중이 아니라 커밋 후 작업으로 생성되는지 테스트"""
+        with self.captureOnCommitCallbacks(execute=False) as callbacks:
+            post = Post.objects.create(user=self.user, content='썸네일', image=create_test_image(size=(800, 600)))
+        post.refresh_from_db()
+        self.assertFalse(post.thumbnail)
+        self.assertEqual(post.thumbnail_job.status, ThumbnailJob.PENDING)
+
+        for callback in callbacks:
+            callback()
+        post.refresh_from_db()
+        self.assertTrue(post.thumbnail)
+        self.assertEqual(post.thumbnail_job.status, ThumbnailJob.DONE)
+        with Image.open(post.thumbnail.path) as thumb:
+            self.assertLessEqual(max(thumb.size), 300)
+
+    def test_card_shows_original_until_ready(self):
+        """썸네일이 준비되기 전에는 원본 이미지를 보여주는지 테스트"""
+        post = Post.objects.create(user=self.user, content='원본 표시', image=create_test_image())
+        self.client.login(username='testuser', password='testpass123')
+        response = self.client.get(reverse('posts:home'))
+        self.assertContains(response, post.image.url)
+
+    def test_image_change_resets_thumbnail(self):
+        """이미지를 바꾸면 이전 썸네일을 지우고 작업을 다시 등록하는지 테스트"""
+        with self.captureOnCommitCallbacks(execute=True):
+            post = Post.objects.create(user=self.user, content='교체', image=create_test_image())
+        post.refresh_from_db()
+        self.assertTrue(post.thumbnail)
+
+        post.image = create_test_image(name='new.jpg', color='blue')
+        with self.captureOnCommitCallbacks(execute=False):
+            post.save()
+        post.refresh_from_db()
+        self.assertFalse(post.thumbnail)
+        self.assertEqual(post.thumbnail_job.status, ThumbnailJob.PENDING)
+
+    def test_renditions_generated(self):
+        """너비별 WebP/JPEG 렌디션을 만들고 원본보다 크게 만들지 않는지 테스트"""
+        with self.captureOnCommitCallbacks(execute=True):
+            post = Post.objects.create(user=self.user, content='렌디션', image=create_test_image(size=(800, 600)))
+        post.refresh_from_db()
+        self.assertEqual((post.renditions['width'], post.renditions['height']), (800, 600))
+        self.assertEqual([w for w, _ in post.renditions['webp']], [150, 300, 600, 800])
+        self.assertEqual([w for w, _ in post.renditions['jpeg']], [150, 300, 600, 800])
+        width, name = post.renditions['webp'][1]
+        with Image.open(post.image.storage.path(name)) as img:
+            self.assertEqual((img.format, img.size), ('WEBP', (300, 225)))
+        with Image.open(post.image.storage.path(post.renditions['jpeg'][0][1])) as img:
+            self.assertEqual(img.format, 'JPEG')
+
+    def test_card_and_detail_emit_srcset(self):
+        """카드와 상세 페이지가 WebP source와 srcset/sizes를 출력하는지 테스트"""
+        with self.captureOnCommitCallbacks(execute=True):
+            post = Post.objects.create(user=self.user, content='srcset', image=create_test_image(size=(1600, 1200)))
+        post.refresh_from_db()
+        self.client.login(username='testuser', password='testpass123')
+        for url in (reverse('posts:home'), reverse('posts:post_detail', kwargs={'pk': post.pk})):
+            response = self.client.get(url)
+            self.assertContains(response, 'type="image/webp"')
+            self.assertContains(response, post.webp_srcset)
+            self.assertContains(response, '1080w')
+            self.assertNotContains(response, f'src="{post.image.url}"')
+        view_counts.clear()
+
+    @override_settings(THUMBNAIL_WORKER_MODE='off')
+    def test_process_thumbnails_command(self):
+        """process_thumbnails 명령이 대기 중인 작업을 처리하는지 테스트"""
+        with self.captureOnCommitCallbacks(execute=True):
+            post = Post.objects.create(user=self.user, content='명령', image=create_test_image())
+        self.assertEqual(post.thumbnail_job.status, ThumbnailJob.PENDING)
+        out = StringIO()
+        call_command('process_thumbnails', stdout=out)
+        post.refresh_from_db()
+        self.assertTrue(post.thumbnail)
+        self.assertIn('썸네일 1건 생성', out.getvalue())
+
+    @override_settings(THUMBNAIL_WORKER_MODE='off')
+    def test_process_thumbnails_backfill(self):
+        """--backfill이 렌디션이 없는 기존 게시물을 처리하는지 테스트"""
+        post = Post.objects.create(user=self.user, content='기존', image=create_test_image())
+        ThumbnailJob.objects.all().delete()
+        call_command('process_thumbnails', '--backfill', stdout=StringIO())
+        post.refresh_from_db()
+        self.assertTrue(post.renditions['webp'])
+
+    def test_old_generated_files_deleted(self):
+        """이미지를 바꾸거나 게시물을 지우면 커밋 후 이전 썸네일/렌디션 파일을 삭제하는지 테스트"""
+        with self.captureOnCommitCallbacks(execute=True):
+            post = Post.objects.create(user=self.user, content='정리', image=create_test_image(size=(800, 600)))
+        post.refresh_from_db()
+        old_files = thumbnails.generated_files(post.thumbnail.name, post.renditions)
+        self.assertTrue(all(post.image.storage.exists(name) for name in old_files))
+
+        post.image = create_test_image(name='new.jpg', color='blue')
+        with self.captureOnCommitCallbacks(execute=False) as callbacks:
+            post.save()
+        self.assertTrue(all(post.image.storage.exists(name) for name in old_files))
+        for callback in callbacks:
+            callback()
+        self.assertFalse(any(post.image.storage.exists(name) for name in old_files))
+
+        post.refresh_from_db()
+        new_files = thumbnails.generated_files(post.thumbnail.name, post.renditions)
+        self.assertTrue(new_files)
+        with self.captureOnCommitCallbacks(execute=True):
+            post.delete()
+        self.assertFalse(any(post.image.storage.exists(name) for name in new_files))
+
+    @override_settings(THUMBNAIL_WORKER_MODE='off', THUMBNAIL_MAX_ATTEMPTS=2)
+    def test_failed_job_retried_then_marked_failed(self):
+        """원본을 읽을 수 없는 작업은 재시도 후 실패로 표시되는지 테스트"""
+        post = Post.objects.create(user=self.user, content='실패', image=create_test_image())
+        os.remove(post.image.path)
+        job = post.thumbnail_job
+        self.assertFalse(thumbnails.process_job(job.pk))
+        job.refresh_from_db()
+        self.assertEqual(job.status, ThumbnailJob.PENDING)
+        self.assertFalse(thumbnails.process_job(job.pk))
+        job.refresh_from_db()
+        self.assertEqual(job.status, ThumbnailJob.FAILED)
+        self.assertEqual(job.attempts, 2)
+
+    def test_failed_job_rescheduled_in_thread_mode(self):
+        """'thread' 모드에서는 재시도할 작업을 THUMBNAIL_RETRY_DELAY 뒤에 다시 넣는지 테스트"""
+        post = Post.objects.create(user=self.user, content='재시도', image=create_test_image())
+        os.remove(post.image.path)
+        job = post.thumbnail_job
+        with override_settings(THUMBNAIL_WORKER_MODE='thread', THUMBNAIL_RETRY_DELAY=7, THUMBNAIL_MAX_ATTEMPTS=3), \
+                patch('posts.thumbnails.threading.Timer') as timer:
+            self.assertFalse(thumbnails.process_job(job.pk))
+            timer.assert_called_once()
+            self.assertEqual(timer.call_args.args[0], 7)
+            timer.return_value.start.assert_called_once()
+            # THUMBNAIL_MAX_ATTEMPTS번째 시도가 실패하면 더 예약하지 않음
+            self.assertFalse(thumbnails.process_job(job.pk))
+            self.assertFalse(thumbnails.process_job(job.pk))
+            self.assertEqual(timer.call_count, 2)
+        job.refresh_from_db()
+        self.assertEqual(job.status, ThumbnailJob.FAILED)
+
+    @override_settings(THUMBNAIL_WORKER_MODE='off')
+    def test_claimed_old_job_not_requeued(self):
+        """오래전에 등록된 작업도 처리 중으로 바뀐 직후에는 중단된 작업으로 보지 않는지 테스트"""
+        post = Post.objects.create(user=self.user, content='오래된 작업', image=create_test_image())
+        long_ago = timezone.now() - timedelta(hours=1)
+        ThumbnailJob.objects.filter(post=post).update(queued_at=long_ago, updated_at=long_ago)
+        self.assertTrue(thumbnails._claim(post.thumbnail_job.pk))
+        self.assertEqual(thumbnails.requeue_stale_jobs(), 0)
+
+        ThumbnailJob.objects.filter(post=post).update(updated_at=long_ago)
+        self.assertEqual(thumbnails.requeue_stale_jobs(), 1)
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(TEMP_MEDIA, ignore_errors=True)
+        super().tearDownClass()
+
+
+@override_settings(MEDIA_ROOT=TEMP_MEDIA, IMAGE_RESIZE_CACHE_DIR=os.path.join(TEMP_MEDIA, 'resize_cache'))
+class ImageResizeTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='testpass123')
+        self.post = Post.objects.create(user=self.user, content='리사이즈', image=create_test_image(size=(800, 400)))
+        self.url = reverse('resized_image', kwargs={'width': 150, 'height': 150, 'path': self.post.image.name})
+        resize_cache.reset()
+        source_versions.clear()
+
+    def tearDown(self):
+        shutil.rmtree(os.path.join(TEMP_MEDIA, 'resize_cache'), ignore_errors=True)
+
+    def test_resized_image(self):
+        """허용된 크기 안으로 줄인 이미지와 버전이 맞는 URL에 장기 캐시 헤더를 반환하는지 테스트"""
+        response = self.client.get(resized(self.post.image, '150x150'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'image/jpeg')
+        self.assertIn('max-age=31536000', response['Cache-Control'])
+        with Image.open(BytesIO(b''.join(response.streaming_content))) as img:
+            self.assertEqual(img.size, (150, 75))
+
+    def test_rejects_unlisted_size_and_traversal(self):
+        """허용 목록에 없는 크기와 MEDIA_ROOT 밖 경로는 404인지 테스트"""
+        url = reverse('resized_image', kwargs={'width': 151, 'height': 150, 'path': self.post.image.name})
+        self.assertEqual(self.client.get(url).status_code, 404)
+        url = reverse('resized_image', kwargs={'width': 150, 'height': 150, 'path': '../etc/passwd.jpg'})
+        self.assertEqual(self.client.get(url).status_code, 404)
+
+    def test_served_from_disk_cache(self):
+        """두 번째 요청은 원본을 다시 디코딩하지 않는지 테스트"""
+        self.client.get(self.url)
+        with patch('config.image_resize.render') as render:
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        render.assert_not_called()
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, 304)
+
+    def test_concurrent_requests_render_once(self):
+        """같은 렌디션을 동시에 요청해도 원본은 한 번만 디코딩하는지 테스트"""
+        calls = []
+        real_render = image_resize.render
+
+        def slow_render(*args):
+            calls.append(args)
+            time.sleep(0.05)
+            return real_render(*args)
+
+        factory = RequestFactory()
+        path = self.post.image.name
+        with patch('config.image_resize.render', side_effect=slow_render):
+            threads = [
+                threading.Thread(target=lambda: image_resize.resized_image(factory.get(self.url), 150, 150, path))
+                for _ in range(5)
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        self.assertEqual(len(calls), 1)
+
+    def test_cache_evicts_least_recently_used(self):
+        """캐시 용량을 넘으면 오래 사용하지 않은 파일부터 지우는지 테스트"""
+        self.client.get(self.url)
+        first = next(p for _, _, p in resize_cache._files())
+        os.utime(first, (0, 0))
+        size = os.path.getsize(first)
+        with override_settings(IMAGE_RESIZE_CACHE_MAX_BYTES=size + 1):
+            resize_cache.reset()
+            url = reverse('resized_image', kwargs={'width': 64, 'height': 64, 'path': self.post.image.name})
+            self.client.get(url)
+        self.assertFalse(os.path.exists(first))
+        self.assertEqual(len(list(resize_cache._files())), 1)
+
+    def test_resized_filter(self):
+        """resized 필터가 버전을 붙인 리사이즈 URL을, 허용되지 않은 크기에는 원본 URL을 반환하는지 테스트"""
+        self.assertRegex(resized(self.post.image, '150x150'), rf'^{re.escape(self.url)}\?v=\w+$')
+        self.assertEqual(resized(self.post.image, '123x45'), self.post.image.url)
+
+    def test_replaced_source_changes_version(self):
+        """같은 이름으로 원본이 바뀌면 URL 버전이 바뀌고, 버전이 없거나 지난 URL은 짧게 캐시하는지 테스트"""
+        old_url = resized(self.post.image, '150x150')
+        with open(self.post.image.path, 'wb') as f:
+            f.write(create_test_image(size=(300, 300), color='blue').read())
+        os.utime(self.post.image.path, ns=(0, 10 ** 9))
+        self.assertEqual(resized(self.post.image, '150x150'), old_url)
+        # IMAGE_RESIZE_VERSION_TTL이 지나면 다시 확인
+        with patch('config.image_resize.time.monotonic', return_value=time.monotonic() + 3600):
+            new_url = resized(self.post.image, '150x150')
+        self.assertNotEqual(old_url, new_url)
+        for url in (old_url, self.url):
+            response = self.client.get(url)
+            self.assertEqual(response['Cache-Control'], 'public, max-age=300')
+        response = self.client.get(new_url)
+        self.assertIn('max-age=31536000', response['Cache-Control'])
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(TEMP_MEDIA, ignore_errors=True)
+        super().tearDownClass()
+
+
+@override_settings(MEDIA_ROOT=TEMP_MEDIA)
+class SeedCommandTest(TestCase):
+    def test_random_image(self):
+        """랜덤 이미지가 줄무늬가 있는 400x400 JPEG인지 테스트"""
+        filename, content = generate_random_image(rng=random.Random(1))
+        self.assertTrue(filename.endswith('.jpg'))
+        with Image.open(content) as img:
+            self.assertEqual((img.format, img.size), ('JPEG', (400, 400)))
+            self.assertNotEqual(img.getpixel((10, 200)), img.getpixel((30, 200)))
+
+    def test_seed_sharegram(self):
+        """시드 명령이 요청한 수만큼 데이터를 만들고 카운터/타임라인을 맞추는지 테스트"""
+        call_command('seed_sharegram', users=30, posts=200, follows=100, likes=300, comments=150,
+                     links=20, image_pool=3, seed=7, batch_size=64, stdout=StringIO())
+        self.assertEqual(User.objects.filter(username__startswith='seed').count(), 30)
+        self.assertEqual(Profile.objects.count(), 30)
+        self.assertEqual(Post.objects.count(), 200)
+        self.assertEqual(Follow.objects.count(), 100)
+        self.assertEqual(Like.objects.count(), 300)
+        self.assertEqual(Comment.objects.count(), 150)
+        self.assertEqual(Link.objects.count(), 20)
+        self.assertFalse(Follow.objects.filter(follower=F('following')).exists())
+        self.assertTrue(Post.objects.exclude(image='').exists())
+
+        # 작성 시각이 기간 전체에 분포
+        oldest = Post.objects.order_by('created_at').first()
+        self.assertLess(oldest.created_at, timezone.now() - timedelta(days=30))
+        # 멱법칙: 상위 작성자가 평균보다 훨씬 많이 작성
+        top = Profile.objects.order_by('-posts_count').first()
+        self.assertGreater(top.posts_count, 200 / 30 * 3)
+
+        post = Post.objects.order_by('-like_count').first()
+        self.assertEqual(post.like_count, post.likes.count())
+        self.assertEqual(top.posts_count, Post.objects.filter(user=top.user).count())
+        self.assertTrue(TimelineEntry.objects.exists())
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(TEMP_MEDIA, ignore_errors=True)
+        super().tearDownClass()
+
+
+@override_settings(MEDIA_ROOT=TEMP_MEDIA, REQUEST_METRICS_SAMPLE_RATE=1.0)
+class RequestMetricsTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        # 모든 요청을 계측하므로 느린 요청 로그는 test_slow_request_logged에서 assertLogs로만 확인
+        self.addCleanup(middleware.logger.setLevel, middleware.logger.level)
+        middleware.logger.setLevel(logging.CRITICAL)
+        self.user = User.objects.create_user(username='testuser', password='testpass123')
+        self.post = Post.objects.create(user=self.user, content='계측 게시물')
+        self.client.login(username='testuser', password='testpass123')
+
+    def server_timing(self, response):
+        return dict(
+            (part.split(';')[0].strip(), part) for part in response['Server-Timing'].split(',')
+        )
+
+    def test_server_timing_html_and_json(self):
+        """HTML 뷰와 JSON 엔드포인트 모두 Server-Timing 헤더를 붙이는지 테스트"""
+        responses = [
+            self.client.get(reverse('posts:home')),
+            self.client.get(reverse('posts:load_more_posts')),
+            self.client.post(reverse('posts:like_toggle', kwargs={'pk': self.post.pk}),
+                             HTTP_X_REQUESTED_WITH='XMLHttpRequest'),
+        ]
+        for response in responses:
+            timing = self.server_timing(response)
+            self.assertEqual(set(timing), {'db', 'tpl', 'total'})
+        self.assertRegex(self.server_timing(responses[0])['db'], r'desc="[1-9]\d* queries"')
+        self.assertNotEqual(self.server_timing(responses[0])['tpl'], 'tpl;dur=0.0')
+
+    def test_query_count_matches(self):
+        """Server-Timing의 쿼리 수가 실제 실행된 쿼리 수와 같은지 테스트"""
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('posts:load_more_posts'))
+        self.assertIn(f'desc="{len(queries)} queries"', response['Server-Timing'])
+
+    def test_nested_render_counted_once(self):
+        """페이지 안에서 폼을 렌더링해도 템플릿 시간을 가장 바깥 렌더링 한 번만 재는지 테스트"""
+        middleware._instrument_templates()
+        page = engines['django'].from_string('{% load crispy_forms_tags %}<div>{{ form|crispy }}{{ form }}</div>')
+        metrics = middleware.RequestMetrics(3)
+        token = middleware._current.set(metrics)
+        ticks = itertools.count()
+        try:
+            with patch.object(middleware.time, 'perf_counter', lambda: next(ticks)):
+                html = page.render({'form': CommentForm()})
+        finally:
+            middleware._current.reset(token)
+        self.assertIn('name="content"', html)
+        self.assertEqual(metrics.template_seconds, 1)
+        self.assertEqual(metrics.render_depth, 0)
+
+    @override_settings(REQUEST_METRICS_SAMPLE_RATE=0)
+    def test_unsampled_request(self):
+        """표본에서 빠진 요청에는 계측을 적용하지 않는지 테스트"""
+        response = self.client.get(reverse('posts:home'))
+        self.assertFalse(response.has_header('Server-Timing'))
+
+    @override_settings(REQUEST_METRICS_SLOW_QUERIES=1)
+    def test_slow_request_logged(self):
+        """임계값을 넘은 요청을 가장 느린 SQL과 함께 JSON으로 기록하는지 테스트"""
+        with self.assertLogs('sharegram.slow_requests', 'WARNING') as logs:
+            self.client.get(reverse('posts:home'))
+        record = json.loads(logs.records[0].getMessage())
+        self.assertEqual(record['view'], 'posts:home')
+        self.assertGreater(record['queries'], 1)
+        self.assertLessEqual(len(record['slowest']), 3)
+        self.assertIn('SELECT', record['slowest'][0]['sql'])
+
+
+@override_settings(MEDIA_ROOT=TEMP_MEDIA, PROFILING_DIR=os.path.join(TEMP_MEDIA, 'profiles'))
+class ProfilingTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        shutil.rmtree(os.path.join(TEMP_MEDIA, 'profiles'), ignore_errors=True)
+        self.staff = User.objects.create_user(username='staff', password='testpass123', is_staff=True)
+        self.user = User.objects.create_user(username='testuser', password='testpass123')
+        Post.objects.create(user=self.user, content='프로파일 게시물')
+
+    def profile_path(self, response):
+        return os.path.join(TEMP_MEDIA, 'profiles', response['X-Profile-Id'])
+
+    def test_query_param_token_cprofile(self):
+        """?_profile=서명 토큰이면 .pstats 파일이 저장되는지 테스트"""
+        response = self.client.get(reverse('posts:home'), {'_profile': make_token()})
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response['X-Profile-Id'].endswith('.pstats'))
+        self.assertIn('posts-home', response['X-Profile-Id'])
+        stats = pstats.Stats(self.profile_path(response))
+        self.assertGreater(stats.total_calls, 0)
+
+    @override_settings(PROFILING_SAMPLE_INTERVAL=0.001)
+    def test_query_param_token_sample(self):
+        """'sample' 방식 토큰이면 flamegraph용 collapsed 스택 파일이 저장되는지 테스트"""
+        response = self.client.get(reverse('posts:home'), {'_profile': make_token('sample')})
+        self.assertTrue(response['X-Profile-Id'].endswith('.collapsed'))
+        with open(self.profile_path(response), encoding='utf-8') as f:
+            for line in f:
+                self.assertRegex(line, r'^\S.* \d+$')
+
+    def test_unsigned_query_param_ignored(self):
+        """서명 토큰이 아닌 ?_profile 값은 스태프라도 무시하는지 테스트"""
+        self.client.login(username='staff', password='testpass123')
+        for value in ('1', 'sample'):
+            response = self.client.get(reverse('posts:home'), {'_profile': value})
+            self.assertFalse(response.has_header('X-Profile-Id'))
+
+    def test_signed_header(self):
+        """서명된 X-Profile 헤더만 프로파일링을 켜는지 테스트"""
+        response = self.client.get(reverse('posts:home'), HTTP_X_PROFILE=make_token())
+        self.assertTrue(response.has_header('X-Profile-Id'))
+        response = self.client.get(reverse('posts:home'), HTTP_X_PROFILE='profile:forged:token')
+        self.assertFalse(response.has_header('X-Profile-Id'))
+
+    @override_settings(PROFILING_SAMPLE_RATE=1, PROFILING_MAX_FILES=2)
+    def test_random_sampling_and_prune(self):
+        """무작위 표본 추출로 저장하고 PROFILING_MAX_FILES개만 남기는지 테스트"""
+        for _ in range(4):
+            response = self.client.get(reverse('posts:home'))
+            self.assertTrue(response.has_header('X-Profile-Id'))
+        self.assertEqual(len(os.listdir(os.path.join(TEMP_MEDIA, 'profiles'))), 2)
+
+    def test_profile_views_staff_only(self):
+        """프로파일 목록/다운로드 뷰는 스태프만 사용할 수 있는지 테스트"""
+        self.client.login(username='staff', password='testpass123')
+        name = self.client.get(reverse('posts:home'), HTTP_X_PROFILE=make_token())['X-Profile-Id']
+
+        response = self.client.get(reverse('profile_list'))
+        self.assertContains(response, name)
+        self.assertContains(response, f'?_profile={response.context["sample_token"]}')
+        response = self.client.get(reverse('profile_download', kwargs={'name': name}))
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('attachment', response['Content-Disposition'])
+        response = self.client.get(reverse('profile_download', kwargs={'name': 'settings.py'}))
+        self.assertEqual(response.status_code, 404)
+
+        self.client.login(username='testuser', password='testpass123')
+        response = self.client.get(reverse('profile_download', kwargs={'name': name}))
+        self.assertEqual(response.status_code, 302)
+        response = self.client.get(reverse('profile_list'))
+        self.assertEqual(response.status_code, 302)
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(TEMP_MEDIA, ignore_errors=True)
+        super().tearDownClass()
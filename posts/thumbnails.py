@@ -0,0 +1,213 @@
+# posts/thumbnails.py
+
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from io import BytesIO
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db import close_old_connections, transaction
+from django.db.models import F
+from django.utils import timezone
+from PIL import Image, ImageOps
+
+from config.http_cache import invalidate_anonymous_pages
+from .models import Post, ThumbnailJob
+
+logger = logging.getLogger(__name__)
+
+THUMBNAIL_SIZE = (300, 300)
+# 반응형 이미지(srcset)용 렌디션 너비와 형식 (WebP + 구형 브라우저용 JPEG)
+RENDITION_WIDTHS = (150, 300, 600, 1080)
+RENDITION_FORMATS = (
+    ('webp', 'WEBP', {'quality': 80, 'method': 4}),
+    ('jpeg', 'JPEG', {'quality': 85, 'optimize': True, 'progressive': True}),
+)
+# 처리 중(running) 상태로 이 시간 넘게 남은 작업은 워커가 중단된 것으로 보고 다시 대기시킴
+STALE_AFTER = timedelta(minutes=5)
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.THUMBNAIL_WORKER_THREADS, thread_name_prefix='thumbnail')
+        return _executor
+
+
+def enqueue_thumbnail(post):
+    """
+    post의 썸네일 생성 작업을 큐 테이블에 등록합니다.
+
+    작업 행은 게시물 저장과 같은 트랜잭션에 기록되므로 커밋된 게시물은 작업을 잃지 않습니다.
+    THUMBNAIL_WORKER_MODE가 'thread'이면 커밋 후 스레드 풀에, 'sync'이면 커밋 직후 같은
+    스레드에서 처리하고, 'off'이면 process_thumbnails 명령이 처리할 때까지 대기합니다.
+    """
+    job, _ = ThumbnailJob.objects.update_or_create(
+        post=post,
+        defaults={'status': ThumbnailJob.PENDING, 'attempts': 0, 'error': '', 'queued_at': timezone.now()},
+    )
+    mode = settings.THUMBNAIL_WORKER_MODE
+    if mode == 'thread':
+        transaction.on_commit(lambda: _get_executor().submit(_run_in_thread, job.pk))
+    elif mode == 'sync':
+        transaction.on_commit(lambda: process_job(job.pk))
+    return job
+
+
+def _run_in_thread(job_id):
+    try:
+        process_job(job_id)
+    finally:
+        # 스레드마다 열린 DB 연결을 정리
+        close_old_connections()
+
+
+def _retry_later(job_id):
+    # 'thread' 모드에서는 THUMBNAIL_RETRY_DELAY초 뒤 스레드 풀에 다시 넣고,
+    # 그 밖의 모드에서는 process_thumbnails 명령이 대기 중인 작업을 다시 처리함
+    if settings.THUMBNAIL_WORKER_MODE == 'thread':
+        timer = threading.Timer(settings.THUMBNAIL_RETRY_DELAY,
+                                lambda: _get_executor().submit(_run_in_thread, job_id))
+        timer.daemon = True
+        timer.start()
+
+
+def _encode(img, img_format, **options):
+    buffer = BytesIO()
+    img.save(buffer, format=img_format, **options)
+    return ContentFile(buffer.getvalue())
+
+
+def render_images(image):
+    """
+    원본을 한 번만 디코딩해 썸네일과 너비별 렌디션(WebP + JPEG 대체본)을 만듭니다.
+
+    (썸네일 (이름, 내용), 렌디션 메타데이터, [(저장할 이름, 내용), ...])을 반환합니다.
+    메타데이터의 'webp'/'jpeg' 목록에는 아직 저장 전 이름이 들어 있으며 저장 후 실제 이름으로 바뀝니다.
+    원본보다 큰 렌디션은 만들지 않습니다.
+    """
+    stem = os.path.splitext(os.path.basename(image.name))[0]
+    with Image.open(image.path) as src:
+        img_format = src.format or 'JPEG'
+        # JPEG는 필요한 최대 크기에 가까운 축소 배율로 디코딩해 전체 해상도 디코딩을 피함
+        largest = max(RENDITION_WIDTHS)
+        src.draft(None, (largest, largest))
+        img = ImageOps.exif_transpose(src)
+
+    thumb = img.copy()
+    thumb.thumbnail(THUMBNAIL_SIZE)
+    thumbnail = (f'thumb_{os.path.basename(image.name)}', _encode(thumb, img_format))
+
+    sources = {
+        'webp': img if img.mode in ('RGB', 'RGBA') else img.convert('RGBA' if img.mode in ('LA', 'P') else 'RGB'),
+        'jpeg': img if img.mode == 'RGB' else img.convert('RGB'),
+    }
+    metadata = {'width': img.width, 'height': img.height}
+    files = []
+    for key, img_format, options in RENDITION_FORMATS:
+        metadata[key] = []
+        for width in sorted({min(w, img.width) for w in RENDITION_WIDTHS}):
+            height = max(1, round(img.height * width / img.width))
+            resized = sources[key].resize((width, height), Image.Resampling.LANCZOS, reducing_gap=2.0)
+            name = f'post_renditions/{stem}_{width}w.{key}'
+            metadata[key].append([width, name])
+            files.append((name, _encode(resized, img_format, **options)))
+    return thumbnail, metadata, files
+
+
+def generated_files(thumbnail, renditions):
+    """썸네일 이름과 렌디션 메타데이터에서 이 모듈이 만든 파일 이름 목록을 반환합니다."""
+    names = [name for key, _, _ in RENDITION_FORMATS for _, name in renditions.get(key, [])]
+    return names + [thumbnail] if thumbnail else names
+
+
+def delete_files(storage, names):
+    """커밋 후 storage에서 names 파일을 지웁니다. 롤백되면 아무것도 지우지 않습니다."""
+    def delete():
+        for name in names:
+            try:
+                storage.delete(name)
+            except OSError as e:
+                logger.warning('이전 이미지 파일 삭제 실패 (%s): %s', name, e)
+    if names:
+        transaction.on_commit(delete)
+
+
+def _claim(job_id):
+    # 대기 중인 작업만 처리 중으로 바꿔, 여러 워커가 같은 작업을 중복 처리하지 않도록 함.
+    # update()는 auto_now를 갱신하지 않으므로 updated_at을 직접 기록해야 requeue_stale_jobs가
+    # 오래전에 등록된 작업을 처리 도중에 다시 대기 상태로 돌리지 않음
+    return ThumbnailJob.objects.filter(pk=job_id, status=ThumbnailJob.PENDING).update(
+        status=ThumbnailJob.RUNNING, attempts=F('attempts') + 1, updated_at=timezone.now()) == 1
+
+
+def process_job(job_id):
+    """작업 하나를 처리하고 썸네일을 만들었으면 True를 반환합니다."""
+    if not _claim(job_id):
+        return False
+    job = ThumbnailJob.objects.select_related('post').get(pk=job_id)
+    post = job.post
+    current = ThumbnailJob.objects.filter(pk=job_id, queued_at=job.queued_at)
+    try:
+        (thumb_name, thumb_content), metadata, files = render_images(post.image)
+    except (FileNotFoundError, ValueError, OSError) as e:
+        logger.warning('썸네일 생성 실패 (post=%s): %s', post.pk, e)
+        retry = job.attempts < settings.THUMBNAIL_MAX_ATTEMPTS
+        updated = current.update(status=ThumbnailJob.PENDING if retry else ThumbnailJob.FAILED, error=str(e),
+                                 updated_at=timezone.now())
+        if retry and updated:
+            _retry_later(job_id)
+        return False
+
+    storage = post.image.storage
+    saved = {name: storage.save(name, content) for name, content in files}
+    for key, _, _ in RENDITION_FORMATS:
+        metadata[key] = [[width, saved[name]] for width, name in metadata[key]]
+    image_name = post.image.name
+    post.thumbnail.save(thumb_name, thumb_content, save=False)
+    # 처리하는 동안 이미지가 바뀌었으면 새 작업이 따로 등록되어 있으므로 반영하지 않음
+    # updated_at도 갱신해 상세 페이지 검증자(ETag/Last-Modified)가 바뀌도록 함
+    applied = Post.objects.filter(pk=post.pk, image=image_name).update(
+        thumbnail=post.thumbnail.name, renditions=metadata, updated_at=timezone.now())
+    if not applied:
+        delete_files(storage, generated_files(post.thumbnail.name, metadata))
+    current.update(status=ThumbnailJob.DONE, error='', updated_at=timezone.now())
+    invalidate_anonymous_pages('posts')
+    return True
+
+
+def requeue_stale_jobs():
+    """중단된 워커가 남긴 처리 중 작업을 다시 대기 상태로 되돌립니다."""
+    return ThumbnailJob.objects.filter(
+        status=ThumbnailJob.RUNNING, updated_at__lt=timezone.now() - STALE_AFTER,
+    ).update(status=ThumbnailJob.PENDING, updated_at=timezone.now())
+
+
+def process_pending(limit=100):
+    """오래된 순으로 대기 중인 작업을 최대 limit개 처리하고 성공한 수를 반환합니다."""
+    job_ids = list(ThumbnailJob.objects.filter(status=ThumbnailJob.PENDING)
+                   .order_by('queued_at').values_list('pk', flat=True)[:limit])
+    return sum(process_job(job_id) for job_id in job_ids)
+
+
+def enqueue_missing():
+    """렌디션이 없는 기존 게시물의 작업을 대기 상태로 등록하고 등록한 수를 반환합니다."""
+    post_ids = list(
+        Post.objects.exclude(image='').filter(renditions={})
+        .exclude(thumbnail_job__status__in=[ThumbnailJob.PENDING, ThumbnailJob.RUNNING])
+        .values_list('pk', flat=True)
+    )
+    now = timezone.now()
+    ThumbnailJob.objects.filter(post_id__in=post_ids).update(
+        status=ThumbnailJob.PENDING, attempts=0, error='', queued_at=now, updated_at=now)
+    ThumbnailJob.objects.bulk_create(
+        [ThumbnailJob(post_id=pk, queued_at=now) for pk in post_ids], ignore_conflicts=True)
+    return len(post_ids)
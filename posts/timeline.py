@@ -0,0 +1,121 @@
+# posts/timeline.py
+
+from django.conf import settings
+
+from users.models import Profile
+from .models import Follow, Post, TimelineEntry
+from .pagination import CursorPage, CursorPaginator, encode_cursor
+
+FANOUT_BATCH_SIZE = 1000
+
+
+def is_celebrity(user_id):
+    """팔로워가 너무 많아 팬아웃하지 않는 작성자인지 여부"""
+    return Profile.objects.filter(
+        user_id=user_id, followers_count__gt=settings.TIMELINE_FANOUT_MAX_FOLLOWERS).exists()
+
+
+def celebrity_followings(user):
+    """user가 팔로우하는 작성자 중 읽기 시점에 병합해야 하는 작성자 id 목록"""
+    return list(
+        Follow.objects.filter(
+            follower=user,
+            following__profile__followers_count__gt=settings.TIMELINE_FANOUT_MAX_FOLLOWERS,
+        ).values_list('following_id', flat=True)
+    )
+
+
+def _bulk_insert(entries):
+    TimelineEntry.objects.bulk_create(entries, batch_size=FANOUT_BATCH_SIZE, ignore_conflicts=True)
+
+
+def fan_out_post(post):
+    """게시물을 작성자 본인과 팔로워들의 타임라인에 추가합니다."""
+    recipients = [post.user_id]
+    if not is_celebrity(post.user_id):
+        recipients += Follow.objects.filter(
+            following_id=post.user_id).values_list('follower_id', flat=True)
+    _bulk_insert([
+        TimelineEntry(user_id=user_id, post=post, author_id=post.user_id, created_at=post.created_at)
+        for user_id in recipients
+    ])
+
+
+def backfill_follow(follower_id, following_id, limit=None):
+    """새로 팔로우한 작성자의 최근 게시물을 팔로워 타임라인에 채워 넣습니다."""
+    if is_celebrity(following_id):
+        return
+    limit = limit or settings.TIMELINE_BACKFILL_LIMIT
+    posts = (Post.objects.filter(user_id=following_id)
+             .order_by('-created_at', '-id')
+             .values_list('pk', 'created_at')[:limit])
+    _bulk_insert([
+        TimelineEntry(user_id=follower_id, post_id=pk, author_id=following_id, created_at=created_at)
+        for pk, created_at in posts
+    ])
+
+
+def backfill_author(author_id, limit=None):
+    """
+    작성자의 최근 게시물을 모든 팔로워의 타임라인에 채워 넣고 팔로워 수를 반환합니다.
+
+    팔로우 관계마다 backfill_follow()를 부르는 대신 작성자별로 게시물과 팔로워를
+    한 번씩만 조회하므로 대량 백필(backfill_timeline, 시드 데이터)에 사용합니다.
+    대형 작성자인지는 호출하는 쪽에서 판단합니다.
+    """
+    limit = limit or settings.TIMELINE_BACKFILL_LIMIT
+    posts = list(Post.objects.filter(user_id=author_id)
+                 .order_by('-created_at', '-id')
+                 .values_list('pk', 'created_at')[:limit])
+    followers = list(Follow.objects.filter(following_id=author_id).values_list('follower_id', flat=True))
+    if posts:
+        _bulk_insert([
+            TimelineEntry(user_id=follower_id, post_id=pk, author_id=author_id, created_at=created_at)
+            for follower_id in followers
+            for pk, created_at in posts
+        ])
+    return len(followers)
+
+
+def backfill_former_celebrity(author_id):
+    """
+    팔로워가 줄어 방금 대형 작성자 기준 이하로 내려온 작성자면 최근 게시물을 팔로워들에게 채워 넣습니다.
+
+    대형 작성자였던 동안 쓴 게시물은 팬아웃되지 않았으므로, 읽기 시점 병합에서 빠지는 순간
+    피드에서 사라지지 않도록 기준을 넘나드는 한 번만 backfill_author()로 채웁니다.
+    """
+    if Profile.objects.filter(
+            user_id=author_id, followers_count=settings.TIMELINE_FANOUT_MAX_FOLLOWERS).exists():
+        backfill_author(author_id)
+
+
+def prune_follow(follower_id, following_id):
+    """언팔로우한 작성자의 게시물을 팔로워 타임라인에서 제거합니다."""
+    TimelineEntry.objects.filter(user_id=follower_id, author_id=following_id).delete()
+
+
+def read_timeline(user, cursor=None, per_page=5):
+    """
+    user의 팔로잉 피드 한 페이지를 (created_at, id) 역순으로 반환합니다.
+
+    팬아웃된 타임라인은 (user, created_at, post) 인덱스 범위 조회 한 번으로 읽고,
+    팬아웃을 건너뛴 대형 작성자의 게시물만 읽기 시점에 따로 조회해 병합합니다.
+    키를 정한 뒤 해당 게시물들을 for_feed()로 한 번에 가져옵니다.
+    """
+    keys = list(CursorPaginator(
+        TimelineEntry.objects.filter(user=user), per_page, ordering=('-created_at', '-post_id'),
+    ).after(cursor).values_list('created_at', 'post_id')[:per_page + 1])
+
+    celebrities = celebrity_followings(user)
+    if celebrities:
+        merged = CursorPaginator(
+            Post.objects.filter(user_id__in=celebrities), per_page,
+        ).after(cursor).values_list('created_at', 'pk')[:per_page + 1]
+        keys = sorted(set(keys) | set(merged), reverse=True)
+
+    next_cursor = None
+    if len(keys) > per_page:
+        keys = keys[:per_page]
+        next_cursor = encode_cursor(list(keys[-1]))
+    posts = Post.objects.for_feed(user).in_bulk([pk for _, pk in keys])
+    return CursorPage([posts[pk] for _, pk in keys if pk in posts], next_cursor)
@@ -0,0 +1,95 @@
+# posts/trending.py
+
+import math
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from config.http_cache import invalidate_anonymous_pages
+
+from .models import Post, PostScore
+from .pagination import CursorPage, CursorPaginator, encode_cursor
+
+# 점수의 시간 항 기준점. 값이 작게 유지되도록 서비스 시작 무렵으로 둠
+EPOCH = datetime(2025, 1, 1, tzinfo=dt_timezone.utc).timestamp()
+
+# 활동 기록과 점수 계산이 동시에 일어나도 놓치지 않도록 지난 계산 시각보다 이만큼 앞부터 다시 봄
+ACTIVITY_OVERLAP = timedelta(minutes=1)
+
+
+def points(like_count, comment_count, views):
+    return (like_count * settings.TRENDING_LIKE_WEIGHT
+            + comment_count * settings.TRENDING_COMMENT_WEIGHT
+            + views * settings.TRENDING_VIEW_WEIGHT)
+
+
+def hot_score(like_count, comment_count, views, created_at):
+    """
+    Reddit "hot" 방식의 시간 감쇠 점수.
+
+    log10(가중 합계) + (작성 시각 - EPOCH) / TRENDING_DECAY_SECONDS. 게시물이
+    TRENDING_DECAY_SECONDS만큼 오래될수록 같은 순위를 지키려면 점수가 10배 필요하므로
+    (나이)^중력으로 나누는 HN 방식과 같은 감쇠 효과를 내면서도, 시간 항이 작성 시각에
+    고정되어 있어 활동이 없는 게시물의 점수는 다시 계산할 필요가 없습니다.
+    """
+    age_term = (created_at.timestamp() - EPOCH) / settings.TRENDING_DECAY_SECONDS
+    return math.log10(max(points(like_count, comment_count, views), 1)) + age_term
+
+
+def update_scores(now=None, full=False, batch_size=1000):
+    """
+    지난 계산 이후 활동(좋아요/댓글/조회)이 있었던 최근 게시물의 점수를 다시 계산합니다.
+
+    지난 계산 시각은 PostScore.computed_at의 최댓값이며, 처음이거나 full=True이면
+    TRENDING_WINDOW_HOURS 안에 작성된 게시물을 모두 봅니다. 점수가 없는 게시물과 기간이
+    지난 게시물은 PostScore에서 뺍니다. (다시 계산한 수, 뺀 수)를 반환합니다.
+    """
+    now = now or timezone.now()
+    window_start = now - timedelta(hours=settings.TRENDING_WINDOW_HOURS)
+    last = None if full else PostScore.objects.aggregate(last=Max('computed_at'))['last']
+    since = last - ACTIVITY_OVERLAP if last else window_start
+    active = Post.objects.filter(activity_at__gte=max(since, window_start), created_at__gte=window_start)
+
+    last_pk = 0
+    updated = removed = 0
+    while True:
+        batch = list(active.filter(pk__gt=last_pk).order_by('pk').values_list(
+            'pk', 'like_count', 'comment_count', 'views', 'created_at')[:batch_size])
+        if not batch:
+            break
+        scored = [PostScore(post_id=pk, score=hot_score(likes, comments, views, created_at), computed_at=now)
+                  for pk, likes, comments, views, created_at in batch if points(likes, comments, views) > 0]
+        unscored = [pk for pk, likes, comments, views, _ in batch if points(likes, comments, views) <= 0]
+        with transaction.atomic():
+            PostScore.objects.bulk_create(scored, update_conflicts=True, unique_fields=['post'],
+                                          update_fields=['score', 'computed_at'])
+            if unscored:
+                removed += PostScore.objects.filter(post_id__in=unscored).delete()[0]
+        updated += len(scored)
+        last_pk = batch[-1][0]
+
+    removed += PostScore.objects.filter(post__created_at__lt=window_start).delete()[0]
+    if updated or removed:
+        invalidate_anonymous_pages('trending')
+    return updated, removed
+
+
+def read_popular(viewer, cursor=None, per_page=5):
+    """
+    인기 게시물 한 페이지를 점수 역순으로 반환합니다.
+
+    미리 계산한 PostScore의 (score, post) 인덱스 범위 조회 한 번으로 키를 정하고 게시물은
+    for_feed()로 한 번에 가져오므로, 요청 때 집계로 정렬하지 않고 쿼리 두 번으로 끝납니다.
+    """
+    keys = list(CursorPaginator(
+        PostScore.objects.all(), per_page, ordering=('-score', '-post_id'),
+    ).after(cursor).values_list('score', 'post_id')[:per_page + 1])
+    next_cursor = None
+    if len(keys) > per_page:
+        keys = keys[:per_page]
+        next_cursor = encode_cursor(list(keys[-1]))
+    posts = Post.objects.for_feed(viewer).in_bulk([pk for _, pk in keys])
+    return CursorPage([posts[pk] for _, pk in keys if pk in posts], next_cursor)
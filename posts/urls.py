@@ -15,5 +15,7 @@ urlpatterns = [
     path('post/<int:pk>/like/', views.like_toggle, name='like_toggle'),
     path('follow/<str:username>/', views.follow_toggle, name='follow_toggle'),
     path('following/', views.following_feed, name='following_feed'),
+    path('popular/', views.popular_feed, name='popular_feed'),
+    path('tags/<str:name>/', views.tag_feed, name='tag_feed'),
     path('load-more/', views.load_more_posts, name='load_more_posts'),
 ]
@@ -0,0 +1,83 @@
+# posts/view_counter.py
+
+import atexit
+import logging
+import threading
+import time
+from collections import Counter, defaultdict
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import Post
+
+FLUSH_BATCH_SIZE = 500
+
+logger = logging.getLogger(__name__)
+
+
+class ViewCountBuffer:
+    """
+    조회수 증가분을 프로세스 메모리에 모았다가 주기적으로 한꺼번에 반영합니다.
+
+    조회 한 번마다 UPDATE를 실행하지 않고, VIEW_COUNT_FLUSH_INTERVAL초마다
+    증가분이 같은 게시물끼리 묶어 `views = views + n` UPDATE로 기록합니다.
+    반영에 실패한 증가분은 버퍼로 되돌려 다음 flush에서 다시 시도하고,
+    프로세스 종료 시 atexit 훅으로 남은 증가분을 기록합니다. 요청 처리 중(record)의
+    flush 실패는 로그만 남기므로 DB가 잠겨 있어도 페이지 응답은 실패하지 않습니다.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pending = Counter()
+        self._last_flush = time.monotonic()
+
+    def record(self, post_id):
+        with self._lock:
+            self._pending[post_id] += 1
+            due = time.monotonic() - self._last_flush >= settings.VIEW_COUNT_FLUSH_INTERVAL
+        if due:
+            try:
+                self.flush()
+            except Exception:
+                logger.exception('조회수 반영 실패, 다음 flush에서 다시 시도')
+
+    def pending(self, post_id):
+        """아직 DB에 반영되지 않은 post_id의 조회수 증가분"""
+        with self._lock:
+            return self._pending[post_id]
+
+    def flush(self):
+        """버퍼의 증가분을 DB에 반영하고 반영한 게시물 수를 반환합니다."""
+        with self._lock:
+            pending, self._pending = self._pending, Counter()
+            self._last_flush = time.monotonic()
+        if not pending:
+            return 0
+
+        by_increment = defaultdict(list)
+        for post_id, n in pending.items():
+            by_increment[n].append(post_id)
+        now = timezone.now()
+        try:
+            with transaction.atomic():
+                for n, post_ids in by_increment.items():
+                    for i in range(0, len(post_ids), FLUSH_BATCH_SIZE):
+                        Post.objects.filter(pk__in=post_ids[i:i + FLUSH_BATCH_SIZE]).update(
+                            views=F('views') + n, activity_at=now)
+        except Exception:
+            # 증가분을 잃지 않도록 버퍼로 되돌림
+            with self._lock:
+                self._pending.update(pending)
+            raise
+        return len(pending)
+
+    def clear(self):
+        with self._lock:
+            self._pending.clear()
+
+
+view_counts = ViewCountBuffer()
+atexit.register(view_counts.flush)
@@ -1,85 +1,89 @@
-import random
 import uuid
-from io import BytesIO
 
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
-from django.core.files.base import ContentFile
 from django.core.paginator import EmptyPage, PageNotAnInteger, Paginator
-from django.db.models import Q
+from django.db import transaction
+from django.db.models import Max
 from django.http import JsonResponse
 from django.shortcuts import get_object_or_404, redirect, render
 from django.template.loader import render_to_string
+from django.utils.cache import get_conditional_response
 from django.views.decorators.http import require_POST
-from PIL import Image
+from config.http_cache import cache_anonymous_page, conditional_page, make_etag, set_validators
 from .forms import PostForm, CommentForm
+from .images import generate_random_image
+from .fragments import card_key, render_post_cards
 from users.models import User
-from .models import Post, Comment, Like, Follow
-
-
-def generate_random_image():
-    """랜덤 컬러의 400x400 이미지를 생성합니다."""
-    color = (random.randint(50, 220), random.randint(
-        50, 220), random.randint(50, 220))
-    img = Image.new('RGB', (400, 400), color)
-    for i in range(0, 400, 40):
-        lighter = tuple(min(c + 30, 255) for c in color)
-        for x in range(i, min(i + 20, 400)):
-            for y in range(400):
-                img.putpixel((x, y), lighter)
-    buf = BytesIO()
-    img.save(buf, format='JPEG', quality=85)
-    buf.seek(0)
-    filename = f'random_{random.randint(10000, 99999)}.jpg'
-    return filename, ContentFile(buf.read())
+from .models import Post, Comment, Like, Follow, Tag
+from .pagination import CursorPaginator, InvalidCursor
+from .tags import read_tag_feed
+from .timeline import read_timeline
+from .trending import read_popular
+from .view_counter import view_counts
 
+POSTS_PER_PAGE = 5
 
+
+@cache_anonymous_page()
 def home(request):
     """비로그인: Welcome 페이지, 로그인: 홈 피드"""
     if not request.user.is_authenticated:
         return render(request, 'posts/welcome.html')
 
-    posts = Post.objects.all()
-    paginator = Paginator(posts, 5)
-    page_obj = paginator.get_page(1)
+    page_obj = CursorPaginator(Post.objects.for_feed(request.user), POSTS_PER_PAGE).page()
     # recent_links = Link.objects.all()[:3]
     # context = {'posts': page_obj, 'recent_links': recent_links}
-    context = {'posts': page_obj}
+    context = {'posts': page_obj, 'cards_html': render_post_cards(page_obj)}
     return render(request, 'posts/home.html', context)
 
 
+def _post_detail_validators(request, pk):
+    row = (Post.objects.filter(pk=pk).with_neighbours()
+           .annotate(last_comment_at=Max('comments__updated_at'))
+           .values_list('updated_at', 'views', 'like_count', 'comment_count',
+                        'last_comment_at', 'prev_post_id', 'next_post_id')
+           .first())
+    if row is None:
+        return None
+    return make_etag('post_detail', pk, *row), max(filter(None, (row[0], row[4])))
+
+
 def post_detail(request, pk):
-    post = get_object_or_404(Post, pk=pk)
-    Post.objects.filter(pk=pk).update(views=post.views + 1)
+    response = _post_detail_page(request, pk)
+    # 게시물이 있을 때만 조회수 집계 (없으면 위에서 404). 캐시된 응답이나 304도 포함
+    if response.status_code in (200, 304):
+        view_counts.record(pk)
+    return response
+
+
+@cache_anonymous_page('posts', 'users')
+@conditional_page(_post_detail_validators)
+def _post_detail_page(request, pk):
+    # 게시물, 좋아요/팔로우 여부, 이전/다음 게시물을 한 쿼리로, 댓글을 한 쿼리로 가져옴
+    post = get_object_or_404(Post.objects.for_detail(request.user), pk=pk)
+    # 아직 반영되지 않은 조회수와 응답 뒤에 기록할 이번 조회까지 포함해 표시
+    post.views += view_counts.pending(post.pk) + 1
     if request.method == 'POST' and request.user.is_authenticated:
         comment_form = CommentForm(request.POST)
         if comment_form.is_valid():
             comment = comment_form.save(commit=False)
             comment.post = post
             comment.user = request.user
-            comment.save()
+            with transaction.atomic():
+                comment.save()
             messages.success(request, '댓글이 작성되었습니다.')
             return redirect('posts:post_detail', pk=pk)
     else:
         comment_form = CommentForm()
-    is_liked = False
-    if request.user.is_authenticated:
-        is_liked = Like.objects.filter(user=request.user, post=post).exists()
-    is_following = False
-    if request.user.is_authenticated and request.user != post.user:
-        is_following = Follow.objects.filter(follower=request.user, following=post.user).exists()
-    prev_post = Post.objects.filter(
-        created_at__gt=post.created_at).order_by('created_at').first()
-    next_post = Post.objects.filter(
-        created_at__lt=post.created_at).order_by('-created_at').first()
     context = {
         'post': post,
         'comment_form': comment_form,
-        'is_liked': is_liked,
-        'like_count': post.likes.count(),
-        'is_following': is_following,
-        'prev_post': prev_post,
-        'next_post': next_post,
+        'is_liked': post.is_liked,
+        'like_count': post.like_count,
+        'is_following': post.is_following,
+        'prev_post_id': post.prev_post_id,
+        'next_post_id': post.next_post_id,
     }
     return render(request, 'posts/post_detail.html', context)
 
@@ -101,7 +105,8 @@ def post_create(request):
             if not post.image and request.POST.get('use_random_image'):
                 filename, content = generate_random_image()
                 post.image.save(filename, content, save=False)
-            post.save()
+            with transaction.atomic():
+                post.save()
             messages.success(request, '게시물이 작성되었습니다.')
             return redirect('posts:home')
     else:
@@ -136,7 +141,8 @@ def post_delete(request, pk):
         messages.error(request, '삭제 권한이 없습니다.')
         return redirect('posts:home')
     if request.method == 'POST':
-        post.delete()
+        with transaction.atomic():
+            post.delete()
         messages.success(request, '게시물이 삭제되었습니다.')
         return redirect('posts:home')
     return render(request, 'posts/post_confirm_delete.html', {'post': post})
@@ -149,40 +155,64 @@ def comment_delete(request, pk):
         return redirect('posts:post_detail', pk=comment.post.pk)
     if request.method == 'POST':
         post_pk = comment.post.pk
-        comment.delete()
+        with transaction.atomic():
+            comment.delete()
         messages.success(request, '댓글이 삭제되었습니다.')
         return redirect('posts:post_detail', pk=post_pk)
     return render(request, 'posts/comment_confirm_delete.html', {'comment': comment})
 
 
 def load_more_posts(request):
-    page_number = request.GET.get('page', 1)
     feed_type = request.GET.get('feed', 'home')
-    posts = Post.objects.all()
-    paginator = Paginator(posts, 5)
+    posts = Post.objects.for_feed(request.user)
 
-    # get_page()는 범위 초과 시 마지막 페이지를 반환하여 중복 표시 발생
-    # paginator.page()를 사용하여 범위 초과 시 빈 응답 반환
+    # 페이지 번호가 주어지면 기존 OFFSET 방식으로 동작 (하위 호환)
+    if 'page' in request.GET and 'cursor' not in request.GET:
+        paginator = Paginator(posts, POSTS_PER_PAGE)
+        # get_page()는 범위 초과 시 마지막 페이지를 반환하여 중복 표시 발생
+        # paginator.page()를 사용하여 범위 초과 시 빈 응답 반환
+        try:
+            page_obj = paginator.page(request.GET['page'])
+        except (EmptyPage, PageNotAnInteger):
+            return JsonResponse({'html': '', 'has_next': False})
+        return _post_cards_response(request, page_obj, {'has_next': page_obj.has_next()})
+
+    # 커서 방식: (created_at, id) 기준으로 마지막 게시물 다음부터 조회
     try:
-        page_obj = paginator.page(page_number)
-    except (EmptyPage, PageNotAnInteger):
-        return JsonResponse({'html': '', 'has_next': False})
+        page_obj = CursorPaginator(posts, POSTS_PER_PAGE).page(request.GET.get('cursor'))
+    except InvalidCursor:
+        return JsonResponse({'html': '', 'has_next': False, 'next_cursor': None})
+    return _post_cards_response(request, page_obj, {
+        'has_next': page_obj.has_next(),
+        'next_cursor': page_obj.next_cursor,
+    })
+
 
-    html = render_to_string('posts/includes/post_card.html',
-                            {'posts': page_obj}, request=request)
-    return JsonResponse({'html': html, 'has_next': page_obj.has_next()})
+def _post_cards_response(request, page_obj, data):
+    """
+    카드 HTML JSON 응답. 카드 내용은 사용자와 무관하므로 카드 버전, 조회수(캐시된 카드
+    밖에서 채움)와 페이지 정보로 ETag를 만들어, 변경이 없으면 렌더링 없이 304를 반환합니다.
+    """
+    posts = list(page_obj)
+    etag = make_etag(data, [(card_key(post), post.views) for post in posts])
+    last_modified = max((post.updated_at for post in posts), default=None)
+    not_modified = get_conditional_response(request, etag=etag)
+    if not_modified is not None:
+        return set_validators(not_modified, etag, last_modified)
+    response = JsonResponse({'html': render_post_cards(posts), **data})
+    return set_validators(response, etag, last_modified)
 
 @login_required
 @require_POST
 def like_toggle(request, pk):
     post = get_object_or_404(Post, pk=pk)
-    like, created = Like.objects.get_or_create(user=request.user, post=post)
-    if not created:
-        like.delete()
-        liked = False
-    else:
-        liked = True
-    like_count = post.likes.count()
+    with transaction.atomic():
+        like, created = Like.objects.get_or_create(user=request.user, post=post)
+        if not created:
+            like.delete()
+        liked = created
+    post.refresh_from_db(fields=['like_count'])
+    like_count = post.like_count
     if request.headers.get('X-Requested-With') == 'XMLHttpRequest':
         return JsonResponse({'liked': liked, 'like_count': like_count})
     return redirect('posts:post_detail', pk=pk)
@@ -194,9 +224,11 @@ def follow_toggle(request, username):
     if request.user == target_user:
         messages.warning(request, '자기 자신을 팔로우할 수 없습니다.')
         return redirect('users:profile', username=username)
-    follow, created = Follow.objects.get_or_create(follower=request.user, following=target_user)
+    with transaction.atomic():
+        follow, created = Follow.objects.get_or_create(follower=request.user, following=target_user)
+        if not created:
+            follow.delete()
     if not created:
-        follow.delete()
         messages.info(request, f'{target_user.username}님을 언팔로우했습니다.')
     else:
         messages.success(request, f'{target_user.username}님을 팔로우합니다.')
@@ -204,12 +236,50 @@ def follow_toggle(request, username):
 
 @login_required
 def following_feed(request):
-    following_users = Follow.objects.filter(follower=request.user).values_list('following_id', flat=True)
-    posts = Post.objects.filter(Q(user_id__in=following_users) | Q(user=request.user))
-    paginator = Paginator(posts, 5)
-    page_obj = paginator.get_page(1)
-    liked_post_ids = set(Like.objects.filter(user=request.user, post__in=page_obj.object_list).values_list('post_id', flat=True))
-    for post in page_obj:
-        post.is_liked = post.pk in liked_post_ids
+    try:
+        page_obj = read_timeline(request.user, request.GET.get('cursor'), POSTS_PER_PAGE)
+    except InvalidCursor:
+        return JsonResponse({'html': '', 'has_next': False, 'next_cursor': None})
     context = {'posts': page_obj}
+    # 무한 스크롤 요청에는 카드 HTML과 다음 커서만 반환
+    if 'cursor' in request.GET:
+        html = render_to_string('posts/includes/following_post_card.html', context, request=request)
+        return JsonResponse({
+            'html': html,
+            'has_next': page_obj.has_next(),
+            'next_cursor': page_obj.next_cursor,
+        })
     return render(request, 'posts/following_feed.html', context)
+
+
+@cache_anonymous_page('posts', 'users')
+def tag_feed(request, name):
+    """해시태그 피드. ?cursor=가 있으면 무한 스크롤용 다음 페이지 JSON을 반환합니다."""
+    tag = get_object_or_404(Tag, name=name.lower())
+    try:
+        page_obj = read_tag_feed(tag, request.user, request.GET.get('cursor'), POSTS_PER_PAGE)
+    except InvalidCursor:
+        return JsonResponse({'html': '', 'has_next': False, 'next_cursor': None})
+    if 'cursor' in request.GET:
+        return _post_cards_response(request, page_obj, {
+            'has_next': page_obj.has_next(),
+            'next_cursor': page_obj.next_cursor,
+        })
+    context = {'tag': tag, 'posts': page_obj, 'cards_html': render_post_cards(page_obj)}
+    return render(request, 'posts/tag_feed.html', context)
+
+
+@cache_anonymous_page('posts', 'users', 'trending')
+def popular_feed(request):
+    """인기 게시물 피드 (update_trending이 미리 계산한 점수 순). ?cursor=가 있으면 다음 페이지 JSON을 반환합니다."""
+    try:
+        page_obj = read_popular(request.user, request.GET.get('cursor'), POSTS_PER_PAGE)
+    except InvalidCursor:
+        return JsonResponse({'html': '', 'has_next': False, 'next_cursor': None})
+    if 'cursor' in request.GET:
+        return _post_cards_response(request, page_obj, {
+            'has_next': page_obj.has_next(),
+            'next_cursor': page_obj.next_cursor,
+        })
+    context = {'posts': page_obj, 'cards_html': render_post_cards(page_obj)}
+    return render(request, 'posts/popular_feed.html', context)
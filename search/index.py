@@ -0,0 +1,130 @@
+# search/index.py
+
+import re
+
+from django.apps import apps
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+
+TABLE = 'search_index'
+
+# 종류별 (모델, 제목 필드, 본문 필드)
+SOURCES = {
+    'post': ('posts.Post', None, 'content'),
+    'comment': ('posts.Comment', None, 'content'),
+    'link': ('links.Link', 'title', 'description'),
+}
+
+# 문서 rowid = 원본 pk * 4 + 종류 코드. 원본 하나당 문서 하나이므로 저장/삭제 시
+# 색인 안을 검색하지 않고 rowid로 바로 찾아 바꿀 수 있음
+KINDS = {'post': 1, 'comment': 2, 'link': 3}
+_KIND_CODES = {code: kind for kind, code in KINDS.items()}
+_ROWID_STEP = 4
+
+HANGUL_RUN = re.compile(r'[가-힣]+')
+
+
+def hangul_bigrams(run):
+    """한글 연속 구간을 겹치는 두 글자 조각으로 나눕니다. '여행사진' -> ['여행', '행사', '사진']"""
+    if len(run) < 2:
+        return [run]
+    return [run[i:i + 2] for i in range(len(run) - 1)]
+
+
+def index_text(text):
+    """
+    색인에 넣을 텍스트. 한글 구간은 바이그램으로, 그 밖의 글자는 그대로 둡니다.
+
+    unicode61 토크나이저는 공백 기준으로만 나누므로 '사진을'과 '사진이'가 서로 다른 낱말이 되어
+    '사진'으로 찾을 수 없습니다. 바이그램으로 바꿔 두면 조사/어미가 붙은 낱말이나
+    띄어쓰기 없는 합성어도 검색어의 바이그램 구문(phrase)으로 찾을 수 있습니다.
+    """
+    return HANGUL_RUN.sub(lambda m: ' ' + ' '.join(hangul_bigrams(m.group())) + ' ', text or '')
+
+
+def rowid(kind, pk):
+    return pk * _ROWID_STEP + KINDS[kind]
+
+
+def split_rowid(value):
+    """rowid를 (종류, 원본 pk)로 되돌립니다."""
+    return _KIND_CODES[value % _ROWID_STEP], value // _ROWID_STEP
+
+
+def _document(kind, pk, title, body):
+    return rowid(kind, pk), kind, index_text(title), index_text(body)
+
+
+def _write(cursor, documents, replace=True):
+    if replace:
+        cursor.executemany(f'DELETE FROM {TABLE} WHERE rowid = %s', [(doc[0],) for doc in documents])
+    cursor.executemany(f'INSERT INTO {TABLE} (rowid, kind, title, body) VALUES (%s, %s, %s, %s)', documents)
+
+
+def index_objects(kind, objs, replace=True, using=DEFAULT_DB_ALIAS):
+    """
+    이미 메모리에 있는 게시물/댓글/링크를 다시 읽지 않고 색인에 넣거나 바꿉니다.
+
+    새로 만든 원본만 넣을 때는 replace=False로 기존 문서 삭제를 건너뜁니다 (bulk_create 뒤).
+    """
+    _, title_field, body_field = SOURCES[kind]
+    documents = [
+        _document(kind, obj.pk, getattr(obj, title_field) if title_field else '', getattr(obj, body_field))
+        for obj in objs
+    ]
+    if documents:
+        with connections[using].cursor() as cursor:
+            _write(cursor, documents, replace)
+
+
+def index_object(kind, obj):
+    """저장된 게시물/댓글/링크 하나를 색인에 넣거나 바꿉니다 (post_save 시그널)."""
+    index_objects(kind, [obj], using=obj._state.db or DEFAULT_DB_ALIAS)
+
+
+def remove_object(kind, pk, using=DEFAULT_DB_ALIAS):
+    """삭제된 원본의 문서를 색인에서 뺍니다 (post_delete 시그널)."""
+    with connections[using].cursor() as cursor:
+        cursor.execute(f'DELETE FROM {TABLE} WHERE rowid = %s', [rowid(kind, pk)])
+
+
+def index_queryset(kind, queryset, batch_size=1000, replace=True):
+    """
+    queryset의 원본을 batch_size개씩 읽어 색인하고 색인한 수를 반환합니다.
+
+    update()/bulk_create()처럼 시그널을 보내지 않는 쓰기 뒤에 호출합니다.
+    """
+    _, title_field, body_field = SOURCES[kind]
+    fields = ['pk', body_field] + ([title_field] if title_field else [])
+    count = 0
+    batch = []
+    with connections[queryset.db].cursor() as cursor:
+        for pk, body, *title in queryset.values_list(*fields).iterator(chunk_size=batch_size):
+            batch.append(_document(kind, pk, title[0] if title else '', body))
+            if len(batch) >= batch_size:
+                _write(cursor, batch, replace)
+                count += len(batch)
+                batch = []
+        if batch:
+            _write(cursor, batch, replace)
+            count += len(batch)
+    return count
+
+
+def index_links(pks):
+    """pks의 링크를 DB에서 다시 읽어 색인합니다 (update()로 메타데이터를 채운 뒤)."""
+    return index_queryset('link', apps.get_model(SOURCES['link'][0]).objects.filter(pk__in=list(pks)))
+
+
+def rebuild(using=DEFAULT_DB_ALIAS, batch_size=1000):
+    """색인을 비우고 게시물/댓글/링크 전체를 다시 색인한 뒤 {종류: 수}를 반환합니다."""
+    counts = {}
+    with transaction.atomic(using=using):
+        with connections[using].cursor() as cursor:
+            cursor.execute(f'DELETE FROM {TABLE}')
+        for kind, (label, _, _) in SOURCES.items():
+            queryset = apps.get_model(label).objects.using(using).order_by('pk')
+            counts[kind] = index_queryset(kind, queryset, batch_size, replace=False)
+        with connections[using].cursor() as cursor:
+            # 대량으로 넣은 뒤 세그먼트를 하나로 합쳐 검색 시 읽을 b-tree 수를 줄임
+            cursor.execute(f"INSERT INTO {TABLE} ({TABLE}) VALUES ('optimize')")
+    return counts
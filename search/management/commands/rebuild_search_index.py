@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from search import index
+
+
+class Command(BaseCommand):
+    help = (
+        '게시물/댓글/링크 전문 검색 색인(FTS5)을 처음부터 다시 만듭니다. '
+        'bulk_create처럼 시그널 없이 대량으로 넣은 데이터를 색인할 때 사용합니다.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        counts = index.rebuild(batch_size=options['batch_size'])
+        for kind, count in counts.items():
+            self.stdout.write(f'{kind}: {count}건 색인')
+        self.stdout.write(self.style.SUCCESS('검색 색인 재구성 완료'))
@@ -0,0 +1,65 @@
+import re
+
+from django.db import migrations
+
+# 마이그레이션 당시의 색인 형식을 그대로 고정 (search.index가 바뀌어도 이 마이그레이션은 그대로)
+HANGUL_RUN = re.compile(r'[가-힣]+')
+
+# (종류, 종류 코드, 앱, 모델, 제목 필드, 본문 필드). 문서 rowid = 원본 pk * 4 + 종류 코드
+SOURCES = [
+    ('post', 1, 'posts', 'Post', None, 'content'),
+    ('comment', 2, 'posts', 'Comment', None, 'content'),
+    ('link', 3, 'links', 'Link', 'title', 'description'),
+]
+
+BATCH_SIZE = 1000
+
+
+def index_text(text):
+    # 한글 구간은 겹치는 두 글자 조각(바이그램)으로, 그 밖의 글자는 그대로
+    def bigrams(match):
+        run = match.group()
+        pieces = [run] if len(run) < 2 else [run[i:i + 2] for i in range(len(run) - 1)]
+        return ' ' + ' '.join(pieces) + ' '
+    return HANGUL_RUN.sub(bigrams, text or '')
+
+
+def populate(apps, schema_editor):
+    # 이미 있는 게시물/댓글/링크를 색인 (이후로는 시그널이 동기화)
+    alias = schema_editor.connection.alias
+    with schema_editor.connection.cursor() as cursor:
+        for kind, code, app_label, model_name, title_field, body_field in SOURCES:
+            fields = ['pk', body_field] + ([title_field] if title_field else [])
+            rows = (apps.get_model(app_label, model_name).objects.using(alias)
+                    .order_by('pk').values_list(*fields).iterator(chunk_size=BATCH_SIZE))
+            batch = []
+            for pk, body, *title in rows:
+                batch.append((pk * 4 + code, kind, index_text(title[0] if title else ''), index_text(body)))
+                if len(batch) >= BATCH_SIZE:
+                    cursor.executemany(
+                        'INSERT INTO search_index (rowid, kind, title, body) VALUES (%s, %s, %s, %s)', batch)
+                    batch = []
+            if batch:
+                cursor.executemany(
+                    'INSERT INTO search_index (rowid, kind, title, body) VALUES (%s, %s, %s, %s)', batch)
+        cursor.execute("INSERT INTO search_index (search_index) VALUES ('optimize')")
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('posts', '0009_post_renditions'),
+        ('links', '0006_link_list_indexes'),
+    ]
+
+    operations = [
+        # kind는 종류 필터(kind : post)용 열이고, prefix='1'은 한 글자 검색어의 접두사 검색(꽃*)용 색인
+        migrations.RunSQL(
+            sql="CREATE VIRTUAL TABLE search_index USING fts5("
+                "kind, title, body, tokenize='unicode61 remove_diacritics 2', prefix='1')",
+            reverse_sql='DROP TABLE search_index',
+        ),
+        migrations.RunPython(populate, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,177 @@
+# search/query.py
+
+import re
+from collections import defaultdict
+
+from django.apps import apps
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.urls import reverse
+from django.utils.html import escape
+from django.utils.safestring import mark_safe
+
+from posts.pagination import CursorPage, InvalidCursor, decode_cursor, encode_cursor
+
+from .index import HANGUL_RUN, KINDS, SOURCES, TABLE, hangul_bigrams, split_rowid
+
+RESULTS_PER_PAGE = 20
+MAX_QUERY_LENGTH = 100
+MAX_TERMS = 8
+SNIPPET_LENGTH = 120
+
+# unicode61이 낱말로 보는 글자(문자/숫자) 묶음. 한글 구간은 따로 떼어 바이그램으로 바꿈
+TOKEN_RE = re.compile(r'[가-힣]+|[^\W_가-힣]+')
+
+# bm25 열 가중치 (kind, title, body): 링크 제목에서 일치하면 본문보다 5배 중요
+BM25 = f'bm25({TABLE}, 0.0, 5.0, 1.0)'
+
+
+def parse_query(text):
+    """
+    검색어를 FTS5 MATCH 식과 강조 표시할 낱말 목록으로 바꿉니다.
+
+    공백으로 나눈 낱말마다 색인과 같은 방식(index_text)으로 토큰을 만들어 하나의 구문으로
+    묶고, 낱말끼리는 AND로 잇습니다. 따옴표/연산자 같은 FTS5 문법은 모두 무시하므로
+    사용자 입력이 MATCH 식 오류를 일으키지 않습니다. 한글 한 글자 낱말은 접두사로 찾습니다.
+    검색할 낱말이 없으면 ('', [])을 반환합니다.
+    """
+    phrases, terms = [], []
+    for word in text.split()[:MAX_TERMS]:
+        pieces = TOKEN_RE.findall(word.lower())
+        if not pieces:
+            continue
+        tokens = [token for piece in pieces
+                  for token in (hangul_bigrams(piece) if HANGUL_RUN.fullmatch(piece) else [piece])]
+        phrase = '"{}"'.format(' '.join(tokens))
+        if len(pieces) == 1 and len(pieces[0]) == 1 and HANGUL_RUN.fullmatch(pieces[0]):
+            phrase += ' *'
+        phrases.append(phrase)
+        terms.extend(pieces)
+    return ' '.join(phrases), terms
+
+
+def highlight(text, terms, length=SNIPPET_LENGTH):
+    """
+    text에서 첫 일치 부분 주변 length자를 잘라 terms를 <mark>로 감싼 HTML 조각을 반환합니다.
+
+    색인에 넣은 바이그램이 아니라 원문에서 직접 찾아 자르므로 화면에는 원문 그대로 보입니다.
+    """
+    text = ' '.join((text or '').split())
+    pattern = re.compile('|'.join(re.escape(t) for t in sorted(set(terms), key=len, reverse=True)),
+                         re.IGNORECASE) if terms else None
+    first = pattern.search(text) if pattern else None
+    start = max(0, first.start() - length // 3) if first else 0
+    end = min(len(text), start + length)
+    window = text[start:end]
+    parts = ['…'] if start else []
+    position = 0
+    for match in (pattern.finditer(window) if pattern else ()):
+        parts += [escape(window[position:match.start()]), '<mark>', escape(match.group()), '</mark>']
+        position = match.end()
+    parts.append(escape(window[position:]))
+    if end < len(text):
+        parts.append('…')
+    return mark_safe(''.join(parts))
+
+
+def _candidate_floor(cursor, match):
+    # 가장 최근(rowid가 큰) SEARCH_MAX_CANDIDATES번째 일치 문서의 rowid. FTS5는 rowid 순서로
+    # 일치 목록을 읽으므로 이 조회는 한도만큼만 읽고 멈춤
+    limit = settings.SEARCH_MAX_CANDIDATES
+    if not limit:
+        return 0
+    cursor.execute(f'SELECT rowid FROM {TABLE} WHERE {TABLE} MATCH %s ORDER BY rowid DESC LIMIT 1 OFFSET %s',
+                   [match, limit - 1])
+    row = cursor.fetchone()
+    return row[0] if row else 0
+
+
+def _decode(cursor, kinds):
+    # [점수, rowid, 종류별 경계 rowid...]
+    values = decode_cursor(cursor)
+    if (len(values) != 2 + len(kinds) or not isinstance(values[0], (int, float))
+            or not all(isinstance(v, int) and not isinstance(v, bool) for v in values[1:])):
+        raise InvalidCursor(cursor)
+    return values[0], values[1], values[2:]
+
+
+def _querysets():
+    Post, Comment, Link = (apps.get_model(SOURCES[kind][0]) for kind in ('post', 'comment', 'link'))
+    return {
+        'post': Post.objects.select_related('user'),
+        'comment': Comment.objects.select_related('user'),
+        'link': Link.objects.select_related('user'),
+    }
+
+
+def _hit(kind, obj, terms):
+    if kind == 'post':
+        return {'kind': kind, 'object': obj, 'snippet': highlight(obj.content, terms),
+                'url': reverse('posts:post_detail', args=[obj.pk])}
+    if kind == 'comment':
+        return {'kind': kind, 'object': obj, 'snippet': highlight(obj.content, terms),
+                'url': reverse('posts:post_detail', args=[obj.post_id]) + f'#comment-{obj.pk}'}
+    return {'kind': kind, 'object': obj, 'title': highlight(obj.title or obj.url, terms),
+            'snippet': highlight(obj.description, terms), 'url': reverse('links:link_detail', args=[obj.pk])}
+
+
+def _load(rows, terms):
+    # 종류별로 한 번씩만 조회하고 bm25 순서대로 되돌림. 원본이 이미 지워진 문서는 건너뜀
+    pks = defaultdict(list)
+    for rid, _ in rows:
+        kind, pk = split_rowid(rid)
+        pks[kind].append(pk)
+    querysets = _querysets()
+    objects = {kind: querysets[kind].in_bulk(ids) for kind, ids in pks.items()}
+    hits = []
+    for rid, _ in rows:
+        kind, pk = split_rowid(rid)
+        obj = objects[kind].get(pk)
+        if obj is not None:
+            hits.append(_hit(kind, obj, terms))
+    return hits
+
+
+def search(text, kind=None, cursor=None, per_page=RESULTS_PER_PAGE, using=DEFAULT_DB_ALIAS):
+    """
+    게시물/댓글/링크를 전문 검색해 bm25 관련도 순으로 한 페이지(CursorPage)를 반환합니다.
+
+    kind('post', 'comment', 'link')를 주면 그 종류만 찾습니다. 결과 항목은
+    {'kind', 'object', 'snippet', 'url'} dict이며 링크는 강조 표시한 'title'도 있습니다.
+
+    흔한 낱말이라 일치 문서가 아주 많아도 시간이 일정하도록 관련도는 종류마다 가장 최근
+    SEARCH_MAX_CANDIDATES개의 일치 문서 안에서만 계산합니다. rowid는 종류 안에서만 시간
+    순서이므로 경계도 종류별로 정하고, 종류마다 한 페이지씩 읽어 bm25 순으로 합칩니다
+    (bm25의 IDF는 색인 전체 기준이라 종류가 달라도 점수를 비교할 수 있음). 경계 rowid들과
+    마지막으로 본 (점수, rowid)를 커서에 담아 다음 페이지도 같은 후보 안에서 이어서 가져옵니다.
+    잘못된 커서는 InvalidCursor를 발생시킵니다.
+    """
+    match, terms = parse_query(text[:MAX_QUERY_LENGTH])
+    if not match:
+        return CursorPage([], None)
+    if kind is not None and kind not in KINDS:
+        raise ValueError(kind)
+    kinds = [kind] if kind is not None else list(KINDS)
+    matches = [f'kind : {k} AND ({{title body}} : ({match}))' for k in kinds]
+
+    rows = []
+    with connections[using].cursor() as db:
+        if cursor:
+            score, last, floors = _decode(cursor, kinds)
+        else:
+            floors = [_candidate_floor(db, kind_match) for kind_match in matches]
+        for kind_match, floor in zip(matches, floors):
+            sql = f'SELECT rowid, {BM25} FROM {TABLE} WHERE {TABLE} MATCH %s AND rowid >= %s'
+            params = [kind_match, floor]
+            if cursor:
+                sql += f' AND ({BM25} > %s OR ({BM25} = %s AND rowid > %s))'
+                params += [score, score, last]
+            db.execute(f'{sql} ORDER BY {BM25}, rowid LIMIT %s', params + [per_page + 1])
+            rows += db.fetchall()
+
+    rows.sort(key=lambda row: (row[1], row[0]))
+    next_cursor = None
+    if len(rows) > per_page:
+        rows = rows[:per_page]
+        next_cursor = encode_cursor([rows[-1][1], rows[-1][0], *floors])
+    return CursorPage(_load(rows, terms), next_cursor)
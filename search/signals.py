@@ -0,0 +1,41 @@
+# search/signals.py
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from links.models import Link
+from posts.models import Comment, Post
+
+from . import index
+
+
+# 원본을 쓰는 트랜잭션 안에서 색인도 함께 바꿔, 롤백되면 색인도 함께 되돌아감
+
+@receiver(post_save, sender=Post)
+def index_post(sender, instance, **kwargs):
+    index.index_object('post', instance)
+
+
+@receiver(post_save, sender=Comment)
+def index_comment(sender, instance, **kwargs):
+    index.index_object('comment', instance)
+
+
+@receiver(post_save, sender=Link)
+def index_link(sender, instance, **kwargs):
+    index.index_object('link', instance)
+
+
+@receiver(post_delete, sender=Post)
+def unindex_post(sender, instance, using, **kwargs):
+    index.remove_object('post', instance.pk, using)
+
+
+@receiver(post_delete, sender=Comment)
+def unindex_comment(sender, instance, using, **kwargs):
+    index.remove_object('comment', instance.pk, using)
+
+
+@receiver(post_delete, sender=Link)
+def unindex_link(sender, instance, using, **kwargs):
+    index.remove_object('link', instance.pk, using)
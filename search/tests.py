@@ -0,0 +1,134 @@
+from io import StringIO
+from unittest.mock import patch
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from links import tasks
+from links.models import Link
+from posts.models import Comment, Post
+
+from .index import index_text
+from .query import parse_query, search
+
+
+def found(text, kind=None):
+    return [(hit['kind'], hit['object'].pk) for hit in search(text, kind)]
+
+
+class QueryParsingTest(TestCase):
+    def test_hangul_bigrams(self):
+        """한글은 색인과 검색어 모두 바이그램으로 바뀌는지 테스트"""
+        self.assertEqual(index_text('여행사진을 Django로'), ' 여행 행사 사진 진을  Django 로 ')
+        self.assertEqual(parse_query('여행사진 꽃'), ('"여행 행사 사진" "꽃" *', ['여행사진', '꽃']))
+
+    def test_fts_syntax_ignored(self):
+        """따옴표/연산자/열 이름 같은 FTS5 문법이 MATCH 식에 그대로 들어가지 않는지 테스트"""
+        self.assertEqual(parse_query('"title": NEAR(a* OR b)')[0], '"title" "near a" "or" "b"')
+        self.assertEqual(parse_query('*** ---'), ('', []))
+
+
+class SearchIndexTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='testpass123')
+
+    def test_korean_word_with_particle(self):
+        """조사가 붙은 낱말과 띄어쓰기 없는 합성어를 찾는지 테스트"""
+        post = Post.objects.create(user=self.user, content='제주도에서 찍은 바다사진을 올려요')
+        self.assertEqual(found('제주도'), [('post', post.pk)])
+        self.assertEqual(found('사진'), [('post', post.pk)])
+        self.assertEqual(found('바다 올려'), [('post', post.pk)])
+        self.assertEqual(found('제'), [('post', post.pk)])
+        self.assertEqual(found('서울'), [])
+
+    def test_signals_keep_index_in_sync(self):
+        """게시물/댓글을 저장·수정·삭제하면 색인도 함께 바뀌는지 테스트"""
+        post = Post.objects.create(user=self.user, content='고양이 사진')
+        comment = Comment.objects.create(user=self.user, post=post, content='귀여운 고양이네요')
+        self.assertEqual(set(found('고양이')), {('post', post.pk), ('comment', comment.pk)})
+        self.assertEqual(found('고양이', kind='comment'), [('comment', comment.pk)])
+
+        post.content = '강아지 사진'
+        post.save()
+        self.assertEqual(found('고양이'), [('comment', comment.pk)])
+        self.assertEqual(found('강아지'), [('post', post.pk)])
+
+        post.delete()
+        self.assertEqual(found('고양이'), [])
+
+    def test_link_metadata_update_indexed(self):
+        """update()로 채우는 링크 메타데이터도 색인되는지 테스트"""
+        link = Link.objects.create(user=self.user, url='https://example.com', status=Link.PENDING)
+        metadata = {'title': 'Django 튜토리얼', 'description': '장고 입문서', 'image': ''}
+        with patch('links.tasks.fetch_og_metadata', return_value=metadata):
+            tasks.process_link(link.pk)
+        self.assertEqual(found('django'), [('link', link.pk)])
+        self.assertEqual(found('입문', kind='link'), [('link', link.pk)])
+        self.assertEqual(found('입문', kind='post'), [])
+
+    def test_bm25_ranking_and_cursor(self):
+        """bm25 순으로 정렬되고 커서로 중복·누락 없이 이어지는지 테스트"""
+        posts = [Post.objects.create(user=self.user, content=f'노을 {"산책 " * i}') for i in range(5)]
+        strong = Post.objects.create(user=self.user, content='노을 노을 노을')
+        link = Link.objects.create(user=self.user, url='https://example.com', title='노을', description='')
+        page = search('노을', per_page=2)
+        self.assertEqual([hit['object'] for hit in page][:1], [link])
+        self.assertEqual(page.object_list[1]['object'], strong)
+
+        seen = [(hit['kind'], hit['object'].pk) for hit in page]
+        while page.has_next():
+            page = search('노을', cursor=page.next_cursor, per_page=2)
+            seen += [(hit['kind'], hit['object'].pk) for hit in page]
+        self.assertEqual(len(seen), 7)
+        self.assertEqual(set(seen), {('post', p.pk) for p in posts + [strong]} | {('link', link.pk)})
+
+    @override_settings(SEARCH_MAX_CANDIDATES=2)
+    def test_candidate_window(self):
+        """관련도는 가장 최근 SEARCH_MAX_CANDIDATES개 일치 문서 안에서만 계산하는지 테스트"""
+        posts = [Post.objects.create(user=self.user, content='하늘') for _ in range(3)]
+        self.assertEqual(set(found('하늘')), {('post', p.pk) for p in posts[1:]})
+
+    @override_settings(SEARCH_MAX_CANDIDATES=10)
+    def test_candidate_window_per_kind(self):
+        """한 종류의 최근 일치 문서가 많아도 다른 종류의 문서가 후보에서 밀려나지 않는지 테스트"""
+        post = Post.objects.create(user=self.user, content='여행 여행')
+        comments = [Comment.objects.create(user=self.user, post=post, content=f'여행 후기 {i}') for i in range(30)]
+        page = search('여행', per_page=5)
+        self.assertEqual(page.object_list[0]['object'], post)
+        seen = [(hit['kind'], hit['object'].pk) for hit in page]
+        while page.has_next():
+            page = search('여행', cursor=page.next_cursor, per_page=5)
+            seen += [(hit['kind'], hit['object'].pk) for hit in page]
+        self.assertEqual(len(seen), 11)
+        self.assertEqual(set(seen), {('post', post.pk)} | {('comment', c.pk) for c in comments[-10:]})
+
+    def test_rebuild_command(self):
+        """bulk_create처럼 시그널 없이 넣은 데이터를 명령으로 색인하는지 테스트"""
+        Post.objects.bulk_create([Post(user=self.user, content='벚꽃 구경')])
+        self.assertEqual(found('벚꽃'), [])
+        out = StringIO()
+        call_command('rebuild_search_index', stdout=out)
+        self.assertEqual(len(found('벚꽃')), 1)
+        self.assertIn('post: 1건', out.getvalue())
+
+
+class SearchViewTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='testpass123')
+        self.post = Post.objects.create(user=self.user, content='<b>공원</b>에서 산책했어요')
+
+    def test_highlighted_snippet(self):
+        """검색 결과에 강조 표시한 원문 조각이 이스케이프되어 나오는지 테스트"""
+        response = self.client.get(reverse('search:search'), {'q': '공원'})
+        self.assertContains(response, '&lt;b&gt;<mark>공원</mark>&lt;/b&gt;에서 산책했어요', html=False)
+        self.assertContains(response, reverse('posts:post_detail', kwargs={'pk': self.post.pk}))
+
+    def test_empty_and_invalid(self):
+        """검색어가 없으면 결과 없이, 잘못된 커서는 404로 응답하는지 테스트"""
+        response = self.client.get(reverse('search:search'))
+        self.assertEqual(response.status_code, 200)
+        self.assertNotContains(response, '검색 결과가 없습니다')
+        response = self.client.get(reverse('search:search'), {'q': '공원', 'cursor': 'invalid'})
+        self.assertEqual(response.status_code, 404)
@@ -0,0 +1,28 @@
+from django.http import Http404
+from django.shortcuts import render
+
+from posts.pagination import InvalidCursor
+from . import query
+from .index import KINDS
+
+KIND_LABELS = {'post': '게시물', 'comment': '댓글', 'link': '링크'}
+
+
+def search(request):
+    """게시물/댓글/링크 전문 검색 (?q=검색어&type=post|comment|link&cursor=...)"""
+    text = request.GET.get('q', '').strip()[:query.MAX_QUERY_LENGTH]
+    kind = request.GET.get('type')
+    if kind not in KINDS:
+        kind = None
+    try:
+        results = query.search(text, kind, request.GET.get('cursor'))
+    except InvalidCursor:
+        raise Http404
+    for hit in results:
+        hit['label'] = KIND_LABELS[hit['kind']]
+    return render(request, 'search/search.html', {
+        'query': text,
+        'kind': kind,
+        'kinds': KIND_LABELS,
+        'results': results,
+    })
@@ -0,0 +1,49 @@
+# Generated by Django 6.1.2 on 2026-10-16 23:03
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def populate_counters(apps, schema_editor):
+    Profile = apps.get_model('users', 'Profile')
+    Follow = apps.get_model('posts', 'Follow')
+    Post = apps.get_model('posts', 'Post')
+
+    def count(model, fk):
+        subquery = (model.objects.filter(**{fk: OuterRef('user_id')})
+                    .order_by().values(fk).annotate(n=Count('pk')).values('n'))
+        return Coalesce(Subquery(subquery), Value(0))
+
+    Profile.objects.update(
+        followers_count=count(Follow, 'following'),
+        following_count=count(Follow, 'follower'),
+        posts_count=count(Post, 'user'),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0002_profile_bio_max_length_constraint'),
+        ('posts', '0004_follow'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='profile',
+            name='followers_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='팔로워 수'),
+        ),
+        migrations.AddField(
+            model_name='profile',
+            name='following_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='팔로잉 수'),
+        ),
+        migrations.AddField(
+            model_name='profile',
+            name='posts_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='게시물 수'),
+        ),
+        migrations.RunPython(populate_counters, migrations.RunPython.noop),
+    ]
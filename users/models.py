@@ -9,12 +9,21 @@ from django.dispatch import receiver
 from django.core.exceptions import ValidationError
 from PIL import Image
 
+from config.http_cache import invalidate_anonymous_pages
+
 models.TextField.register_lookup(Length)
 
 class Profile(models.Model):
     user = models.OneToOneField(User, on_delete=models.CASCADE)
     bio = models.TextField(max_length=500, blank=True, verbose_name='자기소개')
     profile_image = models.ImageField(default='default.jpg', upload_to='profile_pics', verbose_name='프로필 이미지')
+    # 비정규화 카운터: posts.counters가 F() 식으로만 갱신
+    followers_count = models.PositiveIntegerField(default=0, editable=False, verbose_name='팔로워 수')
+    following_count = models.PositiveIntegerField(default=0, editable=False, verbose_name='팔로잉 수')
+    posts_count = models.PositiveIntegerField(default=0, editable=False, verbose_name='게시물 수')
+
+    # 일반 save()가 덮어쓰지 않는 필드 (동시에 증가한 값을 잃지 않도록)
+    COUNTER_FIELDS = ('followers_count', 'following_count', 'posts_count')
 
     class Meta:
         verbose_name = '프로필'
@@ -36,6 +45,11 @@ class Profile(models.Model):
 
     def save(self, *args, **kwargs):
         self.full_clean()
+        if not self._state.adding and kwargs.get('update_fields') is None:
+            kwargs['update_fields'] = [
+                f.name for f in self._meta.concrete_fields
+                if not f.primary_key and f.name not in self.COUNTER_FIELDS
+            ]
         super().save(*args, **kwargs)
         try:
             img = Image.open(self.profile_image.path)
@@ -54,5 +68,13 @@ def create_profile(sender, instance, created, **kwargs):
 
 
 @receiver(post_save, sender=User)
-def save_profile(sender, instance, **kwargs):
+def save_profile(sender, instance, update_fields=None, **kwargs):
+    # 로그인 시 last_login만 갱신하는 저장에는 프로필을 다시 저장할 필요가 없음
+    if update_fields is not None and set(update_fields) <= {'last_login'}:
+        return
     instance.profile.save()
+
+
+@receiver(post_save, sender=Profile)
+def invalidate_profile_pages(sender, **kwargs):
+    invalidate_anonymous_pages('users')
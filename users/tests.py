@@ -8,6 +8,7 @@ from django.urls import reverse
 from django.contrib.auth.models import User
 from django.core.files.uploadedfile import SimpleUploadedFile
 
+from posts.models import Post
 from .models import Profile
 
 TEMP_MEDIA = tempfile.mkdtemp()
@@ -120,6 +121,19 @@ class ProfileViewTest(TestCase):
         self.assertEqual(response.status_code, 200)
         self.assertContains(response, 'testuser')
 
+    def test_profile_query_budget(self):
+        """게시물 수와 관계없이 프로필 페이지 쿼리 수가 고정인지 테스트"""
+        # 사용자, 프로필, 최근 링크, 게시물
+        url = reverse('users:profile', kwargs={'username': 'testuser'})
+        Post.objects.create(user=self.user, content='첫 게시물')
+        with self.assertNumQueries(4):
+            self.client.get(url)
+        for i in range(5):
+            Post.objects.create(user=self.user, content=f'게시물 {i}')
+        with self.assertNumQueries(4):
+            response = self.client.get(url)
+        self.assertContains(response, '게시물 4')
+
     @classmethod
     def tearDownClass(cls):
         shutil.rmtree(TEMP_MEDIA, ignore_errors=True)
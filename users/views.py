@@ -5,8 +5,8 @@ from django.contrib.auth.decorators import login_required
 from django.contrib.auth.models import User
 from django.shortcuts import get_object_or_404, redirect, render
 from .forms import ProfileUpdateForm, UserRegisterForm, UserUpdateForm
-# from links.models import Link
-from posts.models import Follow, Like, Post
+from links.models import Link
+from posts.models import Follow, Post
 
 
 def register(request):
@@ -24,31 +24,24 @@ def register(request):
 
 def profile(request, username):
     profile_user = get_object_or_404(User, username=username)
-    user_posts = Post.objects.filter(user=profile_user)
-    # user_links = Link.objects.filter(user=profile_user)[:5]
-
-    # if request.user.is_authenticated:
-    #     liked_ids = set(Like.objects.filter(user=request.user, post__in=user_posts).values_list('post_id', flat=True))
-    #     for post in user_posts:
-    #         post.is_liked = post.pk in liked_ids
-    # else:
-    #     for post in user_posts:
-    #         post.is_liked = False
+    user_posts = Post.objects.filter(user=profile_user).for_feed(request.user)
+    user_links = (Link.objects.filter(user=profile_user).order_by('-created_at', '-id')
+                  .only('id', 'url', 'title')[:5])
 
     is_following = False
     if request.user.is_authenticated and request.user != profile_user:
         is_following = Follow.objects.filter(follower=request.user, following=profile_user).exists()
 
-    followers_count = profile_user.followers.count()
-    following_count = profile_user.following.count()
+    profile = profile_user.profile
 
     context = {
         'profile_user': profile_user,
         'posts': user_posts,
-        # 'user_links': user_links,
+        'user_links': user_links,
         'is_following': is_following,
-        'followers_count': followers_count,
-        'following_count': following_count,
+        'followers_count': profile.followers_count,
+        'following_count': profile.following_count,
+        'posts_count': profile.posts_count,
     }
     return render(request, 'users/profile.html', context)
 